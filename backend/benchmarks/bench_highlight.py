@@ -0,0 +1,100 @@
+"""
+Keyword highlighting benchmark.
+
+Extracts the text of the PDFs in static/documents and times the compiled
+single-pass highlighter against the previous implementation (one re.sub
+per term). Also reports how many highlights each produces; the old one
+lowercases matched words and can nest or split phrase marks, so counts
+differ slightly.
+
+Run from the backend directory:
+    python -m benchmarks.bench_highlight --repeat 5
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.highlighter import get_highlighter
+from services.pdf_extraction import count_pages, extract_page_range
+
+DOCUMENTS_DIR = Path(__file__).resolve().parent.parent / "static" / "documents"
+
+
+def legacy_highlight(text: str) -> str:
+    """highlight_keywords as it was before the compiled highlighter"""
+    important_words = [
+        "important", "key", "main", "primary", "essential", "critical",
+        "significant", "note", "remember", "focus", "attention", "warning",
+        "caution", "summary", "conclusion", "result", "finding", "discovery",
+        "example", "instance", "specifically", "particularly", "especially",
+        "must", "should", "need", "require", "necessary", "vital", "crucial"
+    ]
+    highlighted = text
+    for word in important_words:
+        highlighted = re.sub(rf'\b{re.escape(word)}\b', f'<mark>{word}</mark>', highlighted, flags=re.IGNORECASE)
+    highlighted = re.sub(r'\b\d{4}\b', r'<mark>\g<0></mark>', highlighted)
+    highlighted = re.sub(r'\b\d+%', r'<mark>\g<0></mark>', highlighted)
+    highlighted = re.sub(r'\$\d+', r'<mark>\g<0></mark>', highlighted)
+    important_phrases = [
+        r"in conclusion", r"to summarize", r"it is important", r"keep in mind",
+        r"take note", r"remember that", r"the main point", r"key finding",
+    ]
+    for phrase in important_phrases:
+        highlighted = re.sub(phrase, f'<mark>\\g<0></mark>', highlighted, flags=re.IGNORECASE)
+    return highlighted
+
+
+def load_texts(limit: int) -> list:
+    texts = []
+    for path in sorted(DOCUMENTS_DIR.glob("*.pdf"))[:limit]:
+        try:
+            text = "\n".join(extract_page_range(str(path), 0, count_pages(str(path))))
+        except Exception as e:
+            print(f"  skipping {path.name}: {e}")
+            continue
+        if text.strip():
+            texts.append(text)
+    return texts
+
+
+def best_of(func, texts: list, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=50, help="max PDFs to load")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = load_texts(args.documents)
+    if not texts:
+        print(f"No PDFs with text found in {DOCUMENTS_DIR}")
+        return
+    highlighter = get_highlighter()
+    chars = sum(len(text) for text in texts)
+
+    legacy = best_of(legacy_highlight, texts, args.repeat)
+    compiled = best_of(highlighter.highlight, texts, args.repeat)
+
+    legacy_marks = sum(legacy_highlight(text).count("<mark>") for text in texts)
+    compiled_marks = sum(highlighter.highlight(text).count("<mark>") for text in texts)
+
+    print(f"{len(texts)} documents, {chars:,} characters, best of {args.repeat}")
+    print(f"  legacy:   {legacy * 1000:8.1f} ms  {legacy_marks:,} highlights")
+    print(f"  compiled: {compiled * 1000:8.1f} ms  {compiled_marks:,} highlights")
+    print(f"  speedup:  {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
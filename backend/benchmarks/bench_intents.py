@@ -0,0 +1,74 @@
+"""
+Offline chatbot intent routing benchmark.
+
+Times the compiled intent router against the previous chain of
+any(word in message) checks, with the bundled intents and with synthetic
+intents added up to each --sizes count, on a set of typical user messages.
+The legacy cost grows with the number of intents; the router's should not.
+
+Run from the backend directory:
+    python -m benchmarks.bench_intents --sizes 4 1000 5000
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_highlight import best_of
+from services.intent_router import Intent, IntentRouter, get_intent_router
+
+MESSAGES = [
+    "How can I improve my reading?",
+    "I get distracted all the time when I try to study for exams",
+    "hello",
+    "I'm struggling to focus on my homework and I feel overwhelmed",
+    "Can you give me tips for remembering what I read in my textbook?",
+    "What is the best way to organize my notes before a test next week?",
+    "My teacher says I should use the pomodoro technique but I keep procrastinating",
+    "thanks!",
+]
+
+
+def legacy_respond(message: str, intents: list, default_response: str) -> str:
+    """get_chat_response's keyword fallback as it was: one substring scan per intent, first match wins"""
+    user_message_lower = message.lower()
+    for intent in intents:
+        if any(word in user_message_lower for word in intent.keywords):
+            return intent.response
+    return default_response
+
+
+def synthetic_intents(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    intents = []
+    for i in range(count):
+        keywords = {"".join(rng.choice(letters) for _ in range(rng.randint(5, 10))): 1.0 for _ in range(8)}
+        intents.append(Intent(f"faq{i}", f"topic {i}", keywords, f"Answer {i}"))
+    return intents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 1000, 5000], help="total intent counts")
+    parser.add_argument("--repeat", type=int, default=200, help="passes over the messages")
+    args = parser.parse_args()
+
+    bundled = get_intent_router()
+    print(f"{len(MESSAGES)} messages, best of 5 x {args.repeat} passes")
+    for size in args.sizes:
+        intents = bundled.intents + synthetic_intents(max(0, size - len(bundled.intents)))
+        router = IntentRouter(intents, bundled.default_response)
+        messages = MESSAGES * args.repeat
+        legacy = best_of(lambda message: legacy_respond(message, intents, bundled.default_response), messages, 5)
+        compiled = best_of(router.respond, messages, 5)
+        per_message = 1e6 / len(messages)
+        print(f"  {len(intents):,} intents")
+        print(f"    legacy:   {legacy * per_message:8.1f} us/message")
+        print(f"    compiled: {compiled * per_message:8.1f} us/message  ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
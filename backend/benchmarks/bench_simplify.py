@@ -0,0 +1,93 @@
+"""
+Rule-based simplification benchmark.
+
+Times the single-pass simplifier against the previous implementation (one
+re.sub per lexicon entry, then separate sentence and paragraph passes) on
+the PDFs in static/documents, first with the bundled lexicon and then with
+it padded to --lexicon-size entries to show how each scales.
+
+Run from the backend directory:
+    python -m benchmarks.bench_simplify --repeat 3
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_highlight import best_of, load_texts
+from services.simplifier import Simplifier, get_simplifier
+
+
+def legacy_simplify(text: str, replacements: dict) -> str:
+    """simplify_text_rule_based as it was before the single-pass simplifier"""
+    simplified = text
+    for complex_word, simple_word in replacements.items():
+        simplified = re.sub(rf'\b{complex_word}\b', simple_word, simplified, flags=re.IGNORECASE)
+    sentences = re.split(r'([.!?]+)', simplified)
+    result_sentences = []
+    for i in range(0, len(sentences) - 1, 2):
+        sentence = sentences[i].strip()
+        punctuation = sentences[i + 1] if i + 1 < len(sentences) else ""
+        if len(sentence) > 100:
+            parts = sentence.split(',')
+            if len(parts) > 1:
+                for j, part in enumerate(parts):
+                    part = part.strip()
+                    if part:
+                        result_sentences.append(part + punctuation if j == 0 else part.capitalize() + punctuation)
+            else:
+                result_sentences.append(sentence + punctuation)
+        else:
+            result_sentences.append(sentence + punctuation)
+    simplified = ' '.join(result_sentences)
+    result_paragraphs = []
+    for para in simplified.split('\n\n'):
+        if len(para) > 500:
+            sentences_in_para = re.split(r'([.!?]+)', para)
+            current_para = ""
+            for i in range(0, len(sentences_in_para) - 1, 2):
+                sentence = sentences_in_para[i].strip()
+                punctuation = sentences_in_para[i + 1] if i + 1 < len(sentences_in_para) else ""
+                if len(current_para + sentence) > 300:
+                    if current_para:
+                        result_paragraphs.append(current_para.strip())
+                    current_para = sentence + punctuation + " "
+                else:
+                    current_para += sentence + punctuation + " "
+            if current_para:
+                result_paragraphs.append(current_para.strip())
+        else:
+            result_paragraphs.append(para)
+    return '\n\n'.join(result_paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=50, help="max PDFs to load")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--lexicon-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    texts = load_texts(args.documents)
+    if not texts:
+        print("No PDFs with text found")
+        return
+    lexicon = get_simplifier().lexicon
+    padded = dict(lexicon)
+    for i in range(args.lexicon_size - len(padded)):
+        padded[f"zzword{i}"] = "word"
+
+    print(f"{len(texts)} documents, {sum(len(text) for text in texts):,} characters, best of {args.repeat}")
+    for name, entries in (("bundled", lexicon), ("padded", padded)):
+        simplifier = Simplifier(entries)
+        legacy = best_of(lambda text: legacy_simplify(text, entries), texts, args.repeat)
+        single = best_of(simplifier.simplify, texts, args.repeat)
+        print(f"  {name} lexicon ({len(entries):,} entries)")
+        print(f"    legacy:      {legacy * 1000:9.1f} ms")
+        print(f"    single pass: {single * 1000:9.1f} ms  ({legacy / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
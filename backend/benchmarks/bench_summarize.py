@@ -0,0 +1,74 @@
+"""
+Extractive summarization benchmark.
+
+Times the NumPy TF-IDF summarizer against the previous keyword scorer on
+the PDFs in static/documents, plus one synthetic document at the
+MAX_TEXT_LENGTH limit, and prints a sample summary from each.
+
+Run from the backend directory:
+    python -m benchmarks.bench_summarize --repeat 3
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_highlight import best_of, load_texts
+from core.config import settings
+from services.summarizer import summarize
+
+
+def legacy_summarize(text: str, max_length: int = 200) -> str:
+    """Rule-based fallback of generate_summary as it was before the summarizer engine"""
+    sentences = [s.strip() for s in re.split(r'[.!?]+', text) if len(s.strip()) > 20]
+    if not sentences:
+        return "• " + text[:200] + "..."
+    important_keywords = ["important", "key", "main", "primary", "essential", "critical",
+                          "significant", "result", "finding", "conclusion", "summary",
+                          "note", "remember", "focus", "must", "should", "need"]
+    scored_sentences = []
+    for sentence in sentences:
+        score = len(sentence)
+        for keyword in important_keywords:
+            if keyword.lower() in sentence.lower():
+                score += 50
+        if re.search(r'\d+', sentence):
+            score += 30
+        scored_sentences.append((score, sentence))
+    scored_sentences.sort(reverse=True, key=lambda x: x[0])
+    num_points = min(max_length // 20, 8, len(scored_sentences))
+    return "\n".join(f"• {sentence[0].upper()}{sentence[1:]}" for _, sentence in scored_sentences[:num_points])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=50, help="max PDFs to load")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-length", type=int, default=200)
+    args = parser.parse_args()
+
+    texts = load_texts(args.documents)
+    if not texts:
+        print("No PDFs with text found")
+        return
+    corpus = "\n\n".join(texts)
+    largest = corpus[:settings.MAX_TEXT_LENGTH]
+
+    legacy = best_of(lambda text: legacy_summarize(text, args.max_length), texts, args.repeat)
+    engine = best_of(lambda text: summarize(text, args.max_length), texts, args.repeat)
+    legacy_large = best_of(lambda text: legacy_summarize(text, args.max_length), [largest], args.repeat)
+    engine_large = best_of(lambda text: summarize(text, args.max_length), [largest], args.repeat)
+
+    print(f"{len(texts)} documents, {len(corpus):,} characters, best of {args.repeat}")
+    print(f"  all documents:      legacy {legacy * 1000:7.1f} ms   tf-idf {engine * 1000:7.1f} ms")
+    print(f"  {len(largest):,}-char document: legacy {legacy_large * 1000:7.1f} ms   tf-idf {engine_large * 1000:7.1f} ms")
+    print("\nLegacy summary of the first document:")
+    print(legacy_summarize(texts[0], args.max_length))
+    print("\nTF-IDF summary of the first document:")
+    print(summarize(texts[0], args.max_length))
+
+
+if __name__ == "__main__":
+    main()
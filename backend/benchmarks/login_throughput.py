@@ -0,0 +1,97 @@
+"""
+Login throughput benchmark.
+
+Fires a burst of concurrent logins at the app in-process and reports
+logins/second plus how long a cheap request (GET /) waits while the burst
+is running. --inline hashes on the event loop (the old behaviour) for
+comparison.
+
+Run from the backend directory:
+    python -m benchmarks.login_throughput --logins 64 --concurrency 16
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+import core.security as security
+from core.executors import shutdown_executors
+from core.storage import init_storage
+from main import app
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark-password"
+
+
+async def run(logins: int, concurrency: int) -> dict:
+    await init_storage()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={"email": EMAIL, "password": PASSWORD})
+
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def login():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        async def probe(stop: asyncio.Event, waits: list):
+            # Time a 10ms sleep plus a trivial request; anything beyond 10ms is event loop stall
+            while not stop.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                await client.get("/")
+                waits.append(time.perf_counter() - start - 0.01)
+
+        stop = asyncio.Event()
+        probe_waits = []
+        probe_task = asyncio.create_task(probe(stop, probe_waits))
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe_task
+
+    latencies.sort()
+    return {
+        "logins": logins,
+        "elapsed_s": round(elapsed, 2),
+        "logins_per_s": round(logins / elapsed, 1),
+        "login_p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "login_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "probe_max_wait_ms": round(max(probe_waits) * 1000, 1) if probe_waits else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop instead of the hashing pool")
+    args = parser.parse_args()
+
+    if args.inline:
+        async def run_inline(func, *func_args):
+            return func(*func_args)
+        security.run_in_hash_pool = run_inline
+
+    result = asyncio.run(run(args.logins, args.concurrency))
+    shutdown_executors()
+    mode = "inline" if args.inline else "hash pool"
+    print(f"bcrypt rounds={security.settings.BCRYPT_ROUNDS} mode={mode}")
+    for key, value in result.items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
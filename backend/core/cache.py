@@ -0,0 +1,146 @@
+"""
+In-process LRU cache with per-entry expiry, optional byte budget and hit/miss counters.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+
+class LRUCache:
+    """
+    Bounded LRU cache.
+
+    Args:
+        max_entries: Entries kept before the least recently used is evicted
+        ttl: Default time-to-live in seconds (None = no expiry)
+        max_bytes: Total size kept before evicting (None = no limit); needs sizeof
+        sizeof: Size in bytes of a value
+        on_remove: Called with (key, value) when an entry is evicted, expires or is deleted
+        group_of: Group of a key (e.g. the document it belongs to), so a whole group can be deleted at once
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        on_remove: Optional[Callable[[Hashable, Any], None]] = None,
+        group_of: Optional[Callable[[Hashable], Hashable]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.on_remove = on_remove
+        self.group_of = group_of
+        # key -> (value, monotonic deadline or None)
+        self.entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.sizes: Dict[Hashable, int] = {}
+        # group -> keys in it (only with group_of)
+        self.groups: Dict[Hashable, Set[Hashable]] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not None
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[Any, Optional[float]]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        deadline = entry[1]
+        if deadline is not None and deadline <= time.monotonic():
+            self.delete(key)
+            return None
+        return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it recently used"""
+        entry = self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            ttl: Time-to-live in seconds, overriding the cache default
+            expires_at: Absolute expiry as a Unix timestamp; the earlier of this and the TTL wins
+        """
+        ttl = self.ttl if ttl is None else ttl
+        deadline = time.monotonic() + ttl if ttl is not None else None
+        if expires_at is not None:
+            remaining = time.monotonic() + (expires_at - time.time())
+            deadline = remaining if deadline is None else min(deadline, remaining)
+        if self.sizeof is not None:
+            size = self.sizeof(value)
+            self.total_bytes += size - self.sizes.get(key, 0)
+            self.sizes[key] = size
+        self.entries[key] = (value, deadline)
+        self.entries.move_to_end(key)
+        if self.group_of is not None:
+            self.groups.setdefault(self.group_of(key), set()).add(key)
+        # Evict least recently used, but never the entry just stored
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_entries
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self.entries))
+            self.delete(oldest)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key, returning whether it was present"""
+        self.total_bytes -= self.sizes.pop(key, 0)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        if self.group_of is not None:
+            group = self.group_of(key)
+            keys = self.groups.get(group)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.groups[group]
+        if self.on_remove is not None:
+            self.on_remove(key, entry[0])
+        return True
+
+    def delete_group(self, group: Hashable) -> int:
+        """Remove every key in a group, returning how many were present"""
+        return sum(self.delete(key) for key in list(self.groups.get(group, ())))
+
+    def clear(self):
+        if self.on_remove is not None:
+            for key, (value, _) in self.entries.items():
+                self.on_remove(key, value)
+        self.entries.clear()
+        self.sizes.clear()
+        self.groups.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+        if self.sizeof is not None:
+            stats["bytes"] = self.total_bytes
+            stats["max_bytes"] = self.max_bytes
+        return stats
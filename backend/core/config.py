@@ -13,14 +13,77 @@ class Settings(BaseSettings):
   SECRET_KEY : str = os.getenv("secret_key", "your-secret-key-change-in-production")
   MONGO_URI : str = os.getenv("mongo_uri", "mongodb://localhost:27017")
   DATABASE_NAME: str = os.getenv("database_name", "eduneuro")
+  # Verified-token cache
+  TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+  TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "900"))  # Cap on top of token exp (0 = until exp)
+  # Password hashing
+  BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))  # Cost factor; existing hashes are upgraded on login
+  PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+  # Storage
+  STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "memory")  # memory, sqlite or mongo
+  SQLITE_PATH: str = os.getenv("SQLITE_PATH", "eduneuro.db")
   # OpenAI
   OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
   OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # gpt-4o-mini (better), gpt-4 (best), gpt-3.5-turbo (cheaper)
+  # LLM client
+  LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))  # Per-call timeout
+  LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # Max in-flight completions per worker
+  LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))  # Keep-alive pool size
+  LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+  LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))  # Seconds, doubled per retry
+  LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+  # Worker pools
+  WORKER_THREADS: int = int(os.getenv("WORKER_THREADS", "8"))  # Threads for blocking/CPU-bound stages
+  WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES", str(min(4, os.cpu_count() or 1))))  # Processes for PDF parsing
   # Document limits
   MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "10"))  # 10MB default
   MAX_TEXT_LENGTH: int = int(os.getenv("MAX_TEXT_LENGTH", "50000"))  # 50k characters default
   MAX_PDF_PAGES: int = int(os.getenv("MAX_PDF_PAGES", "100"))  # 100 pages default
   MAX_SUMMARY_LENGTH: int = int(os.getenv("MAX_SUMMARY_LENGTH", "500"))  # 500 words max
+  # PDF extraction
+  PDF_PAGES_PER_CHUNK: int = int(os.getenv("PDF_PAGES_PER_CHUNK", "4"))  # Pages parsed per worker task
+  MAX_CONCURRENT_EXTRACTIONS: int = int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", "2"))  # Uploads parsed at once
+  # Chunked LLM processing (long documents are split at section/paragraph boundaries)
+  SUMMARY_CHUNK_CHARS: int = int(os.getenv("SUMMARY_CHUNK_CHARS", "12000"))  # Text per LLM summary call; longer documents are map-reduced
+  SIMPLIFY_CHUNK_CHARS: int = int(os.getenv("SIMPLIFY_CHUNK_CHARS", "6000"))  # Text per LLM simplification call
+  SUMMARY_MAX_PARALLEL_CHUNKS: int = int(os.getenv("SUMMARY_MAX_PARALLEL_CHUNKS", "4"))  # Summary chunk calls in flight per document
+  SIMPLIFY_MAX_PARALLEL_CHUNKS: int = int(os.getenv("SIMPLIFY_MAX_PARALLEL_CHUNKS", "4"))  # Simplification chunk calls in flight per document
+  # Text-to-speech
+  TTS_CHUNK_CHARS: int = int(os.getenv("TTS_CHUNK_CHARS", "400"))  # Sentences are grouped into chunks up to this length
+  TTS_ENGINE: str = os.getenv("TTS_ENGINE", "gtts")  # gtts (online), espeak (offline, local CPU) or stub
+  TTS_MAX_CONCURRENCY: int = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))  # gTTS chunks synthesized at once
+  ESPEAK_MAX_CONCURRENCY: int = int(os.getenv("ESPEAK_MAX_CONCURRENCY", str(os.cpu_count() or 1)))  # espeak processes at once
+  # Audio cache
+  AUDIO_CACHE_MAX_MB: int = int(os.getenv("AUDIO_CACHE_MAX_MB", "500"))  # Disk budget for generated audio
+  AUDIO_CACHE_MAX_AGE_HOURS: float = float(os.getenv("AUDIO_CACHE_MAX_AGE_HOURS", "24"))  # Evict files unused for this long
+  AUDIO_JANITOR_INTERVAL_SECONDS: float = float(os.getenv("AUDIO_JANITOR_INTERVAL_SECONDS", "300"))  # How often quota and TTL are enforced
+  # Term lists, lexicon and chatbot intents (empty = bundled files in data/)
+  HIGHLIGHT_TERMS_PATH: str = os.getenv("HIGHLIGHT_TERMS_PATH", "")  # JSON term list; empty = bundled data/highlight_terms.json
+  SIMPLIFY_LEXICON_PATH: str = os.getenv("SIMPLIFY_LEXICON_PATH", "")  # JSON word map; empty = bundled data/simplify_lexicon.json
+  CHAT_INTENTS_PATH: str = os.getenv("CHAT_INTENTS_PATH", "")  # JSON intents for the offline chatbot; empty = bundled data/chat_intents.json
+  # Summary cache
+  SUMMARY_CACHE_MAX_ENTRIES: int = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "2000"))
+  SUMMARY_CACHE_MAX_MB: int = int(os.getenv("SUMMARY_CACHE_MAX_MB", "32"))  # Memory budget for cached summaries
+  SUMMARY_CACHE_PERSIST: bool = os.getenv("SUMMARY_CACHE_PERSIST", "true").lower() in ("1", "true", "yes")  # Also keep summaries in storage
+  # Result cache (simplified text, highlights, quizzes)
+  RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+  RESULT_CACHE_MAX_MB: int = int(os.getenv("RESULT_CACHE_MAX_MB", "128"))  # Memory budget for cached results
+  # Chat sessions
+  CHAT_HISTORY_MAX_TOKENS: int = int(os.getenv("CHAT_HISTORY_MAX_TOKENS", "2000"))  # History sent to the model per turn
+  CHAT_KEEP_RECENT_MESSAGES: int = int(os.getenv("CHAT_KEEP_RECENT_MESSAGES", "6"))  # Kept verbatim when older turns are summarized
+  CHAT_SUMMARY_MAX_TOKENS: int = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "300"))  # Length of the rolling summary of older turns
+  CHAT_SESSION_TTL_SECONDS: int = int(os.getenv("CHAT_SESSION_TTL_SECONDS", "86400"))  # Sessions idle this long are deleted
+  # Document retrieval for chat
+  RETRIEVAL_CHUNK_CHARS: int = int(os.getenv("RETRIEVAL_CHUNK_CHARS", "1000"))  # Passage size documents are indexed in
+  RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", "4"))  # Passages added to the prompt per message
+  RETRIEVAL_INDEX_CACHE_MAX_ENTRIES: int = int(os.getenv("RETRIEVAL_INDEX_CACHE_MAX_ENTRIES", "500"))  # Document indexes kept in memory
+  RETRIEVAL_INDEX_CACHE_MB: int = int(os.getenv("RETRIEVAL_INDEX_CACHE_MB", "64"))  # Memory budget for document indexes
+  # Background jobs (process, summarize, quiz)
+  JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))  # Jobs run at once per server process
+  JOB_MAX_QUEUED_PER_USER: int = int(os.getenv("JOB_MAX_QUEUED_PER_USER", "10"))  # Further submissions get 429
+  JOB_TIMEOUT_SECONDS: int = int(os.getenv("JOB_TIMEOUT_SECONDS", "600"))
+  JOB_EVENTS_POLL_SECONDS: int = int(os.getenv("JOB_EVENTS_POLL_SECONDS", "10"))  # How often an event stream re-reads storage for jobs run elsewhere
+  JOB_RETENTION_SECONDS: int = int(os.getenv("JOB_RETENTION_SECONDS", "86400"))  # Finished jobs and their results are deleted after this
   
   
   model_config = SettingsConfigDict(env_file=".env")
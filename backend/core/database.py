@@ -21,6 +21,11 @@ async def connect_to_mongo():
     except Exception as e:
         logger.warning(f"Warning: Could not connect to MongoDB: {e}")
         logger.warning("Server will continue without database connection. Auth endpoints will not work.")
+        # Leave no half-connected client behind, so callers see get_database() is None
+        if database.client:
+            database.client.close()
+        database.client = None
+        database.database = None
         # Don't raise - allow server to start without MongoDB
         # This is useful for development and endpoints that don't require DB (like TTS)
 
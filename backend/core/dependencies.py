@@ -1,15 +1,25 @@
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
 from core.config import settings
+from core.storage import normalize_email
+from core.token_cache import token_digest, get_cached_principal, cache_principal
 from schemas.user import UserResponse
 from services.auth_service import get_user_by_email
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserResponse:
     """Get current authenticated user from JWT token"""
+    # Tokens verified before skip signature verification and the user lookup
+    digest = token_digest(token)
+    cached_user = get_cached_principal(digest)
+    if cached_user is not None:
+        return cached_user
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -27,9 +37,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserResponse:
     if user is None:
         raise credentials_exception
     
-    return UserResponse(
+    current_user = UserResponse(
         id=str(user.id),
         email=user.email,
         created_at=user.created_at
     )
+    cache_principal(digest, normalize_email(user.email), current_user, payload.get("exp"))
+    return current_user
+
 
+async def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[UserResponse]:
+    """Get the authenticated user if a valid token was sent, otherwise None"""
+    if not token:
+        return None
+    try:
+        return await get_current_user(token)
+    except HTTPException:
+        return None
@@ -0,0 +1,100 @@
+"""
+Shared worker pools for blocking and CPU-bound work.
+
+Anything that would otherwise stall the event loop (file I/O, network
+libraries without async support, CPU-heavy text processing) is handed to
+these pools from async code.
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Executors:
+    thread_pool: Optional[ThreadPoolExecutor] = None
+    process_pool: Optional[ProcessPoolExecutor] = None
+    hash_pool: Optional[ThreadPoolExecutor] = None
+
+executors = Executors()
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Get the shared thread pool, creating it on first use"""
+    if executors.thread_pool is None:
+        executors.thread_pool = ThreadPoolExecutor(
+            max_workers=settings.WORKER_THREADS,
+            thread_name_prefix="worker"
+        )
+    return executors.thread_pool
+
+
+async def run_in_thread(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking function on the shared thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_thread_pool(), functools.partial(func, *args, **kwargs))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool, creating it on first use"""
+    if executors.process_pool is None:
+        # spawn: forking a process that already runs threads is unsafe
+        executors.process_pool = ProcessPoolExecutor(
+            max_workers=settings.WORKER_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return executors.process_pool
+
+
+async def run_in_process(func: Callable, *args) -> Any:
+    """Run a CPU-bound, picklable function on the shared process pool"""
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a malformed PDF); start a fresh pool next time
+        if executors.process_pool is pool:
+            executors.process_pool = None
+        raise
+
+
+def get_hash_pool() -> ThreadPoolExecutor:
+    """Get the dedicated password hashing pool, creating it on first use"""
+    if executors.hash_pool is None:
+        # bcrypt releases the GIL, so threads hash in parallel; kept separate so
+        # a login burst can't starve the general worker pool
+        executors.hash_pool = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash"
+        )
+    return executors.hash_pool
+
+
+async def run_in_hash_pool(func: Callable, *args) -> Any:
+    """Run a password hashing function on the dedicated hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_pool(), func, *args)
+
+
+def shutdown_executors():
+    """Shut down all worker pools"""
+    if executors.hash_pool is not None:
+        executors.hash_pool.shutdown(wait=False, cancel_futures=True)
+        executors.hash_pool = None
+        logger.info("Shut down password hashing pool")
+    if executors.process_pool is not None:
+        executors.process_pool.shutdown(wait=False, cancel_futures=True)
+        executors.process_pool = None
+        logger.info("Shut down worker process pool")
+    if executors.thread_pool is not None:
+        executors.thread_pool.shutdown(wait=False, cancel_futures=True)
+        executors.thread_pool = None
+        logger.info("Shut down worker thread pool")
@@ -0,0 +1,140 @@
+"""
+Conditional and cacheable file responses.
+
+Files are served with a strong ETag derived from their content hash, so
+clients can revalidate with If-None-Match and get an empty 304. Range
+requests (seeking in audio players) are handled by Starlette's FileResponse,
+which also honours If-Range against the same ETag.
+
+Files in content-addressed locations (uploaded documents, stored as
+<sha256 of their bytes>.<ext>) never change, so their hash is the file name
+and they are marked immutable. Other files, including audio (named by its
+synthesis parameters, so it can be regenerated with different bytes), are
+hashed once per (path, mtime, size) and must be revalidated.
+"""
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+from .cache import LRUCache
+from .executors import run_in_thread
+
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# (path, mtime_ns, size) -> sha256 of files that are not content-addressed
+_digests = LRUCache(max_entries=4096)
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file in 1MB blocks (blocking)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def file_etag(path: str, stat_result: os.stat_result, content_addressed: bool = False) -> Tuple[str, bool]:
+    """
+    Strong ETag for a file.
+
+    Args:
+        content_addressed: The file lives where names are the sha256 of the contents
+
+    Returns:
+        (quoted etag, whether the file is content-addressed and so immutable)
+    """
+    stem = Path(path).stem
+    if content_addressed and CONTENT_ADDRESSED_NAME.match(stem):
+        return f'"{stem}"', True
+    key = (str(path), stat_result.st_mtime_ns, stat_result.st_size)
+    digest = _digests.get(key)
+    if digest is None:
+        digest = await run_in_thread(file_sha256, path)
+        _digests.set(key, digest)
+    return f'"{digest}"', False
+
+
+def is_not_modified(request_headers: Headers, etag: str) -> bool:
+    """Whether If-None-Match already names this ETag"""
+    if_none_match = request_headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+async def cached_file_response(
+    request_headers: Headers,
+    path: str,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    stat_result: Optional[os.stat_result] = None,
+    content_addressed: bool = False
+) -> Response:
+    """Serve a file with ETag/Cache-Control headers, a 304 when the client has it, and range support"""
+    if stat_result is None:
+        stat_result = await run_in_thread(os.stat, path)
+    etag, immutable = await file_etag(path, stat_result, content_addressed)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE if immutable else REVALIDATE,
+        "Accept-Ranges": "bytes",
+    }
+    if is_not_modified(request_headers, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result
+    )
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with content-hash ETags, and immutable caching under content_addressed_dirs
+
+    Args:
+        content_addressed_dirs: Subdirectories whose files are named by the sha256 of their contents
+        on_serve: Subdirectory -> callback called with the name of each file served from it
+    """
+
+    def __init__(
+        self,
+        *args,
+        content_addressed_dirs: Tuple[str, ...] = (),
+        on_serve: Optional[Dict[str, Callable[[str], object]]] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.content_addressed_dirs = content_addressed_dirs
+        self.on_serve = on_serve or {}
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        # Conditional handling happens in get_response, against the content ETag
+        return FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+    async def get_response(self, path: str, scope) -> Response:
+        response = await super().get_response(path, scope)
+        if isinstance(response, FileResponse) and response.status_code == 200:
+            parts = Path(path).parts
+            if len(parts) > 1 and parts[0] in self.on_serve:
+                self.on_serve[parts[0]](parts[-1])
+            return await cached_file_response(
+                Headers(scope=scope),
+                response.path,
+                stat_result=response.stat_result,
+                content_addressed=parts[0] in self.content_addressed_dirs
+            )
+        return response
@@ -0,0 +1,171 @@
+"""
+Shared async OpenAI client used by every service.
+
+One pooled client is created lazily and reused, so completions never block
+the event loop and connections are kept alive between calls. Completions can
+also be streamed token by token (stream_chat_completion).
+"""
+import asyncio
+import logging
+import random
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying - everything else (bad request, auth, ...) fails fast
+RETRYABLE_ERRORS = (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
+
+
+class LLMClient:
+    client: Optional[AsyncOpenAI] = None
+    semaphore: Optional[asyncio.Semaphore] = None
+
+llm = LLMClient()
+
+
+def get_llm_client() -> AsyncOpenAI:
+    """Get the shared async client, creating it on first use"""
+    if llm.client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
+        llm.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=http_client,
+            max_retries=0,  # Retries are handled below so they share the concurrency limit
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
+    return llm.client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    if llm.semaphore is None:
+        llm.semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    return llm.semaphore
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter"""
+    delay = min(settings.LLM_RETRY_BASE_DELAY * (2 ** attempt), settings.LLM_RETRY_MAX_DELAY)
+    return random.uniform(0, delay)
+
+
+async def chat_completion(
+    messages: List[Dict[str, str]],
+    temperature: float = 0.7,
+    max_tokens: int = 500,
+    response_format: Optional[Dict] = None,
+    timeout: Optional[float] = None,
+    model: Optional[str] = None,
+) -> str:
+    """
+    Run a chat completion on the shared client.
+
+    Args:
+        messages: Chat messages in OpenAI format
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in the response
+        response_format: Optional response format (e.g. {"type": "json_object"})
+        timeout: Per-call timeout in seconds (defaults to LLM_TIMEOUT_SECONDS)
+        model: Model override (defaults to OPENAI_MODEL)
+
+    Returns:
+        The stripped content of the first choice
+    """
+    client = get_llm_client()
+    kwargs = {
+        "model": model or settings.OPENAI_MODEL,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "timeout": timeout or settings.LLM_TIMEOUT_SECONDS,
+    }
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+
+    attempt = 0
+    while True:
+        try:
+            async with _get_semaphore():
+                response = await client.chat.completions.create(**kwargs)
+            return (response.choices[0].message.content or "").strip()
+        except RETRYABLE_ERRORS as e:
+            if attempt >= settings.LLM_MAX_RETRIES:
+                raise
+            delay = _backoff_delay(attempt)
+            attempt += 1
+            logger.warning(f"LLM call failed ({type(e).__name__}), retry {attempt} in {delay:.2f}s")
+            # Sleep outside the semaphore so waiting retries don't hold a slot
+            await asyncio.sleep(delay)
+
+
+async def stream_chat_completion(
+    messages: List[Dict[str, str]],
+    temperature: float = 0.7,
+    max_tokens: int = 500,
+    timeout: Optional[float] = None,
+    model: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a chat completion on the shared client, yielding content deltas as they arrive.
+
+    Only opening the stream is retried; once tokens have been yielded an error is raised
+    to the caller. Closing the generator (e.g. when the client disconnects) closes the
+    upstream response, so the model stops generating.
+    """
+    client = get_llm_client()
+    kwargs = {
+        "model": model or settings.OPENAI_MODEL,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "timeout": timeout or settings.LLM_TIMEOUT_SECONDS,
+        "stream": True,
+    }
+
+    attempt = 0
+    while True:
+        async with _get_semaphore():
+            try:
+                stream = await client.chat.completions.create(**kwargs)
+            except RETRYABLE_ERRORS as e:
+                if attempt >= settings.LLM_MAX_RETRIES:
+                    raise
+                error = e
+            else:
+                # The slot is held while streaming, like a regular completion
+                try:
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                finally:
+                    await stream.close()
+                return
+        delay = _backoff_delay(attempt)
+        attempt += 1
+        logger.warning(f"LLM stream failed to start ({type(error).__name__}), retry {attempt} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+
+async def close_llm_client():
+    """Close the shared client and its connection pool"""
+    if llm.client is not None:
+        await llm.client.close()
+        llm.client = None
+        logger.info("Closed LLM client")
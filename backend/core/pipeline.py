@@ -0,0 +1,82 @@
+"""
+Concurrent stage executor.
+
+Each stage is an independent unit of work with its own fallback. All stages
+of a pipeline run at the same time, so total latency is roughly that of the
+slowest stage instead of the sum of all of them.
+"""
+import asyncio
+import inspect
+import logging
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from .executors import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """
+    A single pipeline stage.
+
+    Args:
+        name: Key the stage result is stored under
+        func: Coroutine function, or plain function when blocking=True
+        *args, **kwargs: Arguments passed to func
+        fallback: Optional function called with the same arguments if func fails
+        blocking: Run func on the worker thread pool instead of the event loop
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        *args,
+        fallback: Optional[Callable] = None,
+        blocking: bool = False,
+        **kwargs
+    ):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.fallback = fallback
+        self.blocking = blocking
+
+    async def _call(self, func: Callable, blocking: bool) -> Any:
+        if blocking:
+            return await run_in_thread(func, *self.args, **self.kwargs)
+        result = func(*self.args, **self.kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def run(self) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await self._call(self.func, self.blocking)
+            logger.info(f"Stage '{self.name}' finished in {time.perf_counter() - start:.2f}s")
+            return result
+        except Exception as e:
+            print(f"Error in stage '{self.name}': {str(e)}")
+            print(traceback.format_exc())
+            if self.fallback is None:
+                return None
+            try:
+                return await self._call(self.fallback, False)
+            except Exception as fallback_error:
+                print(f"Fallback for stage '{self.name}' failed: {str(fallback_error)}")
+                return None
+
+
+async def run_pipeline(stages: List[Stage]) -> Dict[str, Any]:
+    """
+    Run all stages concurrently.
+
+    Returns:
+        Dictionary mapping each stage name to its result (or fallback result)
+    """
+    results = await asyncio.gather(*(stage.run() for stage in stages))
+    return {stage.name: result for stage, result in zip(stages, results)}
@@ -1,10 +1,18 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 from jose import jwt
 from passlib.context import CryptContext
 from .config import settings
+from .executors import run_in_hash_pool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with any other cost than BCRYPT_ROUNDS need an update and are rehashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
    
@@ -14,6 +22,20 @@ def get_password_hash(password: str) -> str:
     
     return pwd_context.hash(password)
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the dedicated hashing pool"""
+    return await run_in_hash_pool(pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the dedicated hashing pool
+    
+    Returns:
+        Tuple of (valid, new_hash). new_hash is set when the stored hash uses
+        an outdated cost factor and should be replaced.
+    """
+    return await run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -0,0 +1,52 @@
+"""
+Coalescing of concurrent calls for the same key.
+
+The first caller for a key runs the computation; callers arriving while it
+runs await its result instead of repeating the work. Only ordinary
+exceptions are shared. If the running call is cancelled (client went away,
+job cancelled or timed out), the waiters are not cancelled with it: the
+next one takes over and computes.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self.inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self.inflight)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.inflight
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run compute for key, or await the call for key already running"""
+        while key in self.inflight:
+            future = self.inflight[key]
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Retry only if the running call was cancelled, not this caller
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            value = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self.inflight[key]
+        future.set_result(value)
+        return value
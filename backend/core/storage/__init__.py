@@ -0,0 +1,244 @@
+"""
+Pluggable storage for users, documents and derived data.
+
+The backend is chosen with STORAGE_BACKEND:
+- memory: plain dicts (default, lost on restart)
+- sqlite: embedded SQLite file at SQLITE_PATH
+- mongo: MongoDB via the motor client in core.database
+
+Document text is stored once per content hash in the "texts" collection and
+only loaded when a caller asks for it.
+"""
+from typing import Optional
+from datetime import datetime
+import logging
+import uuid
+
+from core.config import settings
+from core.database import connect_to_mongo, close_mongo_connection, get_database
+from core.token_cache import invalidate_user
+from .base import StorageBackend, DuplicateKeyError
+from .memory import MemoryStorage
+
+logger = logging.getLogger(__name__)
+
+
+class Storage:
+    backend: StorageBackend = MemoryStorage()
+
+storage = Storage()
+
+
+def get_storage() -> StorageBackend:
+    """Get the active storage backend"""
+    return storage.backend
+
+
+async def init_storage():
+    """Create and connect the configured storage backend"""
+    backend_name = settings.STORAGE_BACKEND.lower()
+    if backend_name == "sqlite":
+        from .sqlite import SQLiteStorage
+        backend = SQLiteStorage(settings.SQLITE_PATH)
+    elif backend_name == "mongo":
+        from .mongo import MongoStorage
+        await connect_to_mongo()
+        if get_database() is None:
+            logger.warning("MongoDB unavailable, falling back to in-memory storage")
+            backend = MemoryStorage()
+        else:
+            backend = MongoStorage(get_database())
+    else:
+        backend = MemoryStorage()
+    await backend.connect()
+    await backend.create_unique_index("users", "email_key")
+    storage.backend = backend
+    logger.info(f"Storage backend: {backend.name}")
+
+
+async def close_storage():
+    """Close the storage backend"""
+    await storage.backend.close()
+    if storage.backend.name == "mongo":
+        await close_mongo_connection()
+
+
+def generate_id() -> str:
+    """Generate a unique ID"""
+    return str(uuid.uuid4())
+
+
+# Users
+
+def normalize_email(email: str) -> str:
+    """Normalize an email for lookups and uniqueness"""
+    return email.strip().lower()
+
+async def get_user_by_email(email: str) -> Optional[dict]:
+    """Get user by email (O(1) via the unique email_key index)"""
+    return await storage.backend.find_one("users", "email_key", normalize_email(email))
+
+async def get_user_by_id(user_id: str) -> Optional[dict]:
+    """Get user by ID"""
+    return await storage.backend.get("users", user_id)
+
+async def create_user(email: str, hashed_password: str) -> dict:
+    """Create a new user (raises DuplicateKeyError if the email is taken)"""
+    user_id = generate_id()
+    user_data = {
+        "id": user_id,
+        "email": email,
+        "email_key": normalize_email(email),
+        "hashed_password": hashed_password,
+        "created_at": datetime.utcnow()
+    }
+    await storage.backend.insert("users", user_id, user_data)
+    return user_data
+
+async def update_user(user_id: str, fields: dict) -> Optional[dict]:
+    """Update fields of a user, returning the updated user"""
+    user = await storage.backend.get("users", user_id)
+    if user is None:
+        return None
+    user.update(fields)
+    await storage.backend.put("users", user_id, user)
+    invalidate_user(user["email_key"])
+    return user
+
+async def delete_user(user_id: str) -> bool:
+    """Delete a user (and its email index entry)"""
+    user = await storage.backend.get("users", user_id)
+    if user is None:
+        return False
+    invalidate_user(user["email_key"])
+    return await storage.backend.delete("users", user_id)
+
+async def user_exists(email: str) -> bool:
+    """Check if user exists by email"""
+    return await get_user_by_email(email) is not None
+
+
+# Documents
+
+async def get_document(document_id: str) -> Optional[dict]:
+    """Get document metadata (without text)"""
+    return await storage.backend.get("documents", document_id)
+
+async def save_document(document_id: str, document_data: dict):
+    """Insert or replace document metadata"""
+    await storage.backend.put("documents", document_id, document_data)
+
+async def delete_document(document_id: str) -> bool:
+    """Delete document metadata"""
+    return await storage.backend.delete("documents", document_id)
+
+
+# Blobs - uploaded content shared by every document with the same sha256
+
+async def get_blob(content_hash: str) -> Optional[dict]:
+    """Get blob metadata (without text)"""
+    return await storage.backend.get("blobs", content_hash)
+
+async def save_blob(content_hash: str, blob_data: dict, text: str) -> bool:
+    """Store blob metadata and its extracted text unless the blob already exists"""
+    await storage.backend.put("texts", content_hash, {"text": text})
+    return await storage.backend.insert("blobs", content_hash, blob_data)
+
+async def add_blob_ref(content_hash: str, amount: int) -> Optional[int]:
+    """Adjust a blob's reference count, returning the new count (None if the blob is gone)"""
+    return await storage.backend.increment("blobs", content_hash, "ref_count", amount)
+
+async def delete_blob(content_hash: str) -> bool:
+    """Delete an unreferenced blob with its text and summary; False if it gained a reference meanwhile"""
+    if not await storage.backend.delete_if("blobs", content_hash, "ref_count", 0):
+        return False
+    await storage.backend.delete("texts", content_hash)
+    await storage.backend.delete("summaries", content_hash)
+    return True
+
+async def get_text(content_hash: str) -> Optional[str]:
+    """Load the extracted text of a blob"""
+    record = await storage.backend.get("texts", content_hash)
+    return record["text"] if record else None
+
+
+# Summaries
+
+async def get_summary(key: str) -> Optional[dict]:
+    """Get a cached summary"""
+    return await storage.backend.get("summaries", key)
+
+async def save_summary(key: str, summary_data: dict):
+    """Cache a summary"""
+    await storage.backend.put("summaries", key, summary_data)
+
+
+# Chat sessions
+
+async def get_chat_session(session_id: str) -> Optional[dict]:
+    """Get a chat session (history and rolling summary)"""
+    return await storage.backend.get("chat_sessions", session_id)
+
+async def save_chat_session(session_id: str, session_data: dict):
+    """Insert or replace a chat session"""
+    await storage.backend.put("chat_sessions", session_id, session_data)
+
+async def delete_chat_session(session_id: str) -> bool:
+    """Delete a chat session"""
+    return await storage.backend.delete("chat_sessions", session_id)
+
+async def delete_idle_chat_sessions(cutoff: datetime) -> int:
+    """Delete chat sessions last updated before cutoff"""
+    return await storage.backend.delete_before("chat_sessions", "updated_at", cutoff)
+
+async def get_job(job_id: str) -> Optional[dict]:
+    """Get a background job (status, params and result)"""
+    return await storage.backend.get("jobs", job_id)
+
+async def save_job(job_id: str, job_data: dict):
+    """Insert or replace a background job"""
+    await storage.backend.put("jobs", job_id, job_data)
+
+async def delete_job(job_id: str) -> bool:
+    """Delete a background job"""
+    return await storage.backend.delete("jobs", job_id)
+
+async def delete_expired_jobs(now: datetime) -> int:
+    """Delete finished jobs whose retention ended before now"""
+    return await storage.backend.delete_before("jobs", "expires_at", now)
+
+
+__all__ = [
+    "StorageBackend",
+    "DuplicateKeyError",
+    "MemoryStorage",
+    "get_storage",
+    "init_storage",
+    "close_storage",
+    "generate_id",
+    "normalize_email",
+    "get_user_by_email",
+    "get_user_by_id",
+    "create_user",
+    "user_exists",
+    "update_user",
+    "delete_user",
+    "get_document",
+    "save_document",
+    "delete_document",
+    "get_blob",
+    "save_blob",
+    "add_blob_ref",
+    "delete_blob",
+    "get_text",
+    "get_summary",
+    "save_summary",
+    "get_chat_session",
+    "save_chat_session",
+    "delete_chat_session",
+    "delete_idle_chat_sessions",
+    "get_job",
+    "save_job",
+    "delete_job",
+    "delete_expired_jobs",
+]
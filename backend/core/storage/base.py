@@ -0,0 +1,62 @@
+"""
+Storage backend interface.
+
+Backends store JSON-like records in named collections ("users",
+"documents", "blobs", "texts", "summaries"). Large document text lives in
+its own "texts" collection so metadata lookups never load it.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Optional
+
+
+class DuplicateKeyError(Exception):
+    """Raised when a write would violate a unique index"""
+
+
+class StorageBackend(ABC):
+    """Base class for storage backends; subclasses must implement every abstract method"""
+
+    name = "base"
+
+    async def connect(self):
+        """Open connections / create tables"""
+
+    async def close(self):
+        """Release connections"""
+
+    @abstractmethod
+    async def create_unique_index(self, collection: str, field: str):
+        """Index a field for O(1) find_one lookups and reject duplicate values"""
+
+    @abstractmethod
+    async def get(self, collection: str, key: str) -> Optional[dict]:
+        """Get a record by key, or None"""
+
+    @abstractmethod
+    async def put(self, collection: str, key: str, value: dict):
+        """Insert or replace a record"""
+
+    @abstractmethod
+    async def insert(self, collection: str, key: str, value: dict) -> bool:
+        """Insert a record only if the key is free, returning whether it was inserted"""
+
+    @abstractmethod
+    async def delete(self, collection: str, key: str) -> bool:
+        """Delete a record, returning whether it existed"""
+
+    @abstractmethod
+    async def delete_if(self, collection: str, key: str, field: str, value: Any) -> bool:
+        """Atomically delete a record only if field equals value, returning whether it was deleted"""
+
+    @abstractmethod
+    async def delete_before(self, collection: str, field: str, cutoff: datetime) -> int:
+        """Delete every record whose datetime field is earlier than cutoff, returning how many"""
+
+    @abstractmethod
+    async def find_one(self, collection: str, field: str, value: Any) -> Optional[dict]:
+        """Get the first record whose field equals value"""
+
+    @abstractmethod
+    async def increment(self, collection: str, key: str, field: str, amount: int = 1) -> Optional[int]:
+        """Atomically add amount to a numeric field, returning the new value (None if missing)"""
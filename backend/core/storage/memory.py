@@ -0,0 +1,101 @@
+"""
+In-memory storage using dictionaries
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .base import StorageBackend, DuplicateKeyError
+
+
+class MemoryStorage(StorageBackend):
+    """Process-local dict store. Data is lost on restart and not shared across workers."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.collections: Dict[str, Dict[str, dict]] = {}
+        # collection -> field -> field value -> record key
+        self.indexes: Dict[str, Dict[str, Dict[Any, str]]] = {}
+
+    def _collection(self, collection: str) -> Dict[str, dict]:
+        return self.collections.setdefault(collection, {})
+
+    def _index_record(self, collection: str, key: str, value: dict):
+        """Point every unique index at the new record, dropping the old record's entries"""
+        indexes = self.indexes.get(collection)
+        if not indexes:
+            return
+        for field, index in indexes.items():
+            owner = index.get(value.get(field))
+            if owner is not None and owner != key:
+                raise DuplicateKeyError(f"Duplicate {collection}.{field}: {value.get(field)}")
+        old = self._collection(collection).get(key)
+        for field, index in indexes.items():
+            if old is not None:
+                index.pop(old.get(field), None)
+            if value.get(field) is not None:
+                index[value[field]] = key
+
+    def _unindex_record(self, collection: str, record: dict):
+        for field, index in self.indexes.get(collection, {}).items():
+            index.pop(record.get(field), None)
+
+    async def create_unique_index(self, collection: str, field: str):
+        index = {}
+        for key, record in self._collection(collection).items():
+            if record.get(field) is not None:
+                index[record[field]] = key
+        self.indexes.setdefault(collection, {})[field] = index
+
+    async def get(self, collection: str, key: str) -> Optional[dict]:
+        value = self._collection(collection).get(key)
+        return dict(value) if value is not None else None
+
+    async def put(self, collection: str, key: str, value: dict):
+        self._index_record(collection, key, value)
+        self._collection(collection)[key] = dict(value)
+
+    async def insert(self, collection: str, key: str, value: dict) -> bool:
+        records = self._collection(collection)
+        if key in records:
+            return False
+        self._index_record(collection, key, value)
+        records[key] = dict(value)
+        return True
+
+    async def delete(self, collection: str, key: str) -> bool:
+        record = self._collection(collection).pop(key, None)
+        if record is None:
+            return False
+        self._unindex_record(collection, record)
+        return True
+
+    async def delete_if(self, collection: str, key: str, field: str, value: Any) -> bool:
+        record = self._collection(collection).get(key)
+        if record is None or record.get(field) != value:
+            return False
+        return await self.delete(collection, key)
+
+    async def delete_before(self, collection: str, field: str, cutoff: datetime) -> int:
+        records = self._collection(collection)
+        expired = [key for key, record in records.items() if record.get(field) is not None and record[field] < cutoff]
+        for key in expired:
+            await self.delete(collection, key)
+        return len(expired)
+
+    async def find_one(self, collection: str, field: str, value: Any) -> Optional[dict]:
+        index = self.indexes.get(collection, {}).get(field)
+        if index is not None:
+            key = index.get(value)
+            return await self.get(collection, key) if key is not None else None
+        for record in self._collection(collection).values():
+            if record.get(field) == value:
+                return dict(record)
+        return None
+
+    async def increment(self, collection: str, key: str, field: str, amount: int = 1) -> Optional[int]:
+        record = self._collection(collection).get(key)
+        if record is None:
+            return None
+        record[field] = record.get(field, 0) + amount
+        return record[field]
@@ -0,0 +1,76 @@
+"""
+MongoDB storage on the motor client from core.database.
+
+Each collection maps to a MongoDB collection with the record key as _id.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError as MongoDuplicateKeyError
+
+from .base import StorageBackend, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+
+def _strip_id(document: Optional[dict]) -> Optional[dict]:
+    if document is not None:
+        document.pop("_id", None)
+    return document
+
+
+class MongoStorage(StorageBackend):
+    name = "mongo"
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.database = database
+
+    async def create_unique_index(self, collection: str, field: str):
+        await self.database[collection].create_index(field, unique=True, sparse=True)
+
+    async def get(self, collection: str, key: str) -> Optional[dict]:
+        return _strip_id(await self.database[collection].find_one({"_id": key}))
+
+    async def put(self, collection: str, key: str, value: dict):
+        try:
+            await self.database[collection].replace_one({"_id": key}, {**value, "_id": key}, upsert=True)
+        except MongoDuplicateKeyError as e:
+            raise DuplicateKeyError(str(e))
+
+    async def insert(self, collection: str, key: str, value: dict) -> bool:
+        if await self.database[collection].find_one({"_id": key}, projection={"_id": 1}):
+            return False
+        try:
+            await self.database[collection].insert_one({**value, "_id": key})
+            return True
+        except MongoDuplicateKeyError as e:
+            # Lost a race for the same _id, or another unique field clashed
+            if "_id_" in str(e):
+                return False
+            raise DuplicateKeyError(str(e))
+
+    async def delete(self, collection: str, key: str) -> bool:
+        result = await self.database[collection].delete_one({"_id": key})
+        return result.deleted_count > 0
+
+    async def delete_if(self, collection: str, key: str, field: str, value: Any) -> bool:
+        result = await self.database[collection].delete_one({"_id": key, field: value})
+        return result.deleted_count > 0
+
+    async def delete_before(self, collection: str, field: str, cutoff: datetime) -> int:
+        result = await self.database[collection].delete_many({field: {"$lt": cutoff}})
+        return result.deleted_count
+
+    async def find_one(self, collection: str, field: str, value: Any) -> Optional[dict]:
+        return _strip_id(await self.database[collection].find_one({field: value}))
+
+    async def increment(self, collection: str, key: str, field: str, amount: int = 1) -> Optional[int]:
+        document = await self.database[collection].find_one_and_update(
+            {"_id": key},
+            {"$inc": {field: amount}},
+            return_document=ReturnDocument.AFTER
+        )
+        return document[field] if document is not None else None
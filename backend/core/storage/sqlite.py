@@ -0,0 +1,153 @@
+"""
+Embedded SQLite storage for single-node deployments.
+
+Records are stored as JSON in one table keyed by (collection, key). All
+queries run on the shared worker thread pool so they never block the event
+loop.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Optional
+
+from core.executors import run_in_thread
+from .base import StorageBackend, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj: dict) -> Any:
+    if len(obj) == 1 and "$date" in obj:
+        return datetime.fromisoformat(obj["$date"])
+    return obj
+
+
+def dumps(value: dict) -> str:
+    return json.dumps(value, default=_encode)
+
+
+def loads(data: str) -> dict:
+    return json.loads(data, object_hook=_decode)
+
+
+class SQLiteStorage(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " collection TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " PRIMARY KEY (collection, key))"
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self.lock:
+            try:
+                return self.conn.execute(sql, params).fetchall()
+            except sqlite3.IntegrityError as e:
+                raise DuplicateKeyError(str(e))
+
+    async def create_unique_index(self, collection: str, field: str):
+        # Partial expression index; find_one inlines the same expression so the planner uses it
+        await run_in_thread(
+            self._execute,
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{collection}_{field}"
+            f" ON records (json_extract(value, '$.{field}')) WHERE collection = '{collection}'"
+        )
+
+    async def connect(self):
+        await run_in_thread(self._connect)
+        logger.info(f"Using SQLite storage at {self.path}")
+
+    async def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    async def get(self, collection: str, key: str) -> Optional[dict]:
+        rows = await run_in_thread(
+            self._execute,
+            "SELECT value FROM records WHERE collection = ? AND key = ?",
+            (collection, key)
+        )
+        return loads(rows[0][0]) if rows else None
+
+    async def put(self, collection: str, key: str, value: dict):
+        await run_in_thread(
+            self._execute,
+            "INSERT INTO records (collection, key, value) VALUES (?, ?, ?)"
+            " ON CONFLICT (collection, key) DO UPDATE SET value = excluded.value",
+            (collection, key, dumps(value))
+        )
+
+    async def insert(self, collection: str, key: str, value: dict) -> bool:
+        rows = await run_in_thread(
+            self._execute,
+            "INSERT INTO records (collection, key, value) VALUES (?, ?, ?)"
+            " ON CONFLICT (collection, key) DO NOTHING RETURNING key",
+            (collection, key, dumps(value))
+        )
+        return bool(rows)
+
+    async def delete(self, collection: str, key: str) -> bool:
+        rows = await run_in_thread(
+            self._execute,
+            "DELETE FROM records WHERE collection = ? AND key = ? RETURNING key",
+            (collection, key)
+        )
+        return bool(rows)
+
+    async def delete_if(self, collection: str, key: str, field: str, value: Any) -> bool:
+        rows = await run_in_thread(
+            self._execute,
+            "DELETE FROM records WHERE collection = ? AND key = ? AND json_extract(value, ?) = ? RETURNING key",
+            (collection, key, f"$.{field}", value)
+        )
+        return bool(rows)
+
+    async def delete_before(self, collection: str, field: str, cutoff: datetime) -> int:
+        # Datetimes are stored as {"$date": isoformat}, which sorts chronologically as text
+        rows = await run_in_thread(
+            self._execute,
+            "DELETE FROM records WHERE collection = ? AND json_extract(value, ?) < ? RETURNING key",
+            (collection, f'$.{field}."$date"', cutoff.isoformat())
+        )
+        return len(rows)
+
+    async def find_one(self, collection: str, field: str, value: Any) -> Optional[dict]:
+        # Collection and field names are internal identifiers, never user input
+        rows = await run_in_thread(
+            self._execute,
+            f"SELECT value FROM records WHERE collection = '{collection}'"
+            f" AND json_extract(value, '$.{field}') = ? LIMIT 1",
+            (value,)
+        )
+        return loads(rows[0][0]) if rows else None
+
+    async def increment(self, collection: str, key: str, field: str, amount: int = 1) -> Optional[int]:
+        path = f"$.{field}"
+        rows = await run_in_thread(
+            self._execute,
+            "UPDATE records SET value = json_set(value, ?, COALESCE(json_extract(value, ?), 0) + ?)"
+            " WHERE collection = ? AND key = ? RETURNING json_extract(value, ?)",
+            (path, path, amount, collection, key, path)
+        )
+        return rows[0][0] if rows else None
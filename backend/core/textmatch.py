@@ -0,0 +1,70 @@
+"""
+Compile large term lists into a single regular expression.
+
+Terms are merged into a character trie and emitted as one nested
+alternation, so the regex engine walks the trie instead of trying every
+term at every position: matching cost grows with the length of the input,
+not the number of terms. Where terms share a prefix the longest one wins
+("key finding" over "key").
+"""
+import re
+from typing import Dict, Iterable, Pattern
+
+
+def _trie_regex(node: Dict[str, dict]) -> str:
+    terminal = "" in node
+    branches = []
+    for char in sorted(key for key in node if key):
+        # A space in a term matches any run of whitespace (PDF text wraps lines)
+        head = r"\s+" if char == " " else re.escape(char)
+        branches.append(head + _trie_regex(node[char]))
+    if not branches:
+        return ""
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if terminal else group
+
+
+def terms_regex(terms: Iterable[str], lowercase: bool = True) -> str:
+    """Regex source matching any of terms (whitespace-normalized)"""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        term = " ".join(term.split())
+        if lowercase:
+            term = term.lower()
+        if not term:
+            continue
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _trie_regex(trie)
+
+
+def compile_terms(
+    terms: Iterable[str],
+    patterns: Iterable[str] = (),
+    whole_words: bool = True,
+    flags: int = re.IGNORECASE
+) -> Pattern:
+    """
+    Compile terms and extra regex patterns into one pattern.
+
+    Args:
+        terms: Literal words or phrases
+        patterns: Regex sources tried after the terms at each position
+        whole_words: Only match terms at word boundaries
+        flags: re flags; IGNORECASE lowercases terms when building the trie
+
+    Returns:
+        Compiled pattern; a never-matching one if there is nothing to match
+    """
+    alternatives = []
+    source = terms_regex(terms, lowercase=bool(flags & re.IGNORECASE))
+    if source:
+        alternatives.append(rf"\b{source}\b" if whole_words else source)
+    alternatives.extend(f"(?:{pattern})" for pattern in patterns)
+    if not alternatives:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(alternatives), flags)
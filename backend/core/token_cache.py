@@ -0,0 +1,60 @@
+"""
+Cache of verified access tokens.
+
+Maps a token digest to the user it resolved to, so repeat requests from the
+same session skip JWT signature verification and the user lookup. Entries
+expire with the token (or TOKEN_CACHE_TTL_SECONDS, whichever is sooner) and
+are dropped when the user is updated or deleted.
+"""
+import hashlib
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .cache import LRUCache
+from .config import settings
+
+# normalized email -> digests of tokens cached for that user
+_tokens_by_user: Dict[str, Set[str]] = {}
+
+
+def _forget_digest(digest: str, entry: Tuple[Any, str]):
+    """Drop an evicted, expired or deleted token from its user's set"""
+    email_key = entry[1]
+    digests = _tokens_by_user.get(email_key)
+    if digests is not None:
+        digests.discard(digest)
+        if not digests:
+            del _tokens_by_user[email_key]
+
+
+# digest -> (principal, normalized email)
+token_cache = LRUCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS or None,
+    on_remove=_forget_digest
+)
+
+
+def token_digest(token: str) -> str:
+    """Digest used as cache key, so raw tokens are never kept in memory"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_cached_principal(digest: str) -> Optional[Any]:
+    entry = token_cache.get(digest)
+    return entry[0] if entry is not None else None
+
+
+def cache_principal(digest: str, email_key: str, principal: Any, expires_at: Optional[float]):
+    # Registered first: storing may evict, and eviction unregisters through _forget_digest
+    _tokens_by_user.setdefault(email_key, set()).add(digest)
+    token_cache.set(digest, (principal, email_key), expires_at=expires_at)
+
+
+def invalidate_user(email_key: str):
+    """Forget every cached token of a user"""
+    for digest in _tokens_by_user.pop(email_key, set()):
+        token_cache.delete(digest)
+
+
+def token_cache_stats() -> dict:
+    return token_cache.stats()
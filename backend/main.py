@@ -1,17 +1,45 @@
 import os
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 
-from routers import auth_router, tts_router, documents_router, chatbot_router, quiz_router
+from routers import auth_router, tts_router, documents_router, chatbot_router, quiz_router, jobs_router
+from core.llm import close_llm_client
+from core.executors import shutdown_executors
+from core.http_cache import CachedStaticFiles
+from core.storage import init_storage, close_storage
+from core.token_cache import token_cache_stats
+from core.config import settings
+from services.audio_cache import audio_cache, run_audio_janitor
+from services.summary_cache import summary_cache_stats
+from services.result_cache import result_cache
+from services.retrieval import index_cache
+from services.jobs import job_queue
+from services.chat_sessions import run_session_janitor
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await init_storage()
+    # Index the audio directory once, then keep it within quota in the background
+    await audio_cache.maintain()
+    janitor = asyncio.create_task(run_audio_janitor(audio_cache, settings.AUDIO_JANITOR_INTERVAL_SECONDS))
+    session_janitor = asyncio.create_task(run_session_janitor())
+    await job_queue.start()
     yield
+    await job_queue.stop()
+    for task in (janitor, session_janitor):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await close_storage()
+    await close_llm_client()
+    shutdown_executors()
 
 
 app = FastAPI(
@@ -38,11 +66,22 @@ app.include_router(tts_router)
 app.include_router(documents_router)
 app.include_router(chatbot_router)
 app.include_router(quiz_router)
+app.include_router(jobs_router)
 
-# Mount static files for serving audio files
+# Mount static files for serving audio files and documents (with ETag, 304 and range support)
 static_dir = Path("static")
 static_dir.mkdir(exist_ok=True)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Uploaded documents are named by the hash of their bytes, so they are cached as immutable;
+# serving audio counts as a use for the audio cache's LRU eviction
+app.mount(
+    "/static",
+    CachedStaticFiles(
+        directory="static",
+        content_addressed_dirs=("documents",),
+        on_serve={"audio": audio_cache.touch}
+    ),
+    name="static"
+)
 
 
 @app.get("/", response_model=dict)
@@ -55,6 +94,19 @@ async def root():
     }
 
 
+@app.get("/stats", response_model=dict)
+async def stats():
+    """Cache hit/miss counters and job queue depth for this worker"""
+    return {
+        "token_cache": token_cache_stats(),
+        "audio_cache": audio_cache.stats(),
+        "summary_cache": summary_cache_stats(),
+        "result_cache": result_cache.stats(),
+        "retrieval_index": index_cache.stats(),
+        "jobs": job_queue.stats()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
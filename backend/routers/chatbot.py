@@ -1,10 +1,71 @@
-from fastapi import APIRouter, HTTPException, status
-from schemas.chatbot import ChatRequest, ChatResponse
-from services.chatbot_service import get_chat_response
+import asyncio
+import json
+from typing import AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from schemas.chatbot import ChatRequest, ChatResponse, ChatSessionResponse
+from services.chatbot_service import get_chat_response, stream_chat_response, error_response
+from services.chat_sessions import open_session, find_session, context_history, record_turn, delete_session
+from services.retrieval import retrieve
+from core.storage import get_document
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
 
+def _seed_history(request: ChatRequest) -> List[Dict[str, str]]:
+    """Convert Pydantic models to dicts for the service (seeds new sessions only)"""
+    history = []
+    if request.conversation_history:
+        for msg in request.conversation_history:
+            history.append({
+                "role": msg.role,
+                "content": msg.content
+            })
+    return history
+
+
+async def _document_excerpts(request: ChatRequest) -> Optional[List[str]]:
+    """Passages of the requested document most relevant to the message (None without document_id)"""
+    if not request.document_id:
+        return None
+    document = await get_document(request.document_id)
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    return await retrieve(document["content_hash"], request.message)
+
+
+async def _reply_events(request: ChatRequest, excerpts: Optional[List[str]] = None) -> AsyncIterator[Dict]:
+    """
+    Events for one streamed reply: {"type": "token", "content"} per text delta,
+    then {"type": "done", "response", "session_id"} or {"type": "error", "detail", "session_id"}.
+    The turn is only stored in the session once the whole reply has been produced.
+    """
+    session = await open_session(request.session_id, _seed_history(request))
+    reply = stream_chat_response(
+        message=request.message,
+        history=context_history(session),
+        excerpts=excerpts
+    )
+    parts = []
+    try:
+        async for token in reply:
+            parts.append(token)
+            yield {"type": "token", "content": token}
+        response = "".join(parts)
+        await record_turn(session, request.message, response)
+        yield {"type": "done", "response": response, "session_id": session["id"]}
+    except Exception as e:
+        print(f"Error streaming chat response: {str(e)}")
+        yield {"type": "error", "detail": error_response(e), "session_id": session["id"]}
+    finally:
+        # Stops the upstream completion if the client went away
+        await reply.aclose()
+
+
 @router.post("/chat", response_model=ChatResponse, status_code=200)
 async def chat(request: ChatRequest):
     """
@@ -12,36 +73,141 @@ async def chat(request: ChatRequest):
     AUTHENTICATION REMOVED FOR HACKATHON DEMO.
     """
     try:
-        # Convert Pydantic models to dicts for the service
-        history = []
-        if request.conversation_history:
-            for msg in request.conversation_history:
-                history.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+        # Only the new message is sent; earlier turns come from the session
+        session = await open_session(request.session_id, _seed_history(request))
+        excerpts = await _document_excerpts(request)
         
         result = await get_chat_response(
             message=request.message,
-            conversation_history=history
+            history=context_history(session),
+            excerpts=excerpts
         )
-        
-        # Convert back to Pydantic models
-        conversation_history = []
-        for msg in result["conversation_history"]:
-            conversation_history.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
+        await record_turn(session, request.message, result["response"])
         
         return {
             "response": result["response"],
-            "conversation_history": conversation_history
+            "session_id": session["id"]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing chat request: {str(e)}"
         )
 
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest, http_request: Request):
+    """
+    Chat with the AI assistant, streaming the reply as Server-Sent Events.
+    Each text delta is a "token" event as soon as the model produces it, followed
+    by a "done" event with the full response and the session id.
+    """
+    # Looked up before streaming so an unknown document is still a 404
+    excerpts = await _document_excerpts(request)
+
+    async def body():
+        events = _reply_events(request, excerpts)
+        try:
+            async for event in events:
+                if await http_request.is_disconnected():
+                    print("Chat client disconnected, cancelling reply")
+                    break
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
+async def get_session(session_id: str):
+    """
+    Get the stored history of a chat session.
+    """
+    session = await find_session(session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chat session not found"
+        )
+    return {
+        "session_id": session["id"],
+        "summary": session["summary"],
+        "messages": session["messages"],
+        "created_at": session["created_at"],
+        "updated_at": session["updated_at"]
+    }
+
+
+@router.delete("/sessions/{session_id}", status_code=204)
+async def end_session(session_id: str):
+    """
+    Delete a chat session and its history.
+    """
+    if not await delete_session(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chat session not found"
+        )
+
+
+async def _send_reply(websocket: WebSocket, request: ChatRequest):
+    try:
+        excerpts = await _document_excerpts(request)
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        return
+    events = _reply_events(request, excerpts)
+    try:
+        async for event in events:
+            await websocket.send_json(event)
+    finally:
+        await events.aclose()
+
+
+async def _cancel(task: asyncio.Task):
+    task.cancel()
+    try:
+        await task
+    except (asyncio.CancelledError, Exception):
+        # The reply was cancelled or its socket already closed
+        pass
+
+
+@router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket):
+    """
+    Chat with the AI assistant over a WebSocket.
+    Send {"message", "session_id", "document_id"} and receive the same events as /chatbot/stream
+    as JSON messages. Sending {"type": "cancel"} or a new message stops the reply in progress.
+    """
+    await websocket.accept()
+    reply = None
+    try:
+        while True:
+            text = await websocket.receive_text()
+            if reply is not None:
+                await _cancel(reply)
+                reply = None
+            try:
+                data = json.loads(text)
+                if isinstance(data, dict) and data.get("type") == "cancel":
+                    continue
+                request = ChatRequest.model_validate(data)
+            except (ValueError, ValidationError) as e:
+                await websocket.send_json({"type": "error", "detail": f"Invalid chat message: {str(e)}"})
+                continue
+            reply = asyncio.create_task(_send_reply(websocket, request))
+    except WebSocketDisconnect:
+        print("Chat WebSocket disconnected")
+    finally:
+        if reply is not None:
+            await _cancel(reply)
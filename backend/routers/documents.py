@@ -14,7 +14,7 @@ from services.document_service import (
     get_document,
     delete_document
 )
-from services.document_processor import process_document
+from services.document_processor import process_document, with_processed_text
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -53,7 +53,7 @@ async def get_document_info(document_id: str):
     Get information about an uploaded document.
     Authentication removed for hackathon demo.
     """
-    document = get_document(document_id)
+    document = await get_document(document_id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,7 +68,7 @@ async def get_document_info(document_id: str):
         "file_size": document["file_size"],
         "text_length": document["text_length"],
         "uploaded_at": document["uploaded_at"],
-        "text_preview": document["extracted_text"][:500] + "..." if len(document["extracted_text"]) > 500 else document["extracted_text"]
+        "text_preview": document["text_preview"]
     }
 
 
@@ -93,10 +93,7 @@ async def process_document_endpoint(request: ProcessDocumentRequest):
         print(f"Result keys: {result.keys()}")
         
         # Ensure all required fields are present
-        if not result.get("processed_text"):
-            result["processed_text"] = result.get("simplified_text") or result.get("highlighted_text") or ""
-        
-        return ProcessDocumentResponse(**result)
+        return ProcessDocumentResponse(**with_processed_text(result))
     except HTTPException:
         raise
     except Exception as e:
@@ -116,7 +113,7 @@ async def delete_document_endpoint(document_id: str):
     Delete an uploaded document and its associated files.
     Authentication removed for hackathon demo.
     """
-    deleted = delete_document(document_id)
+    deleted = await delete_document(document_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,199 @@
+import asyncio
+import json
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from schemas.document import SummaryRequest, ProcessDocumentRequest
+from schemas.quiz import QuizGenerationRequest
+from schemas.job import JobSubmitResponse, JobResponse
+from schemas.user import UserResponse
+from services.jobs import job_queue, can_access, FINISHED
+from core.config import settings
+from core.dependencies import get_optional_user
+from core.storage import get_document, delete_job
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+Priority = Literal["high", "normal", "low"]
+
+
+def _owner(http_request: Request, user: Optional[UserResponse]) -> str:
+    """Who a job counts against for quota and fairness: the user, or the client address when anonymous"""
+    if user is not None:
+        return user.id
+    return f"ip:{http_request.client.host if http_request.client else 'unknown'}"
+
+
+def _job_response(job: dict) -> dict:
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "priority": job["priority"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "expires_at": job.get("expires_at"),
+        "result": job["result"],
+        "error": job["error"],
+        "error_status": job["error_status"]
+    }
+
+
+def _access_token(
+    access_token: Optional[str] = None,
+    x_job_token: Optional[str] = Header(default=None)
+) -> Optional[str]:
+    """The job's access token, from the X-Job-Token header or (for EventSource) the access_token query parameter"""
+    return x_job_token or access_token
+
+
+async def _get_job_or_404(job_id: str, access_token: Optional[str]) -> dict:
+    """The job, if it exists and access_token is its own (otherwise 404, as if it did not exist)"""
+    job = await job_queue.get(job_id)
+    if not job or not can_access(job, access_token):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+async def _submit(kind: str, params: dict, owner: str, priority: str) -> dict:
+    # Checked now so a bad document_id fails the request, not the job
+    document = await get_document(params["document_id"])
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    job, access_token = await job_queue.submit(kind, params, owner, priority)
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "access_token": access_token,
+        "status_url": f"/jobs/{job['id']}",
+        "events_url": f"/jobs/{job['id']}/events?access_token={access_token}"
+    }
+
+
+@router.post("/process", response_model=JobSubmitResponse, status_code=202)
+async def submit_process_job(
+    request: ProcessDocumentRequest,
+    http_request: Request,
+    priority: Priority = "normal",
+    user: Optional[UserResponse] = Depends(get_optional_user)
+):
+    """
+    Queue /documents/process; the job's result is the body that endpoint returns.
+    """
+    return await _submit("process", request.model_dump(), _owner(http_request, user), priority)
+
+
+@router.post("/summarize", response_model=JobSubmitResponse, status_code=202)
+async def submit_summary_job(
+    request: SummaryRequest,
+    http_request: Request,
+    priority: Priority = "normal",
+    user: Optional[UserResponse] = Depends(get_optional_user)
+):
+    """
+    Queue /documents/summarize; the job's result is the body that endpoint returns.
+    """
+    return await _submit("summarize", request.model_dump(), _owner(http_request, user), priority)
+
+
+@router.post("/quiz", response_model=JobSubmitResponse, status_code=202)
+async def submit_quiz_job(
+    request: QuizGenerationRequest,
+    http_request: Request,
+    priority: Priority = "normal",
+    user: Optional[UserResponse] = Depends(get_optional_user)
+):
+    """
+    Queue /quiz/generate; the job's result is the body that endpoint returns.
+    """
+    if not any(request.question_types.values()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Please select at least one question type"
+        )
+    return await _submit("quiz", request.model_dump(), _owner(http_request, user), priority)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(job_id: str, access_token: Optional[str] = Depends(_access_token)):
+    """
+    Get a job's status, and its result or error once it has finished.
+    """
+    return _job_response(await _get_job_or_404(job_id, access_token))
+
+
+@router.get("/{job_id}/events")
+async def job_events(
+    job_id: str,
+    http_request: Request,
+    access_token: Optional[str] = Depends(_access_token)
+):
+    """
+    Follow a job as Server-Sent Events: a "status" event with the job (as GET /jobs/{job_id})
+    now and on every change, ending after it has finished.
+    """
+    await _get_job_or_404(job_id, access_token)
+
+    async def body():
+        # Subscribed before reading the job so no change is missed
+        updates = job_queue.watch(job_id)
+        try:
+            job = await job_queue.get(job_id)
+            while job is not None:
+                yield f"event: status\ndata: {json.dumps(jsonable_encoder(_job_response(job)))}\n\n"
+                if job["status"] in FINISHED or await http_request.is_disconnected():
+                    break
+                try:
+                    job = await asyncio.wait_for(updates.get(), settings.JOB_EVENTS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    # Jobs run by another server process only show up in storage
+                    job = await job_queue.get(job_id)
+        finally:
+            job_queue.unwatch(job_id, updates)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str, access_token: Optional[str] = Depends(_access_token)):
+    """
+    Cancel a queued or running job.
+    """
+    job = await _get_job_or_404(job_id, access_token)
+    if job["status"] in FINISHED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already {job['status']}"
+        )
+    if not await job_queue.cancel(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job is running on another server process"
+        )
+    return _job_response(await _get_job_or_404(job_id, access_token))
+
+
+@router.delete("/{job_id}", status_code=204)
+async def delete_job_endpoint(job_id: str, access_token: Optional[str] = Depends(_access_token)):
+    """
+    Delete a finished job and its stored result.
+    """
+    job = await _get_job_or_404(job_id, access_token)
+    if job["status"] not in FINISHED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job has not finished; cancel it first"
+        )
+    await delete_job(job_id)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pathlib import Path
 import os
 
-from schemas.tts import TTSRequest, TTSResponse
-from services.tts_service import generate_speech, delete_audio_file
+from schemas.tts import TTSRequest, TTSResponse, TTSStreamRequest
+from services.tts_service import generate_speech, delete_audio_file, stream_speech
+from services.tts_engines import get_tts_engine
+from services.audio_cache import audio_cache
 from core.dependencies import get_current_user
+from core.http_cache import cached_file_response
 from schemas.user import UserResponse
 
 router = APIRouter(prefix="/tts", tags=["text-to-speech"])
@@ -44,10 +47,49 @@ async def create_speech(request: TTSRequest):
     }
 
 
+@router.post("/stream")
+async def stream_audio(request: TTSStreamRequest):
+    """
+    Convert text to speech, streaming MP3 audio as each sentence chunk is ready.
+    Playback can start before the whole text has been synthesized.
+    """
+    audio = stream_speech(
+        text=request.text,
+        language=request.language,
+        slow=request.slow,
+        voice_type=request.voice_type
+    )
+    # Synthesize the first chunk before responding, so errors still map to a status code
+    try:
+        first = await audio.__anext__()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid language code or text: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate speech: {str(e)}"
+        )
+
+    async def body():
+        try:
+            yield first
+            async for part in audio:
+                yield part
+        finally:
+            # Cancels pending chunks if the client disconnects
+            await audio.aclose()
+
+    return StreamingResponse(body(), media_type=get_tts_engine().media_type)
+
+
 @router.get("/audio/{filename}")
-async def get_audio_file(filename: str):
+async def get_audio_file(filename: str, request: Request):
     """
     Serve audio files.
+    Supports Range requests for seeking and If-None-Match revalidation.
     """
     filepath = AUDIO_DIR / filename
     
@@ -58,9 +100,12 @@ async def get_audio_file(filename: str):
             detail=f"Audio file not found: {filename}. Path checked: {filepath}"
         )
 
-    return FileResponse(
-        path=filepath,
-        media_type="audio/mpeg",
+    # Playing a file counts as a use, so often-played audio isn't evicted as idle
+    audio_cache.touch(filename)
+    return await cached_file_response(
+        request.headers,
+        str(filepath),
+        media_type="audio/wav" if filepath.suffix == ".wav" else "audio/mpeg",
         filename=filename
     )
 
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from datetime import datetime
 
 class ChatMessage(BaseModel):
     role: str  # "user" or "assistant"
@@ -7,9 +8,17 @@ class ChatMessage(BaseModel):
 
 class ChatRequest(BaseModel):
     message: str
-    conversation_history: Optional[List[ChatMessage]] = []
+    session_id: Optional[str] = None  # Omit to start a new session
+    conversation_history: Optional[List[ChatMessage]] = None  # Only seeds a new session (clients without session_id)
+    document_id: Optional[str] = None  # Answer from this uploaded document
 
 class ChatResponse(BaseModel):
     response: str
-    conversation_history: List[ChatMessage]
+    session_id: str
 
+class ChatSessionResponse(BaseModel):
+    session_id: str
+    summary: str  # Rolling summary of turns no longer kept verbatim
+    messages: List[ChatMessage]
+    created_at: datetime
+    updated_at: datetime
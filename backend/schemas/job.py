@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class JobSubmitResponse(BaseModel):
+    """Response model for a submitted job"""
+    job_id: str = Field(..., description="ID to poll or subscribe to")
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    access_token: str = Field(..., description="Needed to read, follow, cancel or delete the job (X-Job-Token header or access_token query parameter)")
+    status_url: str = Field(..., description="GET for the job's status and result")
+    events_url: str = Field(..., description="Server-Sent Events stream of status changes, with the access token in the URL")
+
+class JobResponse(BaseModel):
+    """Response model for job status"""
+    job_id: str
+    kind: str = Field(..., description="process, summarize or quiz")
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    priority: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = Field(default=None, description="When a finished job and its result are deleted")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="Same body the synchronous endpoint returns")
+    error: Optional[str] = None
+    error_status: Optional[int] = Field(default=None, description="HTTP status the synchronous endpoint would have failed with")
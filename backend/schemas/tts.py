@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, Literal
+from core.config import settings
 
 class TTSRequest(BaseModel):
     """Request model for text-to-speech conversion"""
@@ -8,6 +9,10 @@ class TTSRequest(BaseModel):
     slow: bool = Field(default=False, description="Whether to speak slowly")
     voice_type: Optional[Literal["male", "female"]] = Field(default=None, description="Voice type preference (not all TTS engines support this)")
 
+class TTSStreamRequest(TTSRequest):
+    """Request model for streamed text-to-speech; accepts whole documents"""
+    text: str = Field(..., min_length=1, max_length=settings.MAX_TEXT_LENGTH, description="Text to convert to speech")
+
 class TTSResponse(BaseModel):
     """Response model for text-to-speech conversion"""
     audio_url: str = Field(..., description="URL to access the generated audio file")
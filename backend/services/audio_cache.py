@@ -0,0 +1,195 @@
+"""
+Content-addressed cache of generated audio files.
+
+Files are named after a hash of everything that affects the synthesized
+audio, so identical requests map to the same file. An in-memory index in
+LRU order tracks file sizes and last access times; eviction drops files
+that have not been used for AUDIO_CACHE_MAX_AGE_HOURS and then the least
+recently used ones until the directory fits in AUDIO_CACHE_MAX_MB.
+
+Eviction and directory scans never run on the request path: the janitor
+task started from the app lifespan builds the index at startup and then
+enforces the quota every AUDIO_JANITOR_INTERVAL_SECONDS.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.executors import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+# Temp files from interrupted syntheses older than this are swept
+STALE_PART_SECONDS = 3600
+
+
+def audio_cache_key(*parts) -> str:
+    """Hash the synthesis parameters into a cache key"""
+    return hashlib.sha256("\0".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class AudioCache:
+    def __init__(self, directory: Path, max_bytes: int, max_age: float, extensions: Tuple[str, ...] = (".mp3", ".wav")):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.extensions = extensions
+        # filename -> (size in bytes, last access timestamp), least recently used first
+        self.index: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def scan(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Stat the files on disk (blocking, run it on a worker thread).
+
+        Also removes temp files left behind by interrupted syntheses.
+
+        Returns:
+            filename -> (size in bytes, last access timestamp)
+        """
+        found = {}
+        cutoff = time.time() - STALE_PART_SECONDS
+        for file_path in self.directory.iterdir():
+            try:
+                if file_path.suffix in self.extensions:
+                    stat = file_path.stat()
+                    found[file_path.name] = (stat.st_size, max(stat.st_atime, stat.st_mtime))
+                elif file_path.suffix == ".part" and file_path.stat().st_mtime < cutoff:
+                    file_path.unlink()
+            except FileNotFoundError:
+                continue
+        return found
+
+    def reconcile(self, found: Dict[str, Tuple[int, float]], started: float):
+        """
+        Bring the index in line with a scan: forget deleted files, adopt unknown ones.
+
+        Entries touched after the scan started are kept even if the scan missed them.
+        """
+        for filename, (_, last_access) in list(self.index.items()):
+            if filename not in found and last_access < started:
+                self._drop(filename)
+        adopted = False
+        for filename, (size, last_access) in found.items():
+            if filename not in self.index:
+                self.index[filename] = (size, last_access)
+                self.total_bytes += size
+                adopted = True
+        if adopted:
+            # Slot adopted files into LRU order by their last access time
+            self.index = OrderedDict(sorted(self.index.items(), key=lambda item: item[1][1]))
+
+    def lookup(self, filename: str) -> Optional[Path]:
+        """Return the path of a cached file and mark it recently used, or None on a miss"""
+        filepath = self.directory / filename
+        if filename in self.index and not filepath.exists():
+            self._drop(filename)
+        if not self.touch(filename):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return filepath
+
+    def touch(self, filename: str) -> bool:
+        """Mark a file recently used (it was generated again or played), returning whether it is indexed"""
+        entry = self.index.get(filename)
+        if entry is None:
+            return False
+        self.index[filename] = (entry[0], time.time())
+        self.index.move_to_end(filename)
+        return True
+
+    def add(self, filename: str):
+        """Record a newly written file"""
+        size = (self.directory / filename).stat().st_size
+        if filename in self.index:
+            self.total_bytes -= self.index[filename][0]
+        self.index[filename] = (size, time.time())
+        self.index.move_to_end(filename)
+        self.total_bytes += size
+
+    def _drop(self, filename: str):
+        size, _ = self.index.pop(filename)
+        self.total_bytes -= size
+
+    def remove(self, filename: str) -> bool:
+        """Delete a file and forget it"""
+        if filename in self.index:
+            self._drop(filename)
+        filepath = self.directory / filename
+        if filepath.exists():
+            filepath.unlink()
+            return True
+        return False
+
+    def evict(self) -> List[str]:
+        """
+        Drop stale entries, then least recently used ones over the size budget.
+
+        Returns:
+            Filenames removed from the index; the caller unlinks them
+        """
+        cutoff = time.time() - self.max_age
+        evicted = []
+        while self.index:
+            filename, (size, last_access) = next(iter(self.index.items()))
+            if last_access >= cutoff and self.total_bytes <= self.max_bytes:
+                break
+            self._drop(filename)
+            evicted.append(filename)
+        self.evictions += len(evicted)
+        return evicted
+
+    def unlink(self, filenames: List[str]):
+        """Delete evicted files (blocking, run it on a worker thread)"""
+        for filename in filenames:
+            (self.directory / filename).unlink(missing_ok=True)
+
+    async def maintain(self):
+        """One janitor pass: rescan the directory, then enforce the TTL and quota"""
+        started = time.time()
+        found = await run_in_thread(self.scan)
+        self.reconcile(found, started)
+        evicted = self.evict()
+        if evicted:
+            await run_in_thread(self.unlink, evicted)
+        return evicted
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self.index),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+audio_cache = AudioCache(
+    directory=Path(__file__).parent.parent / "static" / "audio",
+    max_bytes=settings.AUDIO_CACHE_MAX_MB * 1024 * 1024,
+    max_age=settings.AUDIO_CACHE_MAX_AGE_HOURS * 3600
+)
+
+
+async def run_audio_janitor(cache: AudioCache, interval: float):
+    """Keep the audio cache within its quota until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            evicted = await cache.maintain()
+            if evicted:
+                logger.info("Audio janitor evicted %d files", len(evicted))
+        except Exception:
+            logger.exception("Audio janitor pass failed")
@@ -2,15 +2,15 @@ from typing import Optional
 from fastapi import HTTPException, status
 from datetime import timedelta, datetime
 
-from core.storage import get_user_by_email as get_user_from_storage, create_user as create_user_in_storage, user_exists
-from core.security import verify_password, get_password_hash, create_access_token
+from core.storage import get_user_by_email as get_user_from_storage, create_user as create_user_in_storage, user_exists, update_user, DuplicateKeyError
+from core.security import hash_password_async, verify_and_update_password, create_access_token
 from core.config import settings
 from models.user import User
 from schemas.user import UserCreate, UserLogin
 
 async def get_user_by_email(email: str) -> Optional[User]:
-    """Get user by email from in-memory storage"""
-    user_dict = get_user_from_storage(email)
+    """Get user by email from storage"""
+    user_dict = await get_user_from_storage(email)
     if user_dict:
         # Convert to User model format
         return User(
@@ -22,19 +22,25 @@ async def get_user_by_email(email: str) -> Optional[User]:
     return None
 
 async def create_user(user_data: UserCreate) -> User:
-    """Create a new user in in-memory storage"""
+    """Create a new user in storage"""
     # Check if user already exists
-    if user_exists(user_data.email):
+    if await user_exists(user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Hash the password
-    hashed_password = get_password_hash(user_data.password)
+    # Hash the password (off the event loop)
+    hashed_password = await hash_password_async(user_data.password)
     
-    # Create user in storage
-    user_dict = create_user_in_storage(user_data.email, hashed_password)
+    # Create user in storage (the unique email index catches concurrent registrations)
+    try:
+        user_dict = await create_user_in_storage(user_data.email, hashed_password)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     # Convert to User model
     return User(
@@ -50,9 +56,15 @@ async def authenticate_user(email: str, password: str) -> Optional[User]:
     if not user:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
     
+    # Stored hash used an older cost factor; upgrade it while we have the plain password
+    if new_hash:
+        await update_user(user.id, {"hashed_password": new_hash})
+        user.hashed_password = new_hash
+    
     return user
 
 async def login_user(login_data: UserLogin) -> dict:
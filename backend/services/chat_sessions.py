@@ -0,0 +1,212 @@
+"""
+Server-side chat sessions.
+
+A session stores the conversation so clients send only the new message. The
+history sent to the model is bounded by CHAT_HISTORY_MAX_TOKENS: the newest
+messages that fit are sent verbatim, preceded by a rolling summary of older
+turns. Once the stored messages exceed the budget, all but the last
+CHAT_KEEP_RECENT_MESSAGES are folded into that summary in the background, so
+stored sessions stay bounded as well. Sessions idle for longer than
+CHAT_SESSION_TTL_SECONDS expire and are deleted by a background janitor.
+"""
+import asyncio
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from core import storage
+from core.config import settings
+from core.executors import run_in_thread
+from core.llm import chat_completion
+from services.summarizer import summarize
+
+# Rough cost of a message's role and framing on top of its content
+MESSAGE_OVERHEAD_TOKENS = 4
+# Read-modify-write of a session is serialized by one of these, picked by session id
+SESSION_LOCKS = [asyncio.Lock() for _ in range(64)]
+# How often idle sessions are deleted from storage
+JANITOR_INTERVAL_SECONDS = 600
+
+SUMMARY_PROMPT = """You maintain a running summary of a support conversation between a user with dyslexia or ADHD and an assistant.
+Update the summary with the new turns. Keep facts about the user, their goals and what was already suggested.
+Reply with the summary only, in at most {words} words."""
+
+
+class Compactions:
+    running: Set[str] = set()
+    tasks: Set[asyncio.Task] = set()
+
+compactions = Compactions()
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about four characters per token for English)"""
+    return len(text) // 4 + 1
+
+
+def message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(msg["content"]) + MESSAGE_OVERHEAD_TOKENS for msg in messages)
+
+
+def _idle_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.CHAT_SESSION_TTL_SECONDS)
+
+
+def _lock(session_id: str) -> asyncio.Lock:
+    return SESSION_LOCKS[zlib.crc32(session_id.encode("utf-8")) % len(SESSION_LOCKS)]
+
+
+def new_session(conversation_history: Optional[List[Dict[str, str]]] = None) -> dict:
+    """A session that is not stored yet, optionally seeded with client-side history"""
+    now = datetime.utcnow()
+    return {
+        "id": storage.generate_id(),
+        "summary": "",
+        "messages": [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in conversation_history or []
+            if msg["role"] in ("user", "assistant")
+        ],
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+async def find_session(session_id: str) -> Optional[dict]:
+    """A stored session, or None if it is unknown or expired (idle past CHAT_SESSION_TTL_SECONDS)"""
+    session = await storage.get_chat_session(session_id)
+    if session is None or session["updated_at"] < _idle_cutoff():
+        return None
+    return session
+
+
+async def open_session(session_id: Optional[str], conversation_history: Optional[List[Dict[str, str]]] = None) -> dict:
+    """
+    Load a session, or start a new one if session_id is missing or unknown.
+
+    conversation_history only seeds new sessions (clients without session support).
+    """
+    if session_id:
+        session = await find_session(session_id)
+        if session is not None:
+            return session
+    return new_session(conversation_history)
+
+
+def context_history(session: dict) -> List[Dict[str, str]]:
+    """History for the prompt: rolling summary plus the newest messages within the token budget"""
+    history = []
+    used = 0
+    if session["summary"]:
+        summary = f"Summary of the earlier conversation:\n{session['summary']}"
+        history.append({"role": "system", "content": summary})
+        used += estimate_tokens(summary) + MESSAGE_OVERHEAD_TOKENS
+
+    recent = []
+    for msg in reversed(session["messages"]):
+        cost = estimate_tokens(msg["content"]) + MESSAGE_OVERHEAD_TOKENS
+        if used + cost > settings.CHAT_HISTORY_MAX_TOKENS:
+            break
+        recent.append(msg)
+        used += cost
+    return history + recent[::-1]
+
+
+async def record_turn(session: dict, message: str, response: str) -> dict:
+    """Append a user message and the reply to the session and store it"""
+    async with _lock(session["id"]):
+        stored = await storage.get_chat_session(session["id"]) or session
+        stored["messages"].append({"role": "user", "content": message})
+        stored["messages"].append({"role": "assistant", "content": response})
+        stored["updated_at"] = datetime.utcnow()
+        await storage.save_chat_session(stored["id"], stored)
+
+    if message_tokens(stored["messages"]) > settings.CHAT_HISTORY_MAX_TOKENS:
+        # Summarize old turns after the reply has been sent; the next turn is trimmed anyway
+        _schedule_compaction(stored["id"])
+    return stored
+
+
+async def delete_session(session_id: str) -> bool:
+    async with _lock(session_id):
+        return await storage.delete_chat_session(session_id)
+
+
+async def run_session_janitor(interval: float = JANITOR_INTERVAL_SECONDS):
+    """Delete idle chat sessions until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await storage.delete_idle_chat_sessions(_idle_cutoff())
+            if deleted:
+                print(f"Deleted {deleted} idle chat sessions")
+        except Exception as e:
+            print(f"Error deleting idle chat sessions: {str(e)}")
+
+
+def _schedule_compaction(session_id: str):
+    if session_id in compactions.running:
+        return
+    compactions.running.add(session_id)
+    task = asyncio.create_task(compact_session(session_id))
+    compactions.tasks.add(task)
+    task.add_done_callback(compactions.tasks.discard)
+
+
+def _flatten(text: str) -> str:
+    """Text on one line, with bullet markers removed"""
+    return " ".join(text.replace("•", " ").split())
+
+
+def _transcript(messages: List[Dict[str, str]]) -> str:
+    return "\n".join(f"{msg['role'].capitalize()}: {_flatten(msg['content'])}" for msg in messages)
+
+
+async def summarize_turns(summary: str, messages: List[Dict[str, str]]) -> str:
+    """Fold messages into the rolling summary, with OpenAI or the extractive summarizer"""
+    words = settings.CHAT_SUMMARY_MAX_TOKENS * 3 // 4
+    if settings.OPENAI_API_KEY:
+        try:
+            return await chat_completion(
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT.format(words=words)},
+                    {"role": "user", "content": f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{_transcript(messages)}"}
+                ],
+                temperature=0.3,
+                max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS
+            )
+        except Exception as e:
+            print(f"Error summarizing chat history with OpenAI: {str(e)}")
+            # Fall back to extractive
+
+    text = f"{_flatten(summary)}\n\n{_transcript(messages)}" if summary else _transcript(messages)
+    return await run_in_thread(summarize, text, words)
+
+
+async def compact_session(session_id: str):
+    """Fold all but the most recent messages of a session into its rolling summary"""
+    try:
+        session = await storage.get_chat_session(session_id)
+        if session is None:
+            return
+        keep = settings.CHAT_KEEP_RECENT_MESSAGES
+        old = session["messages"][:-keep] if keep > 0 else session["messages"]
+        if not old:
+            return
+
+        # Summarize without holding the lock; new turns are only ever appended
+        summary = await summarize_turns(session["summary"], old)
+
+        async with _lock(session_id):
+            current = await storage.get_chat_session(session_id)
+            if current is None or current["messages"][:len(old)] != old:
+                return
+            current["summary"] = summary
+            current["messages"] = current["messages"][len(old):]
+            await storage.save_chat_session(session_id, current)
+        print(f"Folded {len(old)} messages of chat session {session_id} into its summary")
+
+    except Exception as e:
+        print(f"Error compacting chat session {session_id}: {str(e)}")
+    finally:
+        compactions.running.discard(session_id)
@@ -0,0 +1,77 @@
+"""
+Split long text into chunks at structural boundaries.
+
+Text is cut into blocks at blank lines and before heading-like lines
+(numbered sections, short title or upper-case lines), and the blocks are
+packed in order into chunks of at most max_chars. A block that is too long
+on its own is split at sentence ends, and only as a last resort mid-text.
+"""
+import re
+from typing import Iterator, List
+
+HEADING = re.compile(
+    r"^(?:\d+(?:\.\d+)*\.?\s+\S.{0,80}|[A-Z][A-Z0-9 ,:&'-]{3,80}|#{1,6}\s+.+|(?:Chapter|Section|Part)\s+\w+.*)$"
+)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def iter_blocks(text: str) -> Iterator[str]:
+    """Yield paragraphs, starting a new one at blank lines and before headings"""
+    current: List[str] = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or (HEADING.match(stripped) and len(stripped) < 100):
+            if current:
+                yield "\n".join(current)
+                current = []
+            if not stripped:
+                continue
+        current.append(line)
+    if current:
+        yield "\n".join(current)
+
+
+def _split_block(block: str, max_chars: int) -> Iterator[str]:
+    current = ""
+    for sentence in SENTENCE_END.split(block):
+        while len(sentence) > max_chars:
+            if current:
+                yield current
+                current = ""
+            yield sentence[:max_chars]
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            yield current
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        yield current
+
+
+def split_structured(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most max_chars, preferring structural boundaries
+
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        Chunks in document order; [text] if it already fits
+    """
+    if len(text) <= max_chars:
+        return [text] if text.strip() else []
+    chunks = []
+    current = ""
+    for block in iter_blocks(text):
+        pieces = _split_block(block, max_chars) if len(block) > max_chars else [block]
+        for piece in pieces:
+            if current and len(current) + 2 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
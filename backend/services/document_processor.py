@@ -1,183 +1,142 @@
 import os
 import re
+import asyncio
 import requests
 from typing import Dict, Optional
-from openai import OpenAI
-from services.document_service import get_document
+from services.document_service import generate_summary, get_document, get_document_text
 from services.tts_service import generate_speech
-from core.storage import documents_db
 from core.config import settings
+from core.llm import chat_completion
+from core.executors import run_in_thread
+from core.pipeline import Stage, run_pipeline
+from services.highlighter import get_highlighter
+from services.simplifier import get_simplifier
+from services.chunking import split_structured
+from services.result_cache import cached_result
 
 # Hugging Face API endpoint (free, no API key needed for public models)
 HUGGINGFACE_API = "https://api-inference.huggingface.co/models"
 
-async def simplify_text(text: str) -> str:
-    """Simplify complex text for better readability using OpenAI"""
+async def _simplify_chunk_llm(text: str) -> str:
+    return await chat_completion(
+        messages=[
+            {"role": "system", "content": "You are a text simplification expert. Simplify the given text to make it easier to read for people with dyslexia and ADHD. Use simpler words, shorter sentences, and clearer structure. Maintain the original meaning."},
+            {"role": "user", "content": f"Simplify this text:\n\n{text}"}
+        ],
+        temperature=0.3,
+        max_tokens=2000
+    )
+
+async def _simplify_with_llm(text: str) -> str:
+    """Simplify section-sized chunks of the whole document concurrently, keeping their order"""
+    chunks = split_structured(text, settings.SIMPLIFY_CHUNK_CHARS)
+    semaphore = asyncio.Semaphore(settings.SIMPLIFY_MAX_PARALLEL_CHUNKS)
+    
+    async def simplify_chunk(chunk: str) -> str:
+        async with semaphore:
+            return await _simplify_chunk_llm(chunk)
+    
+    simplified = await asyncio.gather(*(simplify_chunk(chunk) for chunk in chunks))
+    return "\n\n".join(simplified)
+
+async def simplify_text(text: str, content_hash: Optional[str] = None) -> str:
+    """Simplify complex text for better readability using OpenAI (cached per content_hash when given)"""
     try:
         # Use OpenAI if API key is available
         if settings.OPENAI_API_KEY:
             try:
-                client = OpenAI(api_key=settings.OPENAI_API_KEY)
-                
-                # Truncate if too long (keep first 6000 chars)
-                text_to_simplify = text[:6000] if len(text) > 6000 else text
-                
-                response = client.chat.completions.create(
-                    model=settings.OPENAI_MODEL,
-                    messages=[
-                        {"role": "system", "content": "You are a text simplification expert. Simplify the given text to make it easier to read for people with dyslexia and ADHD. Use simpler words, shorter sentences, and clearer structure. Maintain the original meaning."},
-                        {"role": "user", "content": f"Simplify this text:\n\n{text_to_simplify}"}
-                    ],
-                    temperature=0.3,
-                    max_tokens=2000
+                return await cached_result(
+                    content_hash, "simplify",
+                    {"model": settings.OPENAI_MODEL, "chunk_chars": settings.SIMPLIFY_CHUNK_CHARS},
+                    lambda: _simplify_with_llm(text)
                 )
-                
-                simplified = response.choices[0].message.content.strip()
-                return simplified
             except Exception as e:
                 print(f"Error simplifying with OpenAI: {str(e)}")
                 # Fall back to rule-based
                 pass
         
-        # Fallback to rule-based simplification
-        
-        # Complex word replacements
-        replacements = {
-            "utilize": "use",
-            "approximately": "about",
-            "facilitate": "help",
-            "demonstrate": "show",
-            "indicate": "show",
-            "obtain": "get",
-            "acquire": "get",
-            "comprehend": "understand",
-            "perceive": "see",
-            "commence": "start",
-            "terminate": "end",
-            "sufficient": "enough",
-            "numerous": "many",
-            "substantial": "large",
-            "minimal": "small",
-            "significant": "important",
-            "essential": "important",
-            "fundamental": "basic",
-            "complex": "hard",
-            "simplify": "make simple",
-            "clarify": "explain",
-            "elaborate": "explain more",
-        }
-        
-        simplified = text
-        for complex_word, simple_word in replacements.items():
-            simplified = re.sub(rf'\b{complex_word}\b', simple_word, simplified, flags=re.IGNORECASE)
-        
-        # Break long sentences into shorter ones
-        sentences = re.split(r'([.!?]+)', simplified)
-        result_sentences = []
-        for i in range(0, len(sentences) - 1, 2):
-            sentence = sentences[i].strip()
-            punctuation = sentences[i + 1] if i + 1 < len(sentences) else ""
-            
-            # If sentence is too long, try to break it at commas
-            if len(sentence) > 100:
-                parts = sentence.split(',')
-                if len(parts) > 1:
-                    # Break into smaller sentences
-                    for j, part in enumerate(parts):
-                        part = part.strip()
-                        if part:
-                            if j == 0:
-                                result_sentences.append(part + punctuation)
-                            else:
-                                result_sentences.append(part.capitalize() + punctuation)
-                else:
-                    result_sentences.append(sentence + punctuation)
-            else:
-                result_sentences.append(sentence + punctuation)
-        
-        simplified = ' '.join(result_sentences)
-        
-        # Break long paragraphs
-        paragraphs = simplified.split('\n\n')
-        result_paragraphs = []
-        for para in paragraphs:
-            if len(para) > 500:
-                # Split into smaller paragraphs
-                sentences_in_para = re.split(r'([.!?]+)', para)
-                current_para = ""
-                for i in range(0, len(sentences_in_para) - 1, 2):
-                    sentence = sentences_in_para[i].strip()
-                    punctuation = sentences_in_para[i + 1] if i + 1 < len(sentences_in_para) else ""
-                    if len(current_para + sentence) > 300:
-                        if current_para:
-                            result_paragraphs.append(current_para.strip())
-                        current_para = sentence + punctuation + " "
-                    else:
-                        current_para += sentence + punctuation + " "
-                if current_para:
-                    result_paragraphs.append(current_para.strip())
-            else:
-                result_paragraphs.append(para)
-        
-        return '\n\n'.join(result_paragraphs)
+        # Fallback to rule-based simplification (CPU-bound, keep it off the event loop)
+        return await cached_result(
+            content_hash, "simplify", {"model": "rules", "lexicon": get_simplifier().version},
+            lambda: run_in_thread(simplify_text_rule_based, text)
+        )
         
     except Exception as e:
         print(f"Error in simplify_text: {str(e)}")
-        # Fallback: basic simplification
-        simplified = text.replace("utilize", "use").replace("approximately", "about").replace("facilitate", "help")
-        simplified = simplified.replace("demonstrate", "show").replace("indicate", "show").replace("obtain", "get")
-        return simplified
+        return basic_simplify(text)
 
-async def highlight_keywords(text: str) -> str:
-    """Highlight important keywords in text"""
+def basic_simplify(text: str) -> str:
+    """Last-resort simplification with a handful of plain replacements"""
+    simplified = text.replace("utilize", "use").replace("approximately", "about").replace("facilitate", "help")
+    simplified = simplified.replace("demonstrate", "show").replace("indicate", "show").replace("obtain", "get")
+    return simplified
+
+def simplify_text_rule_based(text: str) -> str:
+    """Simplify text with word replacements and sentence/paragraph splitting"""
     try:
-        # Use rule-based keyword highlighting (no API needed)
-        # Important words and phrases to highlight
-        important_words = [
-            "important", "key", "main", "primary", "essential", "critical", 
-            "significant", "note", "remember", "focus", "attention", "warning",
-            "caution", "summary", "conclusion", "result", "finding", "discovery",
-            "example", "instance", "specifically", "particularly", "especially",
-            "must", "should", "need", "require", "necessary", "vital", "crucial"
-        ]
-        
-        # Also highlight numbers and dates (often important)
-        highlighted = text
-        
-        # Highlight important words
-        for word in important_words:
-            highlighted = re.sub(rf'\b{re.escape(word)}\b', f'<mark>{word}</mark>', highlighted, flags=re.IGNORECASE)
-        
-        # Highlight numbers (years, percentages, quantities)
-        highlighted = re.sub(r'\b\d{4}\b', r'<mark>\g<0></mark>', highlighted)  # Years
-        highlighted = re.sub(r'\b\d+%', r'<mark>\g<0></mark>', highlighted)  # Percentages
-        highlighted = re.sub(r'\$\d+', r'<mark>\g<0></mark>', highlighted)  # Money
-        
-        # Highlight common important phrases
-        important_phrases = [
-            r"in conclusion",
-            r"to summarize",
-            r"it is important",
-            r"keep in mind",
-            r"take note",
-            r"remember that",
-            r"the main point",
-            r"key finding",
-        ]
+        # One tokenized pass: lexicon substitutions, sentence and paragraph chunking
+        return get_simplifier().simplify(text)
         
-        for phrase in important_phrases:
-            highlighted = re.sub(phrase, f'<mark>\\g<0></mark>', highlighted, flags=re.IGNORECASE)
-        
-        return highlighted
+    except Exception as e:
+        print(f"Error in simplify_text_rule_based: {str(e)}")
+        return basic_simplify(text)
+
+def highlight_keywords(text: str) -> str:
+    """Highlight important keywords in text (CPU-bound, run it on a worker thread)"""
+    try:
+        # Rule-based, single pass over the text with the compiled term list
+        return get_highlighter().highlight(text)
         
     except Exception as e:
         print(f"Error in highlight_keywords: {str(e)}")
-        # Fallback: highlight common important words
-        important_words = ["important", "key", "main", "primary", "essential", "critical", "significant", "note", "remember", "focus"]
-        highlighted = text
-        for word in important_words:
-            highlighted = re.sub(rf'\b{word}\b', f'<mark>{word}</mark>', highlighted, flags=re.IGNORECASE)
-        return highlighted
+        return basic_highlight(text)
+
+def basic_highlight(text: str) -> str:
+    """Last-resort highlighting of a few common important words"""
+    important_words = ["important", "key", "main", "primary", "essential", "critical", "significant", "note", "remember", "focus"]
+    highlighted = text
+    for word in important_words:
+        highlighted = re.sub(rf'\b{word}\b', f'<mark>{word}</mark>', highlighted, flags=re.IGNORECASE)
+    return highlighted
+
+async def _highlight_stage(text: str, content_hash: str) -> str:
+    return await cached_result(
+        content_hash, "highlight", {"terms": get_highlighter().version},
+        lambda: run_in_thread(highlight_keywords, text)
+    )
+
+def _highlight_fallback(text: str, content_hash: str) -> str:
+    return basic_highlight(text)
+
+async def _simplify_stage(text: str, content_hash: str) -> str:
+    return await simplify_text(text, content_hash)
+
+def _simplify_fallback(text: str, content_hash: str) -> str:
+    return basic_simplify(text)
+
+def basic_summary(text: str) -> str:
+    """Last-resort summary built from the first few sentences"""
+    sentences = [s.strip() for s in text.split('.') if s.strip()][:5]
+    if sentences:
+        return '• ' + '\n• '.join(sentences) + '.'
+    return "• " + text[:200] + "..."
+
+async def _summary_stage(document_id: str, text: str) -> str:
+    summary_result = await generate_summary(document_id, max_length=200)
+    return summary_result["summary"]
+
+def _summary_fallback(document_id: str, text: str) -> str:
+    return basic_summary(text)
+
+async def _audio_stage(text: str) -> str:
+    # Whole document: sentence chunks are synthesized in parallel
+    tts_result = await generate_speech(
+        text=text,
+        language="en",
+        slow=False,
+        voice_type=None
+    )
+    return tts_result["audio_url"]
 
 def apply_accessibility_settings(text: str, settings: Dict[str, str]) -> str:
     """Apply accessibility settings to text"""
@@ -199,15 +158,17 @@ async def process_document(
         print(f"Processing document {document_id} with options: {options}")
         
         # Get document
-        document = get_document(document_id)
+        document = await get_document(document_id)
         if not document:
             raise Exception(f"Document not found: {document_id}")
         
-        text = document["extracted_text"]
+        text = await get_document_text(document)
         if not text:
             raise Exception("Document has no extracted text")
         
         print(f"Document text length: {len(text)} characters")
+        # Derived results are cached per document content
+        content_hash = document.get("content_hash")
         
         # Convert accessibility_settings to string values for response schema
         accessibility_applied = {}
@@ -226,72 +187,19 @@ async def process_document(
             "accessibility_applied": accessibility_applied
         }
         
-        # Generate summary if requested
+        # Every requested option is an independent stage; run them concurrently
+        stages = []
         if options.get("summary", False):
-            print("Generating summary...")
-            try:
-                from services.document_service import generate_summary
-                summary_result = await generate_summary(document_id, max_length=200)
-                results["summary"] = summary_result["summary"]
-                print("Summary generated successfully")
-            except Exception as e:
-                print(f"Error generating summary: {str(e)}")
-                import traceback
-                print(traceback.format_exc())
-                # Fallback: create a simple summary
-                sentences = [s.strip() for s in text.split('.') if s.strip()][:5]
-                if sentences:
-                    results["summary"] = '• ' + '\n• '.join(sentences) + '.'
-                else:
-                    results["summary"] = "• " + text[:200] + "..."
-        
-        # Highlight keywords if requested
+            stages.append(Stage("summary", _summary_stage, document_id, text, fallback=_summary_fallback))
         if options.get("highlight", False):
-            print("Highlighting keywords...")
-            try:
-                results["highlighted_text"] = await highlight_keywords(text)
-                print("Keywords highlighted successfully")
-            except Exception as e:
-                print(f"Error highlighting keywords: {str(e)}")
-                # Fallback highlighting
-                important_words = ["important", "key", "main", "primary", "essential"]
-                highlighted = text
-                for word in important_words:
-                    highlighted = re.sub(rf'\b{word}\b', f'<mark>{word}</mark>', highlighted, flags=re.IGNORECASE)
-                results["highlighted_text"] = highlighted
-        
-        # Generate audio if requested
+            stages.append(Stage("highlighted_text", _highlight_stage, text, content_hash, fallback=_highlight_fallback))
         if options.get("textToAudio", False):
-            print("Generating audio...")
-            try:
-                # Use first 5000 characters for audio (to avoid long processing)
-                audio_text = text[:5000] if len(text) > 5000 else text
-                if len(text) > 5000:
-                    audio_text += "... [Text truncated for audio]"
-                
-                tts_result = await generate_speech(
-                    text=audio_text,
-                    language="en",
-                    slow=False,
-                    voice_type=None
-                )
-                results["audio_url"] = tts_result["audio_url"]
-                print("Audio generated successfully")
-            except Exception as e:
-                results["audio_url"] = None
-                print(f"Error generating audio: {str(e)}")
-        
-        # Simplify text if requested
+            stages.append(Stage("audio_url", _audio_stage, text))
         if options.get("simplify", False):
-            print("Simplifying text...")
-            try:
-                results["simplified_text"] = await simplify_text(text)
-                print("Text simplified successfully")
-            except Exception as e:
-                print(f"Error simplifying text: {str(e)}")
-                # Fallback: basic simplification
-                simplified = text.replace("utilize", "use").replace("approximately", "about")
-                results["simplified_text"] = simplified
+            stages.append(Stage("simplified_text", _simplify_stage, text, content_hash, fallback=_simplify_fallback))
+        
+        print(f"Running stages: {[stage.name for stage in stages]}")
+        results.update(await run_pipeline(stages))
         
         # Apply accessibility settings
         print("Applying accessibility settings...")
@@ -316,3 +224,8 @@ async def process_document(
         print(traceback.format_exc())
         raise Exception(f"Failed to process document: {str(e)}")
 
+def with_processed_text(result: Dict) -> Dict:
+    """Fill an empty processed_text from the simplified or highlighted text"""
+    if not result.get("processed_text"):
+        result["processed_text"] = result.get("simplified_text") or result.get("highlighted_text") or ""
+    return result
@@ -1,48 +1,74 @@
 import os
 import uuid
-import re
+import zlib
+import asyncio
+import math
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 from fastapi import HTTPException, status, UploadFile
 from datetime import datetime
-import PyPDF2
-import io
-from openai import OpenAI
-from core.storage import documents_db, summaries_db, generate_id
+from core import storage
+from core.storage import generate_id
 from core.config import settings
+from core.llm import chat_completion
+from core.executors import run_in_process, run_in_thread
+from services.pdf_extraction import count_pages, extract_page_range, open_mapped
+from services.summarizer import summarize
+from services.chunking import split_structured
+from services.summary_cache import cache_summary, forget_summaries, get_cached_summary, summary_model
+from services.retrieval import forget_document_index, index_document
+from services.result_cache import result_cache
 
 # Directory for storing uploaded documents
 UPLOAD_DIR = Path("static/documents")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+# Uploads are streamed here first; same filesystem as UPLOAD_DIR so the final move is atomic
+SPOOL_DIR = UPLOAD_DIR / ".incoming"
+SPOOL_DIR.mkdir(parents=True, exist_ok=True)
 
 # Limits
 MAX_FILE_SIZE = settings.MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read from the upload stream at a time
 MAX_TEXT_LENGTH = settings.MAX_TEXT_LENGTH
 MAX_PDF_PAGES = settings.MAX_PDF_PAGES
 MAX_SUMMARY_LENGTH = settings.MAX_SUMMARY_LENGTH
-# OpenAI limits (gpt-4o-mini has ~128k token context, but we use ~16k chars for safety and cost)
-MAX_TEXT_FOR_SUMMARY = 16000  # Characters (roughly 4000 tokens, but model can handle more)
+# Characters sent to the LLM per summary call (~3000 tokens); longer documents are
+# summarized chunk by chunk in parallel and the chunk summaries combined (map-reduce)
+MAX_TEXT_FOR_SUMMARY = settings.SUMMARY_CHUNK_CHARS
+
+extraction_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_EXTRACTIONS)
+# Storing a blob's file and record and deleting them are serialized by one of these, picked by content hash
+BLOB_LOCKS = [asyncio.Lock() for _ in range(64)]
 
 # No external API needed - using rule-based processing
 
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file"""
+def _blob_lock(content_hash: str) -> asyncio.Lock:
+    return BLOB_LOCKS[zlib.crc32(content_hash.encode("utf-8")) % len(BLOB_LOCKS)]
+
+async def extract_text_from_pdf(file_path: Path) -> str:
+    """Extract text from PDF file, parsing page chunks in parallel worker processes"""
     try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
-        # Check page limit
-        num_pages = len(pdf_reader.pages)
-        if num_pages > MAX_PDF_PAGES:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"PDF has {num_pages} pages. Maximum allowed is {MAX_PDF_PAGES} pages."
-            )
-        
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        # Bound concurrent extractions so upload bursts can't take every core
+        async with extraction_semaphore:
+            # Check page limit
+            num_pages = await run_in_process(count_pages, str(file_path))
+            if num_pages > MAX_PDF_PAGES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"PDF has {num_pages} pages. Maximum allowed is {MAX_PDF_PAGES} pages."
+                )
+            
+            # Spread pages over the worker processes, but never below PDF_PAGES_PER_CHUNK
+            # since every chunk re-opens the PDF
+            chunk_size = max(1, settings.PDF_PAGES_PER_CHUNK, math.ceil(num_pages / settings.WORKER_PROCESSES))
+            chunks = await asyncio.gather(*(
+                run_in_process(extract_page_range, str(file_path), start, min(start + chunk_size, num_pages))
+                for start in range(0, num_pages, chunk_size)
+            ))
+        
+        return "\n".join(page for chunk in chunks for page in chunk).strip()
     except HTTPException:
         raise
     except Exception as e:
@@ -51,20 +77,112 @@ def extract_text_from_pdf(file_content: bytes) -> str:
             detail=f"Failed to extract text from PDF: {str(e)}"
         )
 
-def extract_text_from_txt(file_content: bytes) -> str:
+def extract_text_from_txt(file_path: Path) -> str:
     """Extract text from text file"""
     try:
-        # Try UTF-8 first, fallback to latin-1
-        try:
-            return file_content.decode('utf-8')
-        except UnicodeDecodeError:
-            return file_content.decode('latin-1')
+        # Decode straight from the mapped file, without an intermediate bytes copy
+        with open_mapped(str(file_path)) as mapped:
+            # Try UTF-8 first, fallback to latin-1
+            try:
+                return str(mapped, 'utf-8')
+            except UnicodeDecodeError:
+                return str(mapped, 'latin-1')
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to extract text from file: {str(e)}"
         )
 
+def _file_too_large_error(file_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"File size ({file_size / (1024*1024):.2f} MB) exceeds maximum allowed size ({settings.MAX_FILE_SIZE_MB} MB)"
+    )
+
+async def spool_upload(file: UploadFile) -> Tuple[Path, int, str]:
+    """
+    Stream an upload to a temporary file on disk in fixed-size chunks
+    
+    Aborts as soon as MAX_FILE_SIZE is exceeded, so oversized uploads are never
+    buffered in full. The content is hashed while streaming.
+    
+    Returns:
+        Tuple of (temporary file path, file size in bytes, sha256 hex digest)
+    """
+    # Reject early when the client declared the size up front
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise _file_too_large_error(file.size)
+    
+    hasher = hashlib.sha256()
+    file_size = 0
+    tmp = tempfile.NamedTemporaryFile(dir=SPOOL_DIR, suffix=".part", delete=False)
+    tmp_path = Path(tmp.name)
+    try:
+        with tmp:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    raise _file_too_large_error(file_size)
+                hasher.update(chunk)
+                await run_in_thread(tmp.write, chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, file_size, hasher.hexdigest()
+
+async def _store_blob(tmp_path: Path, file_ext: str, file_size: int, content_hash: str) -> dict:
+    """
+    Extract text from a spooled upload and store it as a content-addressed blob
+    
+    Returns:
+        The blob record (shared by every document with the same content)
+    """
+    # Extract text based on file type
+    if file_ext == '.pdf':
+        extracted_text = await extract_text_from_pdf(tmp_path)
+        file_type = "pdf"
+    else:  # .txt
+        extracted_text = await run_in_thread(extract_text_from_txt, tmp_path)
+        file_type = "txt"
+    
+    if not extracted_text.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No text could be extracted from the file"
+        )
+    
+    # Check text length limit
+    if len(extracted_text) > MAX_TEXT_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Extracted text ({len(extracted_text)} characters) exceeds maximum allowed length ({MAX_TEXT_LENGTH} characters)"
+        )
+    
+    filepath = UPLOAD_DIR / f"{content_hash}{file_ext}"
+    blob = {
+        "filepath": str(filepath),
+        "file_type": file_type,
+        "file_size": file_size,
+        "text_length": len(extracted_text),
+        "text_preview": extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text,
+        "ref_count": 0,
+        "created_at": datetime.utcnow()
+    }
+    # Under the blob lock so a concurrent last delete can't unlink the file after it's moved in
+    async with _blob_lock(content_hash):
+        # Move the spooled file into place instead of writing it again
+        # (an identical upload racing this one writes the same bytes to the same path)
+        os.replace(tmp_path, filepath)
+        if not await storage.save_blob(content_hash, blob, extracted_text):
+            # An identical upload finished while this one was extracting
+            return await storage.get_blob(content_hash)
+        # Ready for "chat with this document" before the first question
+        index_document(content_hash, extracted_text)
+    return blob
+
 async def upload_document(file: UploadFile, user_id: Optional[str] = None) -> dict:
     """
     Upload and process a document (PDF or text file)
@@ -85,70 +203,49 @@ async def upload_document(file: UploadFile, user_id: Optional[str] = None) -> di
                 detail="Only PDF and TXT files are supported"
             )
         
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        # Check file size limit
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size ({file_size / (1024*1024):.2f} MB) exceeds maximum allowed size ({settings.MAX_FILE_SIZE_MB} MB)"
-            )
-        
-        # Extract text based on file type
-        if file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf(file_content)
-            file_type = "pdf"
-        else:  # .txt
-            extracted_text = extract_text_from_txt(file_content)
-            file_type = "txt"
+        # Stream the upload to disk; peak memory stays at one chunk
+        tmp_path, file_size, content_hash = await spool_upload(file)
         
-        if not extracted_text.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No text could be extracted from the file"
-            )
-        
-        # Check text length limit
-        if len(extracted_text) > MAX_TEXT_LENGTH:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Extracted text ({len(extracted_text)} characters) exceeds maximum allowed length ({MAX_TEXT_LENGTH} characters)"
-            )
+        try:
+            # Every upload gets its own handle, pointing at the shared blob. The reference is
+            # only taken if the blob still exists, so a concurrent last delete cannot remove it
+            # from under this document; if it was deleted, the upload stores it again.
+            blob = await storage.get_blob(content_hash)
+            if (
+                blob is not None
+                and Path(blob["filepath"]).exists()
+                and await storage.add_blob_ref(content_hash, 1) is not None
+            ):
+                print(f"Upload matches stored content {content_hash[:12]}, skipping extraction")
+            else:
+                blob = await _store_blob(tmp_path, file_ext, file_size, content_hash)
+                await storage.add_blob_ref(content_hash, 1)
+        finally:
+            tmp_path.unlink(missing_ok=True)
         
-        # Generate document ID
         document_id = generate_id()
         
-        # Save file to disk
-        filename = f"{document_id}{file_ext}"
-        filepath = UPLOAD_DIR / filename
-        with open(filepath, 'wb') as f:
-            f.write(file_content)
-        
-        # Store document metadata
+        # Store document metadata (the text itself stays with the blob)
         document_data = {
             "filename": file.filename,
-            "file_type": file_type,
+            "file_type": blob["file_type"],
             "file_size": file_size,
-            "filepath": str(filepath),
-            "extracted_text": extracted_text,
-            "text_length": len(extracted_text),
+            "filepath": blob["filepath"],
+            "content_hash": content_hash,
+            "text_length": blob["text_length"],
+            "text_preview": blob["text_preview"],
             "user_id": user_id,
             "uploaded_at": datetime.utcnow()
         }
-        documents_db[document_id] = document_data
-        
-        # Get text preview (first 500 characters)
-        text_preview = extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text
+        await storage.save_document(document_id, document_data)
         
         return {
             "document_id": document_id,
             "filename": file.filename,
-            "file_type": file_type,
+            "file_type": document_data["file_type"],
             "file_size": file_size,
             "uploaded_at": document_data["uploaded_at"],
-            "text_preview": text_preview
+            "text_preview": document_data["text_preview"]
         }
         
     except HTTPException:
@@ -159,6 +256,56 @@ async def upload_document(file: UploadFile, user_id: Optional[str] = None) -> di
             detail=f"Failed to process document: {str(e)}"
         )
 
+async def _llm_summary(text: str, max_length: int, focus: Optional[str] = None) -> str:
+    """Summarize text that fits in a single LLM call"""
+    focus_text = f" Focus on: {focus}." if focus else ""
+    prompt = f"Summarize the following text in {max_length} words or less.{focus_text} Provide a clear, concise summary with key points:\n\n{text}"
+    return await chat_completion(
+        messages=[
+            {"role": "system", "content": "You are an expert at creating concise, informative summaries. Focus on key points and main ideas."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=500
+    )
+
+async def summarize_with_llm(text: str, max_length: int, focus: Optional[str] = None) -> str:
+    """
+    Summarize text of any length with the LLM
+    
+    Text longer than MAX_TEXT_FOR_SUMMARY is split at section and paragraph
+    boundaries; the chunks are summarized concurrently (at most
+    SUMMARY_MAX_PARALLEL_CHUNKS at once) and the partial summaries are then
+    combined in a final call, so latency stays close to a single call.
+    """
+    chunks = split_structured(text, MAX_TEXT_FOR_SUMMARY)
+    if len(chunks) <= 1:
+        return await _llm_summary(text, max_length, focus)
+    
+    semaphore = asyncio.Semaphore(settings.SUMMARY_MAX_PARALLEL_CHUNKS)
+    # Each section gets a share of the budget, but enough words to keep its key points
+    section_length = max(60, max_length // 2)
+    
+    async def summarize_chunk(chunk: str) -> str:
+        async with semaphore:
+            return await _llm_summary(chunk, section_length, focus)
+    
+    partials = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+    combined = "\n\n".join(f"Section {i + 1} of {len(partials)}:\n{partial}" for i, partial in enumerate(partials))
+    if len(combined) > MAX_TEXT_FOR_SUMMARY:
+        # Very long document: reduce the section summaries in another round
+        return await summarize_with_llm(combined, max_length, focus)
+    
+    focus_text = f" Focus on: {focus}." if focus else ""
+    return await chat_completion(
+        messages=[
+            {"role": "system", "content": "You are an expert at creating concise, informative summaries. Focus on key points and main ideas."},
+            {"role": "user", "content": f"The following are summaries of consecutive sections of one document. Combine them into a single summary of the whole document in {max_length} words or less.{focus_text} Provide a clear, concise summary with key points:\n\n{combined}"}
+        ],
+        temperature=0.3,
+        max_tokens=500
+    )
+
 async def generate_summary(
     document_id: str,
     max_length: int = 200,
@@ -177,163 +324,47 @@ async def generate_summary(
     """
     try:
         # Get document
-        if document_id not in documents_db:
+        document = await get_document(document_id)
+        if not document:
             raise Exception("Document not found")
         
-        document = documents_db[document_id]
-        text = document["extracted_text"]
+        text = await get_document_text(document)
         original_length = len(text)
+        # Summaries are shared by every document with the same content
+        content_hash = document["content_hash"]
         
         # Validate summary length
         if max_length > MAX_SUMMARY_LENGTH:
             max_length = MAX_SUMMARY_LENGTH  # Cap it instead of raising error
         
-        # Check if summary already exists
-        if document_id in summaries_db:
-            existing_summary = summaries_db[document_id]
-            # Return existing summary if parameters match
-            if (existing_summary.get("max_length") == max_length and 
-                existing_summary.get("focus") == focus):
-                return {
-                    "document_id": document_id,
-                    "summary": existing_summary["summary"],
-                    "original_length": original_length,
-                    "summary_length": len(existing_summary["summary"]),
-                    "created_at": existing_summary["created_at"]
-                }
-        
-        # Truncate text if too long for OpenAI (to fit within token limits)
-        # gpt-3.5-turbo has ~4096 token context, we reserve ~500 tokens for prompt/response
-        # So we can use ~3500 tokens for input text (~10,500 characters)
-        text_for_summary = text
-        if len(text) > MAX_TEXT_FOR_SUMMARY:
-            text_for_summary = text[:MAX_TEXT_FOR_SUMMARY] + "\n\n[Text truncated due to length limits...]"
+        # Check if a summary with these parameters already exists
+        model = summary_model()
+        cached = await get_cached_summary(content_hash, max_length, focus, model)
         
         # Try OpenAI first if API key is available
-        if settings.OPENAI_API_KEY:
+        if cached is None and settings.OPENAI_API_KEY:
             try:
-                client = OpenAI(api_key=settings.OPENAI_API_KEY)
-                
-                focus_text = f" Focus on: {focus}." if focus else ""
-                prompt = f"Summarize the following text in {max_length} words or less.{focus_text} Provide a clear, concise summary with key points:\n\n{text_for_summary}"
-                
-                response = client.chat.completions.create(
-                    model=settings.OPENAI_MODEL,
-                    messages=[
-                        {"role": "system", "content": "You are an expert at creating concise, informative summaries. Focus on key points and main ideas."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=500
-                )
-                
-                summary = response.choices[0].message.content.strip()
-                
-                # Store summary
-                summaries_db[document_id] = {
-                    "summary": summary,
-                    "max_length": max_length,
-                    "focus": focus,
-                    "created_at": datetime.utcnow()
-                }
-                
-                return {
-                    "document_id": document_id,
-                    "summary": summary,
-                    "original_length": original_length,
-                    "summary_length": len(summary),
-                    "created_at": datetime.utcnow()
-                }
+                # Whole document: chunked map-reduce when it doesn't fit one call
+                summary = await summarize_with_llm(text, max_length, focus)
+                cached = await cache_summary(content_hash, max_length, focus, model, summary, datetime.utcnow())
             except Exception as e:
                 print(f"Error generating summary with OpenAI: {str(e)}")
                 # Fall back to rule-based
-                pass
+                model = "extractive"
+                cached = await get_cached_summary(content_hash, max_length, focus, model)
         
-        # Fallback: Generate summary using rule-based extraction
-        # Extract key sentences and create bullet points
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]  # Filter short sentences
-        
-        # If no sentences found, use paragraphs
-        if not sentences:
-            paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-            if paragraphs:
-                sentences = [p[:200] for p in paragraphs[:5]]
-            else:
-                # Last resort: use first part of text
-                sentences = [text[:300]]
-        
-        # Score sentences by importance (longer sentences with key words are more important)
-        important_keywords = ["important", "key", "main", "primary", "essential", "critical", 
-                             "significant", "result", "finding", "conclusion", "summary",
-                             "note", "remember", "focus", "must", "should", "need"]
-        
-        scored_sentences = []
-        for sentence in sentences:
-            if not sentence:
-                continue
-            score = len(sentence)  # Longer sentences get higher base score
-            # Boost score for important keywords
-            for keyword in important_keywords:
-                if keyword.lower() in sentence.lower():
-                    score += 50
-            # Boost score for numbers (often important data)
-            if re.search(r'\d+', sentence):
-                score += 30
-            scored_sentences.append((score, sentence))
-        
-        # Sort by score and take top sentences
-        if scored_sentences:
-            scored_sentences.sort(reverse=True, key=lambda x: x[0])
-            num_points = min(max_length // 20, 8, len(scored_sentences))  # Roughly 8 bullet points
-            top_sentences = scored_sentences[:num_points]
-        else:
-            # Fallback: use first few sentences
-            top_sentences = [(0, s) for s in sentences[:5]]
-        
-        # Create summary as bullet points
-        summary_points = []
-        for _, sentence in top_sentences:
-            # Clean up sentence
-            sentence = sentence.strip()
-            if sentence:
-                # Capitalize first letter
-                if len(sentence) > 1:
-                    sentence = sentence[0].upper() + sentence[1:]
-                else:
-                    sentence = sentence.upper()
-                summary_points.append(f"• {sentence}")
-        
-        summary = "\n".join(summary_points) if summary_points else "• " + text[:200] + "..."
-        
-        # If summary is too short, add more sentences
-        if len(summary.split()) < max_length // 2 and len(scored_sentences) > len(summary_points):
-            additional = scored_sentences[len(summary_points):min(len(summary_points) + 3, len(scored_sentences))]
-            for _, sentence in additional:
-                sentence = sentence.strip()
-                if sentence:
-                    if len(sentence) > 1:
-                        sentence = sentence[0].upper() + sentence[1:]
-                    else:
-                        sentence = sentence.upper()
-                    summary += f"\n• {sentence}"
-        
-        # Store summary
-        summary_data = {
-            "document_id": document_id,
-            "summary": summary,
-            "max_length": max_length,
-            "focus": focus,
-            "created_at": datetime.utcnow()
-        }
-        summaries_db[document_id] = summary_data
+        if cached is None:
+            # Fallback: extractive summary of the most representative sentences
+            # (NumPy TF-IDF scoring over the whole text, CPU-bound so off the event loop)
+            summary = await run_in_thread(summarize, text, max_length, focus)
+            cached = await cache_summary(content_hash, max_length, focus, model, summary, datetime.utcnow())
         
         return {
             "document_id": document_id,
-            "summary": summary,
+            "summary": cached["summary"],
             "original_length": original_length,
-            "summary_length": len(summary),
-            "created_at": summary_data["created_at"]
+            "summary_length": len(cached["summary"]),
+            "created_at": cached["created_at"]
         }
         
     except Exception as e:
@@ -344,8 +375,9 @@ async def generate_summary(
         
         # Get document for fallback
         text = ""
-        if document_id in documents_db:
-            text = documents_db[document_id].get("extracted_text", "")
+        document = await get_document(document_id)
+        if document:
+            text = await get_document_text(document)
             if text:
                 sentences = [s.strip() for s in text.split('.') if s.strip()][:5]
                 summary = '• ' + '\n• '.join(sentences) + '.' if sentences else "• " + text[:200] + "..."
@@ -362,31 +394,39 @@ async def generate_summary(
             "created_at": datetime.utcnow()
         }
 
-def get_document(document_id: str) -> Optional[dict]:
-    """Get document by ID"""
-    return documents_db.get(document_id)
+async def get_document(document_id: str) -> Optional[dict]:
+    """Get document metadata by ID"""
+    return await storage.get_document(document_id)
 
-def delete_document(document_id: str) -> bool:
-    """Delete a document and its associated files"""
+async def get_document_text(document: dict) -> str:
+    """Load the extracted text of a document"""
+    return await storage.get_text(document["content_hash"]) or ""
+
+async def delete_document(document_id: str) -> bool:
+    """Delete a document, and its file and summaries once no other document shares them"""
     try:
-        if document_id not in documents_db:
+        document = await storage.get_document(document_id)
+        if not document:
             return False
         
-        document = documents_db[document_id]
-        filepath = Path(document["filepath"])
-        
-        # Delete file from disk
-        if filepath.exists():
-            filepath.unlink()
-        
-        # Remove from storage
-        del documents_db[document_id]
-        
-        # Remove summary if exists
-        if document_id in summaries_db:
-            del summaries_db[document_id]
+        await storage.delete_document(document_id)
+        content_hash = document["content_hash"]
+        ref_count = await storage.add_blob_ref(content_hash, -1)
+        if ref_count is not None and ref_count > 0:
+            return True
+        
+        # Last reference gone: remove the blob, its text and summary (unless an upload just took a new one).
+        # The file goes under the same lock an upload holds while moving it in and storing the record.
+        async with _blob_lock(content_hash):
+            if not await storage.delete_blob(content_hash):
+                return True
+            forget_document_index(content_hash)
+            forget_summaries(content_hash)
+            result_cache.forget(content_hash)
+            filepath = Path(document["filepath"])
+            if filepath.exists():
+                filepath.unlink()
         
         return True
     except Exception:
         return False
-
@@ -0,0 +1,81 @@
+"""
+Single-pass keyword highlighter.
+
+All words, phrases and patterns from the term list are compiled once into
+one regex (see core.textmatch). Highlighting is a single scan of the text
+that collects match spans, merges touching ones, and builds the output in
+one join, so inserted markup is never re-scanned.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from core.config import settings
+from core.textmatch import compile_terms
+
+DEFAULT_TERMS_PATH = Path(__file__).parent.parent / "data" / "highlight_terms.json"
+
+
+class Highlighter:
+    """
+    Args:
+        words: Single words highlighted at word boundaries (case-insensitive)
+        phrases: Multi-word phrases; any whitespace between words matches
+        patterns: Regexes such as years or percentages
+        tag: Element wrapped around each highlight
+    """
+
+    def __init__(self, words: Iterable[str] = (), phrases: Iterable[str] = (), patterns: Iterable[str] = (), tag: str = "mark"):
+        self.pattern = compile_terms(list(words) + list(phrases), patterns)
+        self.open_tag = f"<{tag}>"
+        self.close_tag = f"</{tag}>"
+        # Identifies the term list, so cached highlights are not reused after it changes
+        self.version = hashlib.sha1(f"{tag}\0{self.pattern.pattern}".encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Highlighter":
+        """Load a term list: {"words": [...], "phrases": [...], "patterns": [...]}"""
+        with open(path, "r", encoding="utf-8") as f:
+            terms = json.load(f)
+        return cls(terms.get("words", []), terms.get("phrases", []), terms.get("patterns", []))
+
+    def spans(self, text: str) -> List[Tuple[int, int]]:
+        """Find highlight spans in one pass, merging spans that touch"""
+        spans: List[Tuple[int, int]] = []
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            if start == end:
+                continue
+            if spans and start <= spans[-1][1]:
+                spans[-1] = (spans[-1][0], max(end, spans[-1][1]))
+            else:
+                spans.append((start, end))
+        return spans
+
+    def highlight(self, text: str) -> str:
+        """Wrap every match in the highlight tag, keeping the original text and case"""
+        parts = []
+        position = 0
+        for start, end in self.spans(text):
+            parts.append(text[position:start])
+            parts.append(self.open_tag)
+            parts.append(text[start:end])
+            parts.append(self.close_tag)
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
+
+
+class Highlighters:
+    default: Optional[Highlighter] = None
+
+highlighters = Highlighters()
+
+
+def get_highlighter() -> Highlighter:
+    """Get the highlighter for the configured term list, compiling it on first use"""
+    if highlighters.default is None:
+        path = Path(settings.HIGHLIGHT_TERMS_PATH) if settings.HIGHLIGHT_TERMS_PATH else DEFAULT_TERMS_PATH
+        highlighters.default = Highlighter.from_file(path)
+    return highlighters.default
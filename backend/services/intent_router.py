@@ -0,0 +1,140 @@
+"""
+Keyword intent router for the offline chatbot.
+
+Intents and their canned responses are loaded from a JSON file. Every
+keyword of every intent is compiled into one regex (see core.textmatch), so
+a message is scanned once whatever the number of intents, and each match is
+a dict lookup to the intents it counts toward. The regex takes the longest
+keyword at each position, so a matched phrase also counts the keywords
+inside it ("easily distracted" counts "distracted" too). An intent's score
+is the sum of the weights of its distinct keywords found in the message;
+the best scoring intent answers, and others scoring close to it are
+mentioned as follow-ups.
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.textmatch import compile_terms
+
+DEFAULT_INTENTS_PATH = Path(__file__).parent.parent / "data" / "chat_intents.json"
+
+
+def contained_keywords(keyword: str, keywords: Dict) -> List[str]:
+    """keyword and every keyword among keywords that is a run of its words"""
+    words = keyword.split()
+    runs = {" ".join(words[i:j]) for i in range(len(words)) for j in range(i + 1, len(words) + 1)}
+    return [run for run in runs if run in keywords]
+
+
+class Intent:
+    """
+    Args:
+        name: Identifier of the intent
+        title: Short topic name used when the intent is offered as a follow-up
+        keywords: Word or phrase -> weight (a list means weight 1 each)
+        response: Reply given when the intent wins
+    """
+
+    def __init__(self, name: str, title: str, keywords, response: str):
+        if not isinstance(keywords, dict):
+            keywords = {keyword: 1.0 for keyword in keywords}
+        self.name = name
+        self.title = title
+        self.keywords = {" ".join(keyword.lower().split()): float(weight) for keyword, weight in keywords.items()}
+        self.response = response
+
+
+class IntentRouter:
+    """
+    Args:
+        intents: Intents in priority order (earlier ones win ties)
+        default_response: Reply when no intent reaches min_score
+        min_score: Lowest score that selects an intent
+        follow_up_ratio: Other intents scoring at least this share of the best are offered as follow-ups
+    """
+
+    def __init__(
+        self,
+        intents: List[Intent],
+        default_response: str,
+        min_score: float = 1.0,
+        follow_up_ratio: float = 0.75,
+        max_follow_ups: int = 2
+    ):
+        self.intents = intents
+        self.default_response = default_response
+        self.min_score = min_score
+        self.follow_up_ratio = follow_up_ratio
+        self.max_follow_ups = max_follow_ups
+
+        # keyword -> [(intent index, weight)]; a keyword may count toward several intents
+        self.keywords: Dict[str, List[Tuple[int, float]]] = {}
+        for index, intent in enumerate(intents):
+            for keyword, weight in intent.keywords.items():
+                self.keywords.setdefault(keyword, []).append((index, weight))
+        self.pattern = compile_terms(self.keywords)
+        # Matched keyword -> keywords it counts as; only phrases contain others
+        self.contained = {
+            keyword: contained_keywords(keyword, self.keywords)
+            for keyword in self.keywords if " " in keyword
+        }
+
+    @classmethod
+    def from_file(cls, path: Path) -> "IntentRouter":
+        """Load intents: {"default_response": ..., "intents": [{"name", "title", "keywords", "response"}, ...]}"""
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        intents = [
+            Intent(item["name"], item.get("title", item["name"]), item["keywords"], item["response"])
+            for item in config["intents"]
+        ]
+        return cls(
+            intents,
+            config["default_response"],
+            min_score=config.get("min_score", 1.0),
+            follow_up_ratio=config.get("follow_up_ratio", 0.75)
+        )
+
+    def scores(self, message: str) -> List[Tuple[Intent, float]]:
+        """Intents matched by message with their scores, best first"""
+        found = set()
+        for match in self.pattern.finditer(message):
+            keyword = " ".join(match.group().lower().split())
+            found.update(self.contained.get(keyword, (keyword,)))
+        totals: Dict[int, float] = {}
+        for keyword in found:
+            for index, weight in self.keywords.get(keyword, ()):
+                totals[index] = totals.get(index, 0.0) + weight
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.intents[index], score) for index, score in ranked]
+
+    def respond(self, message: str) -> str:
+        """Reply of the best intent, offering close runners-up as follow-ups"""
+        ranked = [(intent, score) for intent, score in self.scores(message) if score >= self.min_score]
+        if not ranked:
+            return self.default_response
+
+        best, best_score = ranked[0]
+        follow_ups = [
+            intent.title for intent, score in ranked[1:1 + self.max_follow_ups]
+            if score >= best_score * self.follow_up_ratio
+        ]
+        if not follow_ups:
+            return best.response
+        return f"{best.response}\n\nI can also help with {' and '.join(follow_ups)} - just ask!"
+
+
+class IntentRouters:
+    default: Optional[IntentRouter] = None
+
+intent_routers = IntentRouters()
+
+
+def get_intent_router() -> IntentRouter:
+    """Get the router for the configured intents file, compiling it on first use"""
+    if intent_routers.default is None:
+        path = Path(settings.CHAT_INTENTS_PATH) if settings.CHAT_INTENTS_PATH else DEFAULT_INTENTS_PATH
+        intent_routers.default = IntentRouter.from_file(path)
+    return intent_routers.default
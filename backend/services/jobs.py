@@ -0,0 +1,309 @@
+"""
+Background jobs for long-running document operations.
+
+Submitting a job stores it and returns at once; a fixed pool of JOB_WORKERS
+workers runs it. Queued jobs wait in one queue per priority, and within a
+priority each owner (user, or client address for anonymous requests) has
+its own FIFO served round-robin, so one client submitting many jobs cannot
+starve the others; JOB_MAX_QUEUED_PER_USER caps what an owner may have
+waiting. The owner only counts for quota and fairness: reading, following or
+cancelling a job takes the unguessable access token returned when it was
+submitted (only its hash is stored), since anonymous clients behind one
+address would otherwise share their jobs, and EventSource cannot send an
+Authorization header. Every state change is saved to the "jobs" storage collection, so
+status and results can be read from any worker process, and pushed to
+local subscribers for Server-Sent Events.
+
+Finished jobs are kept for JOB_RETENTION_SECONDS, then deleted. Jobs still
+queued or running when the server shuts down are marked failed.
+"""
+import asyncio
+import hashlib
+import hmac
+import secrets
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+
+from core import storage
+from core.config import settings
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+FINISHED = ("succeeded", "failed", "cancelled")
+PURGE_INTERVAL_SECONDS = 600  # How often expired jobs are deleted from storage
+
+JobHandler = Callable[[dict], Awaitable[Any]]
+
+
+def _token_digest(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+
+def can_access(job: dict, access_token: Optional[str]) -> bool:
+    """Whether access_token is the one returned when the job was submitted"""
+    digest = job.get("access_token_hash")
+    return bool(access_token and digest) and hmac.compare_digest(_token_digest(access_token), digest)
+
+
+class JobQueue:
+    """
+    Args:
+        handlers: Job kind -> coroutine function taking the job's params and returning its result
+        workers: Jobs run at once
+        max_queued_per_owner: Jobs an owner may have waiting
+        timeout: Seconds a job may run before it fails
+        retention: Seconds a finished job and its result are kept
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        workers: int,
+        max_queued_per_owner: int,
+        timeout: float,
+        retention: float
+    ):
+        self.handlers = handlers
+        self.workers = workers
+        self.max_queued_per_owner = max_queued_per_owner
+        self.timeout = timeout
+        self.retention = retention
+        # Per priority: owner -> job ids, owners in round-robin order
+        self.queues: List["OrderedDict[str, Deque[str]]"] = [OrderedDict() for _ in PRIORITIES]
+        # Queued and running jobs; finished ones are only in storage
+        self.jobs: Dict[str, dict] = {}
+        self.running: Dict[str, asyncio.Task] = {}
+        self.watchers: Dict[str, Set[asyncio.Queue]] = {}
+        self.ready: Optional[asyncio.Condition] = None
+        # Workers and the purge loop
+        self.tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        self.ready = asyncio.Condition()
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self.tasks.append(asyncio.create_task(self._purge()))
+
+    async def stop(self):
+        """Stop the workers and fail every unfinished job"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        for job in list(self.jobs.values()):
+            await self._finish(job, "failed", error="Server shut down before the job finished", error_status=503)
+
+    async def submit(self, kind: str, params: dict, owner: str, priority: str = "normal") -> Tuple[dict, str]:
+        """
+        Store a new job and queue it (429 if the owner already has too many waiting)
+
+        Returns:
+            (job, access token needed to read, follow or cancel it)
+        """
+        waiting = sum(len(owners.get(owner, ())) for owners in self.queues)
+        if waiting >= self.max_queued_per_owner:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many queued jobs ({waiting}); wait for some to finish"
+            )
+
+        job_id = storage.generate_id()
+        access_token = secrets.token_urlsafe(32)
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "params": params,
+            "owner": owner,
+            "access_token_hash": _token_digest(access_token),
+            "priority": priority,
+            "status": "queued",
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None,
+            "expires_at": None,
+            "result": None,
+            "error": None,
+            "error_status": None
+        }
+        await storage.save_job(job_id, job)
+        self.jobs[job_id] = job
+        self.queues[PRIORITIES[priority]].setdefault(owner, deque()).append(job_id)
+        async with self.ready:
+            self.ready.notify()
+        return job, access_token
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Current state of a job (also finds jobs run by other worker processes); None once expired"""
+        job = self.jobs.get(job_id) or await storage.get_job(job_id)
+        if job is not None and job.get("expires_at") is not None and job["expires_at"] <= datetime.utcnow():
+            # Not purged yet
+            return None
+        return job
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job and wait until it is stored as cancelled; False if it is not active here"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        if job["status"] == "running":
+            updates = self.watch(job_id)
+            try:
+                self.running[job_id].cancel()
+                while (await updates.get())["status"] not in FINISHED:
+                    pass
+            finally:
+                self.unwatch(job_id, updates)
+            return True
+
+        owners = self.queues[PRIORITIES[job["priority"]]]
+        ids = owners.get(job["owner"])
+        if ids is not None and job_id in ids:
+            ids.remove(job_id)
+            if not ids:
+                del owners[job["owner"]]
+        await self._finish(job, "cancelled")
+        return True
+
+    def watch(self, job_id: str) -> asyncio.Queue:
+        """Queue receiving a snapshot of the job on every state change"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self.watchers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unwatch(self, job_id: str, queue: asyncio.Queue):
+        watchers = self.watchers.get(job_id)
+        if watchers is not None:
+            watchers.discard(queue)
+            if not watchers:
+                del self.watchers[job_id]
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": len(self.running),
+            "queued": {name: sum(len(ids) for ids in self.queues[level].values()) for name, level in PRIORITIES.items()}
+        }
+
+    def _next_job(self) -> Optional[str]:
+        """Highest-priority job of the next owner in turn"""
+        for owners in self.queues:
+            if owners:
+                owner, ids = owners.popitem(last=False)
+                job_id = ids.popleft()
+                if ids:
+                    # The owner goes to the back of the line
+                    owners[owner] = ids
+                return job_id
+        return None
+
+    async def _purge(self):
+        """Delete expired jobs from storage, including ones finished by other processes"""
+        while True:
+            await asyncio.sleep(min(self.retention, PURGE_INTERVAL_SECONDS))
+            try:
+                deleted = await storage.delete_expired_jobs(datetime.utcnow())
+                if deleted:
+                    print(f"Deleted {deleted} expired jobs")
+            except Exception as e:
+                print(f"Error deleting expired jobs: {str(e)}")
+
+    async def _worker(self):
+        while True:
+            async with self.ready:
+                await self.ready.wait_for(lambda: any(self.queues))
+                job_id = self._next_job()
+            await self._run(self.jobs[job_id])
+
+    async def _run(self, job: dict):
+        job["status"] = "running"
+        job["started_at"] = datetime.utcnow()
+        # A separate task, so cancelling the job can be told apart from stopping the worker
+        task = asyncio.create_task(asyncio.wait_for(self.handlers[job["kind"]](job["params"]), self.timeout))
+        self.running[job["id"]] = task
+        try:
+            await self._save(job)
+            # Returns when the task ends, however it ends
+            await asyncio.wait([task])
+        except asyncio.CancelledError:
+            # The worker is stopping
+            task.cancel()
+            raise
+        finally:
+            self.running.pop(job["id"], None)
+
+        if task.cancelled():
+            await self._finish(job, "cancelled")
+        elif isinstance(task.exception(), asyncio.TimeoutError):
+            await self._finish(job, "failed", error=f"Job timed out after {self.timeout:.0f} seconds", error_status=504)
+        elif task.exception() is not None:
+            e = task.exception()
+            if isinstance(e, HTTPException):
+                await self._finish(job, "failed", error=str(e.detail), error_status=e.status_code)
+            else:
+                print(f"Job {job['id']} ({job['kind']}) failed: {str(e)}")
+                await self._finish(job, "failed", error=str(e), error_status=500)
+        else:
+            await self._finish(job, "succeeded", result=jsonable_encoder(task.result()))
+
+    async def _finish(self, job: dict, state: str, result: Any = None, error: Optional[str] = None, error_status: Optional[int] = None):
+        finished_at = datetime.utcnow()
+        job.update({
+            "status": state,
+            "finished_at": finished_at,
+            "expires_at": finished_at + timedelta(seconds=self.retention),
+            "result": result,
+            "error": error,
+            "error_status": error_status
+        })
+        self.jobs.pop(job["id"], None)
+        await self._save(job)
+
+    async def _save(self, job: dict):
+        await storage.save_job(job["id"], job)
+        for queue in self.watchers.get(job["id"], ()):
+            queue.put_nowait(dict(job))
+
+
+# Job kinds run the same code as the synchronous endpoints and return the same bodies
+
+async def _process_job(params: dict) -> dict:
+    from services.document_processor import process_document, with_processed_text
+    from schemas.document import ProcessDocumentResponse
+    result = await process_document(
+        document_id=params["document_id"],
+        options=params["options"],
+        accessibility_settings=params.get("accessibility_settings")
+    )
+    return ProcessDocumentResponse(**with_processed_text(result)).model_dump()
+
+async def _summarize_job(params: dict) -> dict:
+    from services.document_service import generate_summary
+    from schemas.document import SummaryResponse
+    result = await generate_summary(
+        document_id=params["document_id"],
+        max_length=params["max_length"],
+        focus=params.get("focus")
+    )
+    return SummaryResponse(**result).model_dump()
+
+async def _quiz_job(params: dict) -> dict:
+    from services.quiz_service import generate_quiz
+    from schemas.quiz import QuizGenerationResponse
+    result = await generate_quiz(
+        document_id=params["document_id"],
+        question_types=params["question_types"],
+        num_questions=params["num_questions"],
+        difficulty=params["difficulty"]
+    )
+    return QuizGenerationResponse(**result).model_dump()
+
+
+job_queue = JobQueue(
+    handlers={"process": _process_job, "summarize": _summarize_job, "quiz": _quiz_job},
+    workers=settings.JOB_WORKERS,
+    max_queued_per_owner=settings.JOB_MAX_QUEUED_PER_USER,
+    timeout=settings.JOB_TIMEOUT_SECONDS,
+    retention=settings.JOB_RETENTION_SECONDS
+)
@@ -0,0 +1,36 @@
+"""
+PDF text extraction run inside worker processes.
+
+Kept free of app imports so worker processes start quickly. Workers get a
+file path and memory-map the file, so the PDF is never copied between
+processes or fully loaded into memory.
+"""
+import mmap
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import PyPDF2
+
+
+@contextmanager
+def open_mapped(file_path: str) -> Iterator[mmap.mmap]:
+    """Memory-map a file read-only"""
+    with open(file_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+def count_pages(file_path: str) -> int:
+    """Return the number of pages in a PDF"""
+    with open_mapped(file_path) as mapped:
+        return len(PyPDF2.PdfReader(mapped).pages)
+
+
+def extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """Extract the text of pages [start, end) of a PDF"""
+    with open_mapped(file_path) as mapped:
+        pdf_reader = PyPDF2.PdfReader(mapped)
+        return [(pdf_reader.pages[i].extract_text() or "") for i in range(start, end)]
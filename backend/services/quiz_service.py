@@ -2,50 +2,42 @@ import re
 import random
 import json
 from datetime import datetime
-from typing import List, Dict
-from openai import OpenAI
-from services.document_service import get_document
+from typing import List, Dict, Optional
+from services.document_service import get_document, get_document_text
 from schemas.quiz import QuizQuestion
 from core.storage import generate_id
 from core.config import settings
+from core.llm import chat_completion
+from core.executors import run_in_thread
+from services.result_cache import cached_result
 
-def generate_quiz_questions(
+async def _llm_quiz_questions(
     text: str,
     question_types: Dict[str, bool],
-    num_questions: int = 5,
-    difficulty: str = "medium"
+    num_questions: int,
+    difficulty: str
 ) -> List[QuizQuestion]:
-    """
-    Generate quiz questions from document text using OpenAI LLM or rule-based approach
-    """
+    """Generate quiz questions with the OpenAI LLM; raises if none could be generated"""
     questions = []
     
-    if not text or len(text.strip()) < 50:
-        raise ValueError("Document text is too short to generate quiz questions")
+    # Build question type list
+    q_types = []
+    if question_types.get("mcq", False):
+        q_types.append("multiple choice")
+    if question_types.get("true_false", False):
+        q_types.append("true/false")
+    if question_types.get("short_answer", False):
+        q_types.append("short answer")
     
-    # Use OpenAI if API key is available
-    if settings.OPENAI_API_KEY:
-        try:
-            client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            
-            # Build question type list
-            q_types = []
-            if question_types.get("mcq", False):
-                q_types.append("multiple choice")
-            if question_types.get("true_false", False):
-                q_types.append("true/false")
-            if question_types.get("short_answer", False):
-                q_types.append("short answer")
-            
-            if not q_types:
-                q_types = ["multiple choice"]  # Default
-            
-            question_types_str = ", ".join(q_types)
-            
-            # Truncate text if too long (keep first 8000 chars for context)
-            text_for_quiz = text[:8000] if len(text) > 8000 else text
-            
-            prompt = f"""You are an expert educational quiz generator. Generate {num_questions} high-quality quiz questions from the following text.
+    if not q_types:
+        q_types = ["multiple choice"]  # Default
+    
+    question_types_str = ", ".join(q_types)
+    
+    # Truncate text if too long (keep first 8000 chars for context)
+    text_for_quiz = text[:8000] if len(text) > 8000 else text
+    
+    prompt = f"""You are an expert educational quiz generator. Generate {num_questions} high-quality quiz questions from the following text.
 
 Question types to create: {question_types_str}
 Difficulty level: {difficulty}
@@ -96,109 +88,107 @@ Generate questions in JSON format with this exact structure:
 
 Return ONLY valid JSON, no additional text or markdown formatting."""
 
-            response = client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are an expert educational quiz generator. Always respond with valid JSON only, no markdown or additional text."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=3000,
-                response_format={"type": "json_object"} if settings.OPENAI_MODEL.startswith("gpt-4") else None
-            )
-            
-            content = response.choices[0].message.content.strip()
-            
-            # Parse JSON response
-            # Sometimes the response includes markdown code blocks
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            # Try to extract JSON if wrapped in other text
-            try:
-                quiz_data = json.loads(content)
-            except json.JSONDecodeError:
-                # Try to find JSON object in the response
-                json_match = re.search(r'\{.*"questions".*\}', content, re.DOTALL)
-                if json_match:
-                    quiz_data = json.loads(json_match.group())
-                else:
-                    print(f"Failed to parse JSON. Content: {content[:500]}")
-                    raise ValueError("Could not parse JSON from OpenAI response")
-            
-            # Convert to QuizQuestion objects
-            questions_list = quiz_data.get("questions", [])
-            if not questions_list:
-                # Try alternative structure
-                if isinstance(quiz_data, list):
-                    questions_list = quiz_data
-                else:
-                    raise ValueError("No questions found in OpenAI response")
-            
-            for q_data in questions_list[:num_questions]:
-                # Handle correct answer for MCQ
-                correct_answer = str(q_data.get("correct_answer", "")).strip()
-                question_type = q_data.get("question_type", "mcq")
-                
-                if question_type == "mcq":
-                    # Ensure correct_answer is A, B, C, or D
-                    if correct_answer.upper() in ["A", "B", "C", "D"]:
-                        correct_answer = correct_answer.upper()
-                    elif q_data.get("options"):
-                        # Find index of correct answer in options
-                        options = q_data.get("options", [])
-                        if correct_answer in options:
-                            correct_answer = chr(65 + options.index(correct_answer))
-                        elif len(options) > 0:
-                            correct_answer = "A"  # Default to first option
-                    else:
-                        correct_answer = "A"  # Default
-                elif question_type == "true_false":
-                    # Normalize to True or False
-                    if correct_answer.lower() in ["true", "t"]:
-                        correct_answer = "True"
-                    elif correct_answer.lower() in ["false", "f"]:
-                        correct_answer = "False"
-                    else:
-                        correct_answer = "True"  # Default
-                
-                # Validate question data
-                question_text = q_data.get("question", "").strip()
-                if not question_text or len(question_text) < 10:
-                    continue  # Skip invalid questions
-                
-                # Ensure options are set for MCQ and True/False
-                options = None
-                if question_type == "mcq":
-                    options = q_data.get("options", [])
-                    if not options or len(options) < 4:
-                        # Generate default options if missing
-                        options = ["Option A", "Option B", "Option C", "Option D"]
-                elif question_type == "true_false":
-                    options = ["True", "False"]
-                
-                questions.append(QuizQuestion(
-                    question=question_text,
-                    question_type=question_type,
-                    options=options,
-                    correct_answer=correct_answer,
-                    explanation=q_data.get("explanation", "").strip() if q_data.get("explanation") else f"The correct answer is {correct_answer}."
-                ))
-            
-            if questions and len(questions) > 0:
-                print(f"✅ Successfully generated {len(questions)} questions using OpenAI")
-                return questions[:num_questions]
-        except Exception as e:
-            print(f"❌ Error generating quiz with OpenAI: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            # Fall back to rule-based approach
-            pass
+    content = await chat_completion(
+        messages=[
+            {"role": "system", "content": "You are an expert educational quiz generator. Always respond with valid JSON only, no markdown or additional text."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=3000,
+        response_format={"type": "json_object"} if settings.OPENAI_MODEL.startswith("gpt-4") else None
+    )
     
-    # Fallback to rule-based approach if OpenAI fails or not available
-    print("📝 Using rule-based quiz generation (OpenAI not available or failed)")
+    # Parse JSON response
+    # Sometimes the response includes markdown code blocks
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+    
+    # Try to extract JSON if wrapped in other text
+    try:
+        quiz_data = json.loads(content)
+    except json.JSONDecodeError:
+        # Try to find JSON object in the response
+        json_match = re.search(r'\{.*"questions".*\}', content, re.DOTALL)
+        if json_match:
+            quiz_data = json.loads(json_match.group())
+        else:
+            print(f"Failed to parse JSON. Content: {content[:500]}")
+            raise ValueError("Could not parse JSON from OpenAI response")
+    
+    # Convert to QuizQuestion objects
+    questions_list = quiz_data.get("questions", [])
+    if not questions_list:
+        # Try alternative structure
+        if isinstance(quiz_data, list):
+            questions_list = quiz_data
+        else:
+            raise ValueError("No questions found in OpenAI response")
+    
+    for q_data in questions_list[:num_questions]:
+        # Handle correct answer for MCQ
+        correct_answer = str(q_data.get("correct_answer", "")).strip()
+        question_type = q_data.get("question_type", "mcq")
+        
+        if question_type == "mcq":
+            # Ensure correct_answer is A, B, C, or D
+            if correct_answer.upper() in ["A", "B", "C", "D"]:
+                correct_answer = correct_answer.upper()
+            elif q_data.get("options"):
+                # Find index of correct answer in options
+                options = q_data.get("options", [])
+                if correct_answer in options:
+                    correct_answer = chr(65 + options.index(correct_answer))
+                elif len(options) > 0:
+                    correct_answer = "A"  # Default to first option
+            else:
+                correct_answer = "A"  # Default
+        elif question_type == "true_false":
+            # Normalize to True or False
+            if correct_answer.lower() in ["true", "t"]:
+                correct_answer = "True"
+            elif correct_answer.lower() in ["false", "f"]:
+                correct_answer = "False"
+            else:
+                correct_answer = "True"  # Default
+        
+        # Validate question data
+        question_text = q_data.get("question", "").strip()
+        if not question_text or len(question_text) < 10:
+            continue  # Skip invalid questions
+        
+        # Ensure options are set for MCQ and True/False
+        options = None
+        if question_type == "mcq":
+            options = q_data.get("options", [])
+            if not options or len(options) < 4:
+                # Generate default options if missing
+                options = ["Option A", "Option B", "Option C", "Option D"]
+        elif question_type == "true_false":
+            options = ["True", "False"]
+        
+        questions.append(QuizQuestion(
+            question=question_text,
+            question_type=question_type,
+            options=options,
+            correct_answer=correct_answer,
+            explanation=q_data.get("explanation", "").strip() if q_data.get("explanation") else f"The correct answer is {correct_answer}."
+        ))
+    
+    if not questions:
+        raise ValueError("No usable questions in OpenAI response")
+    print(f"✅ Successfully generated {len(questions)} questions using OpenAI")
+    return questions[:num_questions]
+
+def _rule_based_quiz_questions(
+    text: str,
+    question_types: Dict[str, bool],
+    num_questions: int,
+    difficulty: str
+) -> List[QuizQuestion]:
+    """Generate quiz questions from key sentences without an LLM (CPU-bound, run it on a worker thread)"""
+    questions = []
     
     # Extract key sentences and concepts
     sentences = re.split(r'[.!?]+', text)
@@ -420,6 +410,49 @@ Return ONLY valid JSON, no additional text or markdown formatting."""
     print(f"✅ Generated {len(questions)} questions using rule-based approach")
     return questions[:num_questions]
 
+async def generate_quiz_questions(
+    text: str,
+    question_types: Dict[str, bool],
+    num_questions: int = 5,
+    difficulty: str = "medium",
+    content_hash: Optional[str] = None
+) -> List[QuizQuestion]:
+    """
+    Generate quiz questions from document text using OpenAI LLM or rule-based approach
+    
+    With content_hash, questions are cached per document content and quiz
+    parameters, and concurrent identical requests share one generation.
+    """
+    if not text or len(text.strip()) < 50:
+        raise ValueError("Document text is too short to generate quiz questions")
+    
+    params = {
+        "question_types": sorted(name for name, enabled in question_types.items() if enabled),
+        "num_questions": num_questions,
+        "difficulty": difficulty
+    }
+    
+    # Use OpenAI if API key is available
+    if settings.OPENAI_API_KEY:
+        try:
+            return await cached_result(
+                content_hash, "quiz", {**params, "model": settings.OPENAI_MODEL},
+                lambda: _llm_quiz_questions(text, question_types, num_questions, difficulty)
+            )
+        except Exception as e:
+            print(f"❌ Error generating quiz with OpenAI: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            # Fall back to rule-based approach
+            pass
+    
+    # Fallback to rule-based approach if OpenAI fails or not available
+    print("📝 Using rule-based quiz generation (OpenAI not available or failed)")
+    return await cached_result(
+        content_hash, "quiz", {**params, "model": "rules"},
+        lambda: run_in_thread(_rule_based_quiz_questions, text, question_types, num_questions, difficulty)
+    )
+
 async def generate_quiz(
     document_id: str,
     question_types: Dict[str, bool],
@@ -435,22 +468,23 @@ async def generate_quiz(
         print(f"   Number of questions: {num_questions}")
         
         # Get document
-        document = get_document(document_id)
+        document = await get_document(document_id)
         if not document:
             raise Exception(f"Document {document_id} not found")
         
-        text = document.get("extracted_text") or document.get("text", "")
+        text = await get_document_text(document)
         if not text or len(text.strip()) < 50:
             raise Exception("Document has no extracted text or text is too short (minimum 50 characters required)")
         
         print(f"   Document text length: {len(text)} characters")
         
         # Generate questions
-        questions = generate_quiz_questions(
+        questions = await generate_quiz_questions(
             text=text,
             question_types=question_types,
             num_questions=num_questions,
-            difficulty=difficulty
+            difficulty=difficulty,
+            content_hash=document.get("content_hash")
         )
         
         if not questions or len(questions) == 0:
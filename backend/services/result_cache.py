@@ -0,0 +1,107 @@
+"""
+Cache of derived document artifacts (simplified text, highlights, quizzes).
+
+Results are keyed by (document content hash, operation, parameters), so
+documents with the same content share them, and all of a content hash's
+results can be dropped at once when its last document is deleted. The cache
+is a process-local LRU bounded by RESULT_CACHE_MAX_ENTRIES and
+RESULT_CACHE_MAX_MB. Concurrent requests for the same key are coalesced
+(core.singleflight): the first computes, the others await its result.
+Failures are never cached, so callers can fall back to a different operation
+(e.g. rule-based instead of LLM) under another key.
+"""
+import json
+import sys
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from core.cache import LRUCache
+from core.config import settings
+from core.singleflight import SingleFlight
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a cached value, in bytes"""
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, BaseModel):
+        return estimate_size(value.model_dump())
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items()) + 64
+    if isinstance(value, (list, tuple, set)):
+        return sum(estimate_size(item) for item in value) + 56
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Args:
+        max_entries: Results kept before the least recently used is evicted
+        max_bytes: Memory budget for results
+        sizeof: Size of a result in bytes (defaults to estimate_size)
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, sizeof: Optional[Callable[[Any], int]] = None):
+        self.cache = LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=sizeof or estimate_size,
+            group_of=lambda key: key[0]
+        )
+        self.inflight = SingleFlight()
+
+    @staticmethod
+    def key(content_hash: str, operation: str, params: Optional[dict] = None) -> Tuple:
+        return (content_hash, operation, json.dumps(params or {}, sort_keys=True, default=str))
+
+    async def get_or_compute(
+        self,
+        content_hash: str,
+        operation: str,
+        params: Optional[dict],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached result, or compute it once for all concurrent callers"""
+        key = self.key(content_hash, operation, params)
+        missing = object()
+        value = self.cache.get(key, missing)
+        if value is not missing:
+            return value
+
+        async def compute_and_store() -> Any:
+            value = await compute()
+            self.cache.set(key, value)
+            return value
+
+        return await self.inflight.do(key, compute_and_store)
+
+    def forget(self, content_hash: str) -> int:
+        """Drop every cached result for a document's content"""
+        return self.cache.delete_group(content_hash)
+
+    def stats(self) -> dict:
+        stats = self.cache.stats()
+        stats["coalesced"] = self.inflight.coalesced
+        stats["in_flight"] = len(self.inflight)
+        return stats
+
+
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESULT_CACHE_MAX_MB * 1024 * 1024
+)
+
+
+async def cached_result(
+    content_hash: Optional[str],
+    operation: str,
+    params: Optional[dict],
+    compute: Callable[[], Awaitable[Any]]
+) -> Any:
+    """get_or_compute on the shared cache; computes directly when there is no content hash"""
+    if content_hash is None:
+        return await compute()
+    return await result_cache.get_or_compute(content_hash, operation, params, compute)
@@ -0,0 +1,173 @@
+"""
+Local BM25 retrieval over document chunks.
+
+A document's text is split into chunks at structural boundaries (see
+services.chunking) and indexed in NumPy: terms are hashed to integer ids, so
+there is no vocabulary to store, and the (chunk, term, count) postings are
+flat arrays sorted by term. Scoring a query slices the postings of its few
+terms and sums their BM25 weights per chunk with one np.bincount. Nothing
+leaves the process.
+
+Indexes are built when a document is uploaded and kept in an LRU keyed by
+content hash (RETRIEVAL_INDEX_CACHE_MAX_ENTRIES, RETRIEVAL_INDEX_CACHE_MB);
+after a restart or eviction they are rebuilt from the stored text on first
+use.
+"""
+import asyncio
+import re
+import zlib
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+
+from core import storage
+from core.config import settings
+from core.executors import run_in_thread
+from services.chunking import split_structured
+from services.result_cache import ResultCache
+from services.summarizer import STOPWORDS
+
+TERM = re.compile(r"[a-z0-9]+")
+HASH_BITS = 24  # Term ids are crc32 truncated to this many bits
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return [term for term in TERM.findall(text.lower()) if term not in STOPWORDS and len(term) > 1]
+
+
+def term_ids(terms: List[str]) -> np.ndarray:
+    mask = (1 << HASH_BITS) - 1
+    return np.fromiter((zlib.crc32(term.encode("utf-8")) & mask for term in terms), dtype=np.int64, count=len(terms))
+
+
+class DocumentIndex:
+    """
+    BM25 index of one document's chunks
+
+    Args:
+        chunks: Retrievable passages, in document order
+    """
+
+    def __init__(self, chunks: List[str]):
+        self.chunks = chunks
+        tokens = [term_ids(tokenize(chunk)) for chunk in chunks]
+        self.lengths = np.array([len(ids) for ids in tokens], dtype=np.float64)
+        self.average_length = float(self.lengths.mean()) if len(chunks) and self.lengths.sum() else 1.0
+
+        chunk_of_token = np.repeat(np.arange(len(chunks), dtype=np.int64), self.lengths.astype(np.int64))
+        all_ids = np.concatenate(tokens) if tokens else np.zeros(0, dtype=np.int64)
+        # One entry per (term, chunk) with its count, sorted by term then chunk
+        pairs, counts = np.unique((all_ids << 32) | chunk_of_token, return_counts=True)
+        self.posting_terms = pairs >> 32
+        self.posting_chunks = pairs & 0xFFFFFFFF
+        self.posting_counts = counts.astype(np.float64)
+        # Distinct terms with where their postings start; a term's document frequency is its posting count
+        self.terms, self.starts, self.frequencies = np.unique(self.posting_terms, return_index=True, return_counts=True)
+
+    @classmethod
+    def from_text(cls, text: str, chunk_chars: int) -> "DocumentIndex":
+        return cls(split_structured(text, chunk_chars))
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.lengths, self.posting_terms, self.posting_chunks, self.posting_counts, self.terms, self.starts, self.frequencies)
+        return sum(array.nbytes for array in arrays) + sum(len(chunk) for chunk in self.chunks)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every chunk for query"""
+        scores = np.zeros(len(self.chunks))
+        query_ids = np.unique(term_ids(tokenize(query)))
+        if not len(query_ids) or not len(self.terms):
+            return scores
+        positions = np.searchsorted(self.terms, query_ids)
+        positions = positions[positions < len(self.terms)]
+        positions = positions[np.isin(self.terms[positions], query_ids)]
+        if not len(positions):
+            return scores
+
+        postings = np.concatenate([
+            np.arange(self.starts[p], self.starts[p] + self.frequencies[p]) for p in positions
+        ])
+        frequencies = np.repeat(self.frequencies[positions], self.frequencies[positions])
+        idf = np.log(1 + (len(self.chunks) - frequencies + 0.5) / (frequencies + 0.5))
+        counts = self.posting_counts[postings]
+        chunks = self.posting_chunks[postings]
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[chunks] / self.average_length)
+        weights = idf * counts * (BM25_K1 + 1) / (counts + norm)
+        return np.bincount(chunks, weights=weights, minlength=len(self.chunks))
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Top k (chunk index, score) pairs with a positive score, best first"""
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores > 0)
+        best = matched[np.argsort(-scores[matched], kind="stable")][:k]
+        return [(int(index), float(scores[index])) for index in best]
+
+
+index_cache = ResultCache(
+    max_entries=settings.RETRIEVAL_INDEX_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RETRIEVAL_INDEX_CACHE_MB * 1024 * 1024,
+    sizeof=lambda index: index.nbytes
+)
+
+
+class IndexTasks:
+    tasks: Set[asyncio.Task] = set()
+
+index_tasks = IndexTasks()
+
+
+def _index_params() -> dict:
+    return {"chunk_chars": settings.RETRIEVAL_CHUNK_CHARS}
+
+
+async def _build(text: str) -> DocumentIndex:
+    return await run_in_thread(DocumentIndex.from_text, text, settings.RETRIEVAL_CHUNK_CHARS)
+
+
+async def get_document_index(content_hash: str) -> DocumentIndex:
+    """Index of a stored document's text, building it once if it is not cached"""
+    async def build() -> DocumentIndex:
+        text = await storage.get_text(content_hash)
+        if text is None:
+            raise ValueError(f"No text stored for {content_hash}")
+        return await _build(text)
+
+    return await index_cache.get_or_compute(content_hash, "retrieval", _index_params(), build)
+
+
+def index_document(content_hash: str, text: str):
+    """Build a newly uploaded document's index in the background"""
+    async def build():
+        try:
+            index = await index_cache.get_or_compute(content_hash, "retrieval", _index_params(), lambda: _build(text))
+            print(f"Indexed {content_hash[:12]} for retrieval: {len(index.chunks)} chunks")
+        except Exception as e:
+            # Retried on first use
+            print(f"Error indexing {content_hash[:12]}: {str(e)}")
+
+    task = asyncio.create_task(build())
+    index_tasks.tasks.add(task)
+    task.add_done_callback(index_tasks.tasks.discard)
+
+
+def forget_document_index(content_hash: str):
+    index_cache.forget(content_hash)
+
+
+async def retrieve(content_hash: str, query: str, k: Optional[int] = None) -> List[str]:
+    """
+    The document chunks most relevant to query
+
+    Returns:
+        Up to k (default RETRIEVAL_TOP_K) chunks in document order, so excerpts read naturally.
+        When no chunk matches the query (e.g. "what is this about?"), the opening chunks.
+    """
+    index = await get_document_index(content_hash)
+    k = k or settings.RETRIEVAL_TOP_K
+    hits = index.search(query, k)
+    if not hits:
+        return index.chunks[:k]
+    return [index.chunks[i] for i, _ in sorted(hits)]
@@ -0,0 +1,138 @@
+"""
+Single-pass rule-based text simplifier.
+
+The word-substitution lexicon is loaded once into a dict, so each word costs
+one lookup however many entries the lexicon has. One tokenizing scan of the
+text applies substitutions (keeping the original capitalization), breaks
+long sentences at commas and regroups sentences into short paragraphs,
+yielding each paragraph as soon as it is complete.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from core.config import settings
+
+DEFAULT_LEXICON_PATH = Path(__file__).parent.parent / "data" / "simplify_lexicon.json"
+
+TOKEN = re.compile(
+    r"(?P<word>[A-Za-z]+)"
+    r"|(?P<end>[.!?]+)"
+    r"|(?P<comma>,)"
+    r"|(?P<paragraph>\n[ \t]*\n\s*)"
+    r"|(?P<space>\s+)"
+    r"|(?P<other>[^\sA-Za-z.!?,]+)"
+)
+
+
+def match_case(word: str, replacement: str) -> str:
+    """Give replacement the capitalization of word"""
+    if word.isupper() and len(word) > 1:
+        return replacement.upper()
+    if word[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+def capitalize_first(text: str) -> str:
+    return text[0].upper() + text[1:] if text else text
+
+
+class Simplifier:
+    """
+    Args:
+        lexicon: Complex word -> simpler word or phrase (keys are matched case-insensitively)
+        max_sentence_chars: Longer sentences are broken into one sentence per comma-separated clause
+        max_paragraph_chars: Sentences are regrouped into paragraphs of about this length
+    """
+
+    def __init__(self, lexicon: Dict[str, str], max_sentence_chars: int = 100, max_paragraph_chars: int = 300):
+        self.lexicon = {word.lower(): simple for word, simple in lexicon.items()}
+        self.max_sentence_chars = max_sentence_chars
+        self.max_paragraph_chars = max_paragraph_chars
+        # Identifies the rules, so cached output is not reused after the lexicon changes
+        rules = json.dumps([self.lexicon, max_sentence_chars, max_paragraph_chars], sort_keys=True)
+        self.version = hashlib.sha1(rules.encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Simplifier":
+        """Load a lexicon: {"complex word": "simple word", ...}"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _sentences(self, clauses: List[str], punctuation: str) -> List[str]:
+        """Finish a sentence, breaking it at commas if it is too long"""
+        clauses = [clause.strip() for clause in clauses]
+        clauses = [clause for clause in clauses if clause]
+        if not clauses:
+            return []
+        sentence = ", ".join(clauses) + punctuation
+        if len(sentence) <= self.max_sentence_chars or len(clauses) == 1:
+            return [sentence]
+        return [clauses[0] + punctuation] + [capitalize_first(clause) + punctuation for clause in clauses[1:]]
+
+    def iter_paragraphs(self, text: str) -> Iterator[str]:
+        """Simplify text in one scan, yielding paragraphs as they are completed"""
+        lexicon = self.lexicon
+        paragraph: List[str] = []
+        paragraph_length = 0
+        clauses: List[str] = []
+        clause: List[str] = []
+
+        def add_sentences(punctuation: str) -> Iterator[str]:
+            nonlocal paragraph_length
+            for sentence in self._sentences(clauses + ["".join(clause)], punctuation):
+                if paragraph and paragraph_length + len(sentence) > self.max_paragraph_chars:
+                    yield " ".join(paragraph)
+                    paragraph.clear()
+                    paragraph_length = 0
+                paragraph.append(sentence)
+                paragraph_length += len(sentence) + 1
+            clauses.clear()
+            clause.clear()
+
+        for token in TOKEN.finditer(text):
+            kind = token.lastgroup
+            value = token.group()
+            if kind == "word":
+                replacement = lexicon.get(value.lower())
+                clause.append(match_case(value, replacement) if replacement is not None else value)
+            elif kind == "space":
+                clause.append(" ")
+            elif kind == "comma":
+                clauses.append("".join(clause))
+                clause.clear()
+            elif kind == "end":
+                yield from add_sentences(value)
+            elif kind == "paragraph":
+                # Keep the author's paragraph breaks; a sentence cut off by one ends there
+                yield from add_sentences("")
+                if paragraph:
+                    yield " ".join(paragraph)
+                    paragraph.clear()
+                    paragraph_length = 0
+            else:
+                clause.append(value)
+
+        yield from add_sentences("")
+        if paragraph:
+            yield " ".join(paragraph)
+
+    def simplify(self, text: str) -> str:
+        return "\n\n".join(self.iter_paragraphs(text))
+
+
+class Simplifiers:
+    default: Optional[Simplifier] = None
+
+simplifiers = Simplifiers()
+
+
+def get_simplifier() -> Simplifier:
+    """Get the simplifier for the configured lexicon, loading it on first use"""
+    if simplifiers.default is None:
+        path = Path(settings.SIMPLIFY_LEXICON_PATH) if settings.SIMPLIFY_LEXICON_PATH else DEFAULT_LEXICON_PATH
+        simplifiers.default = Simplifier.from_file(path)
+    return simplifiers.default
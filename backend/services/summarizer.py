@@ -0,0 +1,165 @@
+"""
+Extractive summarizer with vectorized TF-IDF sentence scoring.
+
+Sentences and terms are turned into a sparse sentence-term matrix held as
+flat NumPy arrays of (sentence, term, count) triples; every score is then a
+handful of np.bincount reductions over those arrays, so the cost is roughly
+linear in the length of the document. Each sentence is scored by the cosine
+similarity of its TF-IDF vector with the whole document's, i.e. how well it
+represents the document, with boosts for terms of the requested focus and
+for cue words like "important" or "conclusion".
+"""
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# After end punctuation followed by a space or (as PDF text often runs together) a capital; or a blank line
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])(?:\s+|(?=[A-Z]))|\n\s*\n")
+WORD = re.compile(r"[a-z][a-z'-]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your yours yourself yourselves
+may might must shall one two also however thus therefore within without upon via per etc
+""".split())
+
+CUE_WORDS = frozenset([
+    "important", "key", "main", "primary", "essential", "critical", "significant",
+    "result", "results", "finding", "findings", "conclusion", "summary", "conclude",
+])
+
+CUE_BOOST = 0.1  # Score multiplier added per cue word in a sentence (capped at 3)
+FOCUS_BOOST = 1.0  # Weight of the focus terms' share of a sentence's TF-IDF mass
+MIN_SENTENCE_CHARS = 20
+MAX_SENTENCE_CHARS = 400
+
+
+def _split_long(sentence: str) -> List[str]:
+    """Break an overlong "sentence" (usually PDF layout: headings, tables) at line breaks"""
+    pieces = []
+    current = ""
+    for line in sentence.split("\n"):
+        if current and len(current) + len(line) > MAX_SENTENCE_CHARS:
+            pieces.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, dropping fragments too short to summarize"""
+    sentences = []
+    for sentence in SENTENCE_SPLIT.split(text):
+        for piece in _split_long(sentence) if len(sentence) > MAX_SENTENCE_CHARS else [sentence]:
+            piece = " ".join(piece.split())
+            if len(piece) > MIN_SENTENCE_CHARS:
+                sentences.append(piece)
+    return sentences
+
+
+def _sentence_terms(sentences: List[str], vocabulary: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flat (sentence index, term id) arrays plus per-sentence cue word counts"""
+    sentence_ids: List[int] = []
+    term_ids: List[int] = []
+    cues = np.zeros(len(sentences))
+    for index, sentence in enumerate(sentences):
+        for word in WORD.findall(sentence.lower()):
+            if word in STOPWORDS:
+                continue
+            if word in CUE_WORDS:
+                cues[index] += 1
+            sentence_ids.append(index)
+            term_ids.append(vocabulary.setdefault(word, len(vocabulary)))
+    return np.asarray(sentence_ids, dtype=np.int64), np.asarray(term_ids, dtype=np.int64), cues
+
+
+def score_sentences(sentences: List[str], focus: Optional[str] = None) -> np.ndarray:
+    """TF-IDF centrality score of every sentence (higher is more representative)"""
+    vocabulary: dict = {}
+    sentence_ids, term_ids, cues = _sentence_terms(sentences, vocabulary)
+    n_sentences = len(sentences)
+    if not len(term_ids):
+        return np.zeros(n_sentences)
+    n_terms = len(vocabulary)
+
+    # Sparse sentence-term counts: one entry per distinct (sentence, term) pair
+    pairs, counts = np.unique(sentence_ids * n_terms + term_ids, return_counts=True)
+    pair_sentences = pairs // n_terms
+    pair_terms = pairs % n_terms
+
+    document_frequency = np.bincount(pair_terms, minlength=n_terms)
+    idf = np.log((1 + n_sentences) / (1 + document_frequency)) + 1
+    weights = (1 + np.log(counts)) * idf[pair_terms]
+
+    document_vector = np.bincount(pair_terms, weights=weights, minlength=n_terms)
+    sentence_norms = np.sqrt(np.bincount(pair_sentences, weights=weights ** 2, minlength=n_sentences))
+    dots = np.bincount(pair_sentences, weights=weights * document_vector[pair_terms], minlength=n_sentences)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.nan_to_num(dots / (sentence_norms * np.linalg.norm(document_vector)))
+
+    if focus:
+        focus_ids = [vocabulary[word] for word in WORD.findall(focus.lower()) if word in vocabulary]
+        if focus_ids:
+            in_focus = np.isin(pair_terms, focus_ids)
+            focus_mass = np.bincount(pair_sentences, weights=weights * in_focus, minlength=n_sentences)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores *= 1 + FOCUS_BOOST * np.nan_to_num(focus_mass / sentence_norms)
+
+    scores *= 1 + CUE_BOOST * np.minimum(cues, 3)
+    return scores
+
+
+def summarize(text: str, max_length: int = 200, focus: Optional[str] = None) -> str:
+    """
+    Extract the most representative sentences of text as bullet points
+
+    Args:
+        text: Text to summarize
+        max_length: Maximum summary length in words
+        focus: Optional topic; sentences about it are preferred
+
+    Returns:
+        Bullet-point summary, sentences in document order
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+        sentences = [p[:200] for p in paragraphs[:5]] or [text[:300]]
+        return "\n".join(f"• {sentence}" for sentence in sentences)
+
+    scores = score_sentences(sentences, focus)
+    chosen = []
+    seen = set()
+    words = 0
+    # Stable sort so ties keep document order
+    for index in np.argsort(-scores, kind="stable"):
+        # Repeated text (page headers, boilerplate, restatements) scores the same every time
+        key = " ".join(sentences[index].lower().split())
+        if key in seen:
+            continue
+        length = len(sentences[index].split())
+        if words + length > max_length:
+            if chosen:
+                continue
+            # Even the best sentence is too long: keep it, cut to the word budget
+            sentences[index] = " ".join(sentences[index].split()[:max_length]) + "..."
+            length = max_length
+        chosen.append(index)
+        seen.add(key)
+        words += length
+        if words >= max_length:
+            break
+
+    points = []
+    for index in sorted(chosen):
+        sentence = sentences[index]
+        points.append(f"• {sentence[0].upper()}{sentence[1:]}")
+    return "\n".join(points)
@@ -0,0 +1,122 @@
+"""
+Cache of generated summaries.
+
+Summaries are keyed by (document content hash, max_length, focus, model), so
+every parameter combination gets its own entry and documents with the same
+content share them. Entries live in a process-local LRU bounded by entry
+count and bytes, and when SUMMARY_CACHE_PERSIST is on they are also written
+to the storage backend, up to MAX_PERSISTED_VARIANTS per document, so they
+survive restarts and are shared between workers.
+"""
+import hashlib
+from typing import Optional, Tuple
+
+from core import storage
+from core.cache import LRUCache
+from core.config import settings
+
+# Parameter combinations kept in storage per document; the oldest is dropped
+MAX_PERSISTED_VARIANTS = 16
+# Rough per-entry overhead on top of the summary text (key, dict, metadata)
+ENTRY_OVERHEAD_BYTES = 256
+
+summary_cache = LRUCache(
+    max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+    max_bytes=settings.SUMMARY_CACHE_MAX_MB * 1024 * 1024,
+    sizeof=lambda entry: len(entry["summary"].encode("utf-8")) + ENTRY_OVERHEAD_BYTES,
+    group_of=lambda key: key[0]
+)
+
+
+class StoreCounters:
+    hits = 0
+    misses = 0
+
+store_counters = StoreCounters()
+
+
+def normalize_focus(focus: Optional[str]) -> Optional[str]:
+    """Treat focus strings that differ only in case or spacing as the same"""
+    if not focus or not focus.strip():
+        return None
+    return " ".join(focus.lower().split())
+
+
+def summary_model() -> str:
+    """Model the summary would be generated with"""
+    return settings.OPENAI_MODEL if settings.OPENAI_API_KEY else "extractive"
+
+
+def _variant(max_length: int, focus: Optional[str], model: str) -> str:
+    """Storage field name for one parameter combination (hashed, so any focus text is a safe key)"""
+    return hashlib.sha1(f"{max_length}|{focus or ''}|{model}".encode("utf-8")).hexdigest()[:16]
+
+
+def summary_cache_key(content_hash: str, max_length: int, focus: Optional[str], model: str) -> Tuple:
+    return (content_hash, max_length, normalize_focus(focus), model)
+
+
+async def get_cached_summary(content_hash: str, max_length: int, focus: Optional[str], model: str) -> Optional[dict]:
+    """
+    Look up a summary in memory, then in storage
+
+    Returns:
+        {"summary", "max_length", "focus", "model", "created_at"} or None
+    """
+    key = summary_cache_key(content_hash, max_length, focus, model)
+    entry = summary_cache.get(key)
+    if entry is not None or not settings.SUMMARY_CACHE_PERSIST:
+        return entry
+
+    record = await storage.get_summary(content_hash)
+    entry = (record or {}).get("variants", {}).get(_variant(*key[1:]))
+    if entry is None:
+        store_counters.misses += 1
+        return None
+    store_counters.hits += 1
+    summary_cache.set(key, entry)
+    return entry
+
+
+async def cache_summary(
+    content_hash: str,
+    max_length: int,
+    focus: Optional[str],
+    model: str,
+    summary: str,
+    created_at
+) -> dict:
+    """Store a summary in memory and, if enabled, in storage"""
+    key = summary_cache_key(content_hash, max_length, focus, model)
+    entry = {
+        "summary": summary,
+        "max_length": max_length,
+        "focus": key[2],
+        "model": model,
+        "created_at": created_at
+    }
+    summary_cache.set(key, entry)
+
+    if settings.SUMMARY_CACHE_PERSIST:
+        record = await storage.get_summary(content_hash) or {}
+        variants = record.get("variants", {})
+        variants.pop(_variant(*key[1:]), None)
+        variants[_variant(*key[1:])] = entry
+        # Dicts keep insertion order, so the first variants are the oldest
+        while len(variants) > MAX_PERSISTED_VARIANTS:
+            variants.pop(next(iter(variants)))
+        await storage.save_summary(content_hash, {"variants": variants})
+    return entry
+
+
+def forget_summaries(content_hash: str) -> int:
+    """Drop a document's summaries from memory (storage drops them with the blob)"""
+    return summary_cache.delete_group(content_hash)
+
+
+def summary_cache_stats() -> dict:
+    stats = summary_cache.stats()
+    if settings.SUMMARY_CACHE_PERSIST:
+        stats["store_hits"] = store_counters.hits
+        stats["store_misses"] = store_counters.misses
+    return stats
@@ -0,0 +1,198 @@
+"""
+Text-to-speech engines.
+
+Each engine turns one chunk of text into audio bytes with a blocking
+synthesize() call, which tts_service runs on the worker thread pool under
+the engine's own concurrency limit. Engines:
+- gtts: Google Translate TTS (MP3, needs network access)
+- espeak: local espeak-ng/espeak subprocess (WAV, offline, scales with cores)
+- stub: pure-Python tone generator (WAV, offline, deterministic; for tests)
+"""
+import array
+from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+import io
+import logging
+import math
+import os
+import shutil
+import subprocess
+import wave
+from typing import AsyncIterator, List, Optional
+
+from core.config import settings
+from core.executors import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+
+class TTSEngine(ABC):
+    """Base engine producing MP3-style audio whose chunks can be concatenated"""
+
+    name = "base"
+    extension = ".mp3"
+    media_type = "audio/mpeg"
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @abstractmethod
+    def synthesize(self, text: str, language: str, slow: bool, voice_type: Optional[str]) -> bytes:
+        """Synthesize one chunk of text (blocking)"""
+
+    async def synthesize_async(self, text: str, language: str, slow: bool, voice_type: Optional[str]) -> bytes:
+        async with self.semaphore:
+            return await run_in_thread(self.synthesize, text, language, slow, voice_type)
+
+    def join(self, parts: List[bytes]) -> bytes:
+        """Combine chunk audio into one file"""
+        return b"".join(parts)
+
+    async def stream(self, parts: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Turn chunk audio into a playable byte stream"""
+        async for part in parts:
+            yield part
+
+    def estimate_duration(self, size: int) -> float:
+        # Rough estimate: ~16KB per second for MP3
+        return size / 16000
+
+
+class WavEngine(TTSEngine):
+    """Engine producing 16-bit mono PCM WAV chunks"""
+
+    extension = ".wav"
+    media_type = "audio/wav"
+    sample_rate = 22050
+
+    def join(self, parts: List[bytes]) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(self.sample_rate)
+            for part in parts:
+                out.writeframes(_wav_frames(part))
+        return buffer.getvalue()
+
+    async def stream(self, parts: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        # WAV chunks can't be concatenated, so send one header with an open-ended length
+        header = _streaming_wav_header(self.sample_rate)
+        async for part in parts:
+            yield header + _wav_frames(part)
+            header = b""
+
+    def estimate_duration(self, size: int) -> float:
+        return max(0, size - 44) / (self.sample_rate * 2)
+
+
+def _wav_frames(data: bytes) -> bytes:
+    with wave.open(io.BytesIO(data), "rb") as reader:
+        return reader.readframes(reader.getnframes())
+
+
+def _streaming_wav_header(sample_rate: int) -> bytes:
+    """44-byte WAV header with maximal sizes, as used for live PCM streams"""
+    size = 0xFFFFFFFF
+    return b"".join([
+        b"RIFF", size.to_bytes(4, "little"), b"WAVE",
+        b"fmt ", (16).to_bytes(4, "little"), (1).to_bytes(2, "little"), (1).to_bytes(2, "little"),
+        sample_rate.to_bytes(4, "little"), (sample_rate * 2).to_bytes(4, "little"),
+        (2).to_bytes(2, "little"), (16).to_bytes(2, "little"),
+        b"data", (size - 36).to_bytes(4, "little"),
+    ])
+
+
+class GTTSEngine(TTSEngine):
+    name = "gtts"
+
+    def synthesize(self, text: str, language: str, slow: bool, voice_type: Optional[str]) -> bytes:
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=language, slow=slow).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakEngine(WavEngine):
+    """Offline synthesis with the espeak-ng (or espeak) command line tool"""
+
+    name = "espeak"
+    # espeak's native output rate
+    sample_rate = 22050
+
+    def __init__(self, max_concurrency: int, binary: Optional[str] = None):
+        super().__init__(max_concurrency)
+        self.binary = binary or shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.binary is None:
+            raise RuntimeError("espeak-ng/espeak not found on PATH")
+
+    def synthesize(self, text: str, language: str, slow: bool, voice_type: Optional[str]) -> bytes:
+        voice = language
+        if voice_type == "male":
+            voice += "+m3"
+        elif voice_type == "female":
+            voice += "+f3"
+        result = subprocess.run(
+            [self.binary, "--stdout", "-v", voice, "-s", "120" if slow else "170"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=120
+        )
+        if result.returncode != 0 or not result.stdout:
+            message = result.stderr.decode("utf-8", "replace").strip()
+            raise ValueError(f"espeak failed for language '{language}': {message}")
+        return result.stdout
+
+
+class StubEngine(WavEngine):
+    """Deterministic tones, one per word; no network or native dependencies"""
+
+    name = "stub"
+    sample_rate = 8000
+
+    def synthesize(self, text: str, language: str, slow: bool, voice_type: Optional[str]) -> bytes:
+        word_seconds = 0.3 if slow else 0.15
+        tone = int(self.sample_rate * word_seconds)
+        gap = tone // 3
+        samples = array.array("h")
+        for word in text.split():
+            seed = hashlib.md5(word.lower().encode()).digest()[0]
+            step = 2 * math.pi * (220 + seed * 2) / self.sample_rate
+            samples.extend(int(8000 * math.sin(step * i)) for i in range(tone))
+            samples.extend([0] * gap)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(self.sample_rate)
+            out.writeframes(samples.tobytes())
+        return buffer.getvalue()
+
+
+class Engines:
+    engine: Optional[TTSEngine] = None
+
+engines = Engines()
+
+
+def create_engine(name: str) -> TTSEngine:
+    """Build the engine called name, falling back to gTTS if it can't run here"""
+    name = name.lower()
+    if name == "espeak":
+        try:
+            return EspeakEngine(settings.ESPEAK_MAX_CONCURRENCY)
+        except RuntimeError as e:
+            logger.warning(f"{e}, falling back to gTTS")
+    elif name == "stub":
+        return StubEngine(os.cpu_count() or 1)
+    return GTTSEngine(settings.TTS_MAX_CONCURRENCY)
+
+
+def get_tts_engine() -> TTSEngine:
+    """Get the configured engine, creating it on first use"""
+    if engines.engine is None:
+        engines.engine = create_engine(settings.TTS_ENGINE)
+        logger.info(f"TTS engine: {engines.engine.name}")
+    return engines.engine
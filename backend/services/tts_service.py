@@ -1,26 +1,122 @@
 import os
-import uuid
+import re
+import asyncio
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, List, Optional
 from fastapi import HTTPException, status
-from gtts import gTTS
-import tempfile
-from datetime import datetime
+from core.config import settings
+from core.executors import run_in_thread
+from core.singleflight import SingleFlight
+from services.audio_cache import audio_cache, audio_cache_key
+from services.tts_engines import TTSEngine, get_tts_engine
 
 # Create a directory for storing TTS audio files - use absolute path
-AUDIO_DIR = Path(__file__).parent.parent / "static" / "audio"
+AUDIO_DIR = audio_cache.directory
 AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 
-# Clean up old files (older than 1 hour) - simple cleanup strategy
-def cleanup_old_files():
-    """Remove audio files older than 1 hour"""
+SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+|\n\s*\n")
+
+# Syntheses in progress, so identical concurrent requests share one
+_inflight = SingleFlight()
+
+def split_sentences(text: str, max_chars: int = settings.TTS_CHUNK_CHARS) -> List[str]:
+    """
+    Split text into chunks of whole sentences, each at most max_chars long
+    
+    Sentences longer than max_chars are split at the last space that fits.
+    """
+    chunks = []
+    current = ""
+    for sentence in SENTENCE_END.split(text):
+        sentence = " ".join(sentence.split())
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def synthesize_stream(
+    engine: TTSEngine,
+    text: str,
+    language: str,
+    slow: bool,
+    voice_type: Optional[str]
+) -> AsyncIterator[bytes]:
+    """
+    Synthesize sentence chunks concurrently and yield each chunk's audio in order
+    
+    Concurrency is bounded by the engine's own limit. Pending chunks are
+    cancelled if the consumer stops early.
+    """
+    chunks = split_sentences(text)
+    if not chunks:
+        raise ValueError("No text to synthesize")
+    tasks = [
+        asyncio.ensure_future(engine.synthesize_async(chunk, language, slow, voice_type))
+        for chunk in chunks
+    ]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def _write_file(data: bytes, filepath: Path):
+    """Write the audio into a temp file, then move it into place atomically"""
+    fd, tmp_name = tempfile.mkstemp(dir=AUDIO_DIR, suffix=".part")
     try:
-        current_time = datetime.now().timestamp()
-        for file_path in AUDIO_DIR.glob("*.mp3"):
-            if current_time - file_path.stat().st_mtime > 3600:  # 1 hour
-                file_path.unlink()
-    except Exception:
-        pass  # Silently fail on cleanup errors
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, filepath)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+async def store_audio(engine: TTSEngine, filename: str, parts: List[bytes]) -> Path:
+    """Join chunk audio and save it into the cache"""
+    filepath = AUDIO_DIR / filename
+    await run_in_thread(_write_file, engine.join(parts), filepath)
+    # Quota is enforced by the background janitor, not here
+    audio_cache.add(filename)
+    return filepath
+
+def audio_filename(engine: TTSEngine, text: str, language: str, slow: bool, voice_type: Optional[str]) -> str:
+    return f"{audio_cache_key(engine.name, text, language, slow, voice_type)}{engine.extension}"
+
+async def _get_or_synthesize(
+    engine: TTSEngine,
+    text: str,
+    language: str,
+    slow: bool,
+    voice_type: Optional[str]
+) -> Path:
+    """Return the cached audio file for these parameters, synthesizing it on a miss"""
+    filename = audio_filename(engine, text, language, slow, voice_type)
+    filepath = audio_cache.lookup(filename)
+    if filepath is not None:
+        return filepath
+    
+    async def synthesize() -> Path:
+        parts = [part async for part in synthesize_stream(engine, text, language, slow, voice_type)]
+        return await store_audio(engine, filename, parts)
+    
+    return await _inflight.do(filename, synthesize)
 
 async def generate_speech(
     text: str,
@@ -29,32 +125,26 @@ async def generate_speech(
     voice_type: Optional[str] = None
 ) -> dict:
     """
-    Generate speech from text using gTTS
+    Generate speech from text with the configured TTS engine
     
     Args:
         text: Text to convert to speech
         language: Language code (e.g., 'en', 'es', 'fr')
         slow: Whether to speak slowly
-        voice_type: Voice type preference (currently not used with gTTS)
+        voice_type: Voice type preference (ignored by engines without voices, e.g. gTTS)
     
     Returns:
         Dictionary with audio_url, text, language, and duration_seconds
     """
     try:
-        # Clean up old files
-        cleanup_old_files()
-        
-        # Generate unique filename
-        filename = f"{uuid.uuid4().hex}.mp3"
-        filepath = AUDIO_DIR / filename
-        
-        # Generate speech using gTTS
-        tts = gTTS(text=text, lang=language, slow=slow)
-        tts.save(str(filepath))
+        engine = get_tts_engine()
+        # Identical (engine, text, language, slow, voice_type) requests reuse the same file
+        filepath = await _get_or_synthesize(engine, text, language, slow, voice_type)
+        filename = filepath.name
         
-        # Get file size to estimate duration (rough estimate: ~16KB per second for MP3)
+        # Get file size to estimate duration
         file_size = filepath.stat().st_size
-        estimated_duration = file_size / 16000  # Rough estimate
+        estimated_duration = engine.estimate_duration(file_size)
         
         # Return the URL path (relative to static files)
         audio_url = f"/static/audio/{filename}"
@@ -88,11 +178,48 @@ async def delete_audio_file(filename: str) -> bool:
         True if deleted, False otherwise
     """
     try:
-        filepath = AUDIO_DIR / filename
-        if filepath.exists():
-            filepath.unlink()
-            return True
-        return False
+        return audio_cache.remove(filename)
     except Exception:
         return False
 
+async def stream_speech(
+    text: str,
+    language: str = "en",
+    slow: bool = False,
+    voice_type: Optional[str] = None
+) -> AsyncIterator[bytes]:
+    """
+    Stream speech for text of any length, first sentences first
+    
+    Serves the cached file when there is one; otherwise streams chunks as they
+    are synthesized and caches the complete audio once the stream finishes.
+    The media type is get_tts_engine().media_type.
+    """
+    engine = get_tts_engine()
+    filename = audio_filename(engine, text, language, slow, voice_type)
+    filepath = audio_cache.lookup(filename)
+    if filepath is not None:
+        with open(filepath, "rb") as f:
+            while True:
+                data = await run_in_thread(f.read, 64 * 1024)
+                if not data:
+                    break
+                yield data
+        return
+    
+    parts = []
+    synthesis = synthesize_stream(engine, text, language, slow, voice_type)
+    
+    async def collect():
+        async for part in synthesis:
+            parts.append(part)
+            yield part
+    
+    try:
+        async for data in engine.stream(collect()):
+            yield data
+    finally:
+        # Cancels pending chunks if the consumer stopped early
+        await synthesis.aclose()
+    if filename not in _inflight:
+        await store_audio(engine, filename, parts)
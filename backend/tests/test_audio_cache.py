@@ -0,0 +1,68 @@
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from services.audio_cache import AudioCache, audio_cache
+
+
+def _cache(tmp_path, max_bytes=1000, max_age=3600) -> AudioCache:
+    return AudioCache(directory=tmp_path, max_bytes=max_bytes, max_age=max_age)
+
+
+def _write(cache: AudioCache, filename: str, size: int, last_access: float):
+    (cache.directory / filename).write_bytes(b"\0" * size)
+    cache.add(filename)
+    cache.index[filename] = (size, last_access)
+
+
+def test_quota_evicts_least_recently_used_first(tmp_path):
+    cache = _cache(tmp_path, max_bytes=1000)
+    now = time.time()
+    _write(cache, "a.mp3", 400, now - 30)
+    _write(cache, "b.mp3", 400, now - 20)
+    _write(cache, "c.mp3", 400, now - 10)
+    assert cache.lookup("a.mp3") is not None
+    assert cache.evict() == ["b.mp3"]
+    assert list(cache.index) == ["c.mp3", "a.mp3"]
+    assert cache.total_bytes == 800
+
+
+def test_files_unused_for_max_age_are_evicted(tmp_path):
+    cache = _cache(tmp_path, max_age=60)
+    _write(cache, "old.wav", 10, time.time() - 120)
+    _write(cache, "new.wav", 10, time.time())
+    assert cache.evict() == ["old.wav"]
+
+
+def test_touch_keeps_played_files_from_looking_idle(tmp_path):
+    cache = _cache(tmp_path, max_age=60)
+    _write(cache, "played.mp3", 10, time.time() - 120)
+    assert cache.touch("played.mp3")
+    assert not cache.touch("missing.mp3")
+    assert cache.evict() == []
+
+
+def test_lookup_misses_when_the_file_is_gone(tmp_path):
+    cache = _cache(tmp_path)
+    _write(cache, "gone.mp3", 10, time.time())
+    (tmp_path / "gone.mp3").unlink()
+    assert cache.lookup("gone.mp3") is None
+    assert "gone.mp3" not in cache.index and cache.total_bytes == 0
+
+
+def test_serving_audio_refreshes_its_last_access():
+    import main
+
+    client = TestClient(main.app)
+    filename = f"{uuid.uuid4().hex}.mp3"
+    filepath = audio_cache.directory / filename
+    filepath.write_bytes(b"\0" * 16)
+    try:
+        for url in (f"/tts/audio/{filename}", f"/static/audio/{filename}"):
+            audio_cache.add(filename)
+            audio_cache.index[filename] = (16, time.time() - 3600)
+            assert client.get(url).status_code == 200
+            assert audio_cache.index[filename][1] > time.time() - 60
+    finally:
+        audio_cache.remove(filename)
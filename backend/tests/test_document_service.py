@@ -0,0 +1,65 @@
+import asyncio
+import io
+import uuid
+from pathlib import Path
+
+from fastapi import UploadFile
+
+from core import storage
+from services import document_service
+
+
+def _upload(content: bytes):
+    return document_service.upload_document(UploadFile(io.BytesIO(content), filename="notes.txt"))
+
+
+def _content() -> bytes:
+    return f"Study notes {uuid.uuid4()}. Plants turn light into chemical energy.".encode()
+
+
+def test_identical_uploads_share_one_blob_until_the_last_delete():
+    async def run():
+        content = _content()
+        first = await _upload(content)
+        second = await _upload(content)
+        document = await storage.get_document(first["document_id"])
+        blob = await storage.get_blob(document["content_hash"])
+        assert (await storage.get_document(second["document_id"]))["filepath"] == document["filepath"]
+        assert blob["ref_count"] == 2
+
+        assert await document_service.delete_document(first["document_id"])
+        assert Path(document["filepath"]).exists()
+        assert (await storage.get_blob(document["content_hash"]))["ref_count"] == 1
+
+        assert await document_service.delete_document(second["document_id"])
+        assert not Path(document["filepath"]).exists()
+        assert await storage.get_blob(document["content_hash"]) is None
+        assert await storage.get_text(document["content_hash"]) is None
+    asyncio.run(run())
+
+
+def test_upload_racing_the_last_delete_keeps_its_file(monkeypatch):
+    async def run():
+        content = _content()
+        uploaded = await _upload(content)
+        racing = []
+        delete_blob = storage.delete_blob
+
+        async def delete_blob_then_upload(content_hash):
+            deleted = await delete_blob(content_hash)
+            # The same bytes arrive after the record is gone but before the file is unlinked
+            racing.append(asyncio.create_task(_upload(content)))
+            await asyncio.sleep(0.2)
+            return deleted
+
+        monkeypatch.setattr(storage, "delete_blob", delete_blob_then_upload)
+        assert await document_service.delete_document(uploaded["document_id"])
+        monkeypatch.setattr(storage, "delete_blob", delete_blob)
+
+        document_id = (await racing[0])["document_id"]
+        document = await storage.get_document(document_id)
+        assert Path(document["filepath"]).exists()
+        assert (await storage.get_blob(document["content_hash"]))["ref_count"] == 1
+        assert await document_service.delete_document(document_id)
+        assert not Path(document["filepath"]).exists()
+    asyncio.run(run())
@@ -0,0 +1,18 @@
+from services.intent_router import Intent, IntentRouter, get_intent_router
+
+
+def _score(router: IntentRouter, message: str, name: str) -> float:
+    return dict((intent.name, score) for intent, score in router.scores(message)).get(name, 0.0)
+
+
+def test_phrase_keyword_does_not_mask_its_words():
+    router = get_intent_router()
+    single = _score(router, "I get distracted in class", "focus")
+    phrase = _score(router, "I get easily distracted in class", "focus")
+    assert single > 0
+    assert phrase >= single
+
+
+def test_prefix_phrase_counts_both_keywords():
+    router = IntentRouter([Intent("notes", "notes", {"key": 1, "key points": 2}, "Notes")], "default")
+    assert _score(router, "what are the key points?", "notes") == 3
@@ -0,0 +1,34 @@
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+
+def test_jobs_need_their_access_token():
+    import main
+
+    with TestClient(main.app) as client:
+        content = f"Notes {uuid.uuid4()}. Plants turn light into chemical energy in their leaves.".encode()
+        uploaded = client.post("/documents/upload", files={"file": ("notes.txt", content, "text/plain")}).json()
+        submitted = client.post("/jobs/summarize", json={"document_id": uploaded["document_id"], "max_length": 50})
+        assert submitted.status_code == 202
+        job = submitted.json()
+        token = job["access_token"]
+        assert job["events_url"].endswith(f"?access_token={token}")
+
+        # Same client address, but without the token the job does not exist for it
+        assert client.get(job["status_url"]).status_code == 404
+        assert client.get(job["status_url"], headers={"X-Job-Token": "guess"}).status_code == 404
+        assert client.post(f"{job['status_url']}/cancel").status_code == 404
+
+        for _ in range(100):
+            status = client.get(job["status_url"], headers={"X-Job-Token": token}).json()
+            if status["status"] == "succeeded":
+                break
+            time.sleep(0.05)
+        assert status["status"] == "succeeded"
+
+        events = client.get(job["events_url"])
+        assert events.status_code == 200 and '"status": "succeeded"' in events.text
+        assert client.delete(f"{job['status_url']}?access_token={token}").status_code == 204
+        client.delete(f"/documents/{uploaded['document_id']}")
@@ -0,0 +1,93 @@
+import asyncio
+import io
+import uuid
+
+import pytest
+from fastapi import UploadFile
+
+from core import storage
+from services import document_service
+from services.result_cache import ResultCache, result_cache
+
+
+def test_key_ignores_parameter_order_but_not_operation():
+    assert ResultCache.key("h", "simplify", {"a": 1, "b": 2}) == ResultCache.key("h", "simplify", {"b": 2, "a": 1})
+    assert ResultCache.key("h", "simplify", {"a": 1}) != ResultCache.key("h", "highlight", {"a": 1})
+    assert ResultCache.key("h", "simplify") == ResultCache.key("h", "simplify", {})
+
+
+def test_concurrent_callers_share_one_computation():
+    cache = ResultCache(max_entries=10, max_bytes=1 << 20)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "simplified"
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute("h", "simplify", None, compute) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["simplified"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+    assert asyncio.run(run()) == ["simplified"] * 5
+    assert len(calls) == 1
+
+
+def test_failures_are_shared_but_not_cached():
+    cache = ResultCache(max_entries=10, max_bytes=1 << 20)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise ValueError("LLM unavailable")
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_compute("h", "quiz", None, compute) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(run()))
+    assert len(calls) == 1
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get_or_compute("h", "quiz", None, compute))
+    assert len(calls) == 2
+
+
+def test_waiter_computes_when_the_leading_caller_is_cancelled():
+    cache = ResultCache(max_entries=10, max_bytes=1 << 20)
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "highlighted"
+
+    async def run():
+        leader = asyncio.create_task(cache.get_or_compute("h", "highlight", None, compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("h", "highlight", None, compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(run()) == "highlighted"
+
+
+def test_deleting_the_last_document_drops_its_results():
+    async def compute():
+        return "simplified"
+
+    async def run():
+        content = f"Notes {uuid.uuid4()}. Plants turn light into chemical energy.".encode()
+        uploaded = await document_service.upload_document(UploadFile(io.BytesIO(content), filename="notes.txt"))
+        content_hash = (await storage.get_document(uploaded["document_id"]))["content_hash"]
+        for operation in ("simplify", "highlight", "quiz"):
+            await result_cache.get_or_compute(content_hash, operation, {"level": 1}, compute)
+        assert len(result_cache.cache.groups[content_hash]) == 3
+
+        assert await document_service.delete_document(uploaded["document_id"])
+        assert content_hash not in result_cache.cache.groups
+        assert not any(key[0] == content_hash for key in result_cache.cache.entries)
+    asyncio.run(run())
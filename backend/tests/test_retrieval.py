@@ -0,0 +1,32 @@
+import asyncio
+
+from core import storage
+from services.retrieval import retrieve
+
+# Paragraphs long enough to land in separate chunks
+TEXT = "\n\n".join(" ".join([sentence] * 12) for sentence in [
+    "Photosynthesis is how plants turn light into chemical energy.",
+    "Chlorophyll in the leaves absorbs mostly red and blue light.",
+    "The Calvin cycle fixes carbon dioxide into sugars.",
+    "Animals depend on plants for the oxygen they breathe.",
+    "Deforestation reduces how much carbon forests can store.",
+    "Gardeners prune branches in late winter.",
+])
+
+
+def _retrieve(content_hash: str, query: str, k: int):
+    async def run():
+        await storage.save_blob(content_hash, {"ref_count": 1}, TEXT)
+        return await retrieve(content_hash, query, k)
+    return asyncio.run(run())
+
+
+def test_matching_query_returns_relevant_chunks():
+    excerpts = _retrieve("retrieval-match", "chlorophyll in leaves", 1)
+    assert len(excerpts) == 1 and "Chlorophyll" in excerpts[0]
+
+
+def test_query_without_matching_terms_falls_back_to_opening_chunks():
+    excerpts = _retrieve("retrieval-generic", "what is this about?", 2)
+    assert excerpts
+    assert excerpts[0].startswith("Photosynthesis")
@@ -0,0 +1,30 @@
+from services.summarizer import split_sentences, summarize
+
+HEADER = "Chapter 3: Photosynthesis and the light reactions in plants."
+
+TEXT = " ".join([
+    HEADER,
+    "Plants turn light into chemical energy in their leaves.",
+    HEADER,
+    "Chlorophyll absorbs mostly red and blue light in the leaves.",
+    HEADER,
+    "The Calvin cycle fixes carbon dioxide into sugars for the plant.",
+    HEADER.upper(),
+    "Gardeners often prune branches in late winter.",
+    HEADER,
+])
+
+
+def test_repeated_sentences_appear_once():
+    bullets = summarize(TEXT, max_length=200).split("\n")
+    keys = [" ".join(bullet.lower().split()) for bullet in bullets]
+    assert len(keys) == len(set(keys))
+    assert sum("chapter 3" in key for key in keys) == 1
+
+
+def test_summary_fits_word_budget_in_document_order():
+    sentences = split_sentences(TEXT)
+    bullets = [bullet[2:] for bullet in summarize(TEXT, max_length=25).split("\n")]
+    assert sum(len(bullet.split()) for bullet in bullets) <= 25
+    positions = [next(i for i, s in enumerate(sentences) if s.lower() == b.lower()) for b in bullets]
+    assert positions == sorted(positions)
@@ -0,0 +1,37 @@
+import asyncio
+import io
+import uuid
+from datetime import datetime
+
+from fastapi import UploadFile
+
+from core import storage
+from services import document_service
+from services.summary_cache import cache_summary, get_cached_summary, summary_cache
+
+
+def test_focus_differing_in_case_and_spacing_shares_an_entry():
+    async def run():
+        content_hash = f"summary-focus-{uuid.uuid4()}"
+        await cache_summary(content_hash, 200, "  Cell   Biology ", "extractive", "• Cells.", datetime.utcnow())
+        cached = await get_cached_summary(content_hash, 200, "cell biology", "extractive")
+        assert cached["summary"] == "• Cells."
+        assert await get_cached_summary(content_hash, 300, "cell biology", "extractive") is None
+        assert await get_cached_summary(content_hash, 200, "cell biology", "gpt-4o-mini") is None
+    asyncio.run(run())
+
+
+def test_deleting_the_last_document_drops_its_summaries_from_memory():
+    async def run():
+        content = f"Notes {uuid.uuid4()}. Plants turn light into chemical energy.".encode()
+        uploaded = await document_service.upload_document(UploadFile(io.BytesIO(content), filename="notes.txt"))
+        content_hash = (await storage.get_document(uploaded["document_id"]))["content_hash"]
+        for max_length in (100, 200):
+            await cache_summary(content_hash, max_length, None, "extractive", "• Plants.", datetime.utcnow())
+        assert content_hash in summary_cache.groups
+
+        assert await document_service.delete_document(uploaded["document_id"])
+        assert content_hash not in summary_cache.groups
+        assert not any(key[0] == content_hash for key in summary_cache.entries)
+        assert await get_cached_summary(content_hash, 100, None, "extractive") is None
+    asyncio.run(run())
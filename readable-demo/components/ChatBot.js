@@ -1,6 +1,8 @@
 import { useState, useRef, useEffect } from "react";
+import { useRouter } from "next/router";
 
 export default function ChatBot() {
+  const router = useRouter();
   const [isOpen, setIsOpen] = useState(false);
   const [messages, setMessages] = useState([
     {
@@ -10,6 +12,8 @@ export default function ChatBot() {
   ]);
   const [inputMessage, setInputMessage] = useState("");
   const [isLoading, setIsLoading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
+  const [sessionId, setSessionId] = useState(null);
   const messagesEndRef = useRef(null);
   const chatContainerRef = useRef(null);
 
@@ -33,36 +37,71 @@ export default function ChatBot() {
     setIsLoading(true);
 
     try {
-      // Prepare conversation history
-      const conversationHistory = [...messages, newUserMessage].map((msg) => ({
-        role: msg.role,
-        content: msg.content,
-      }));
-
-      // Call backend API
+      // Call backend API; the reply is streamed as Server-Sent Events
       const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8001";
-      const response = await fetch(`${API_BASE_URL}/chatbot/chat`, {
+      const response = await fetch(`${API_BASE_URL}/chatbot/stream`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
         },
+        // Earlier turns are kept in the server-side session
         body: JSON.stringify({
           message: userMessage,
-          conversation_history: conversationHistory.slice(0, -1), // Exclude the current message
+          session_id: sessionId,
+          // On the uploads page, answer from the uploaded document
+          document_id: router.pathname === "/uploads" ? sessionStorage.getItem("chatDocumentId") : null,
         }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error("Failed to get response");
       }
 
-      const data = await response.json();
-      
-      // Add assistant response
-      setMessages((prev) => [
-        ...prev,
-        { role: "assistant", content: data.response },
-      ]);
+      // Show tokens as they arrive instead of waiting for the whole reply
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let reply = "";
+      let started = false;
+
+      const showReply = (content) => {
+        if (!started) {
+          started = true;
+          setIsStreaming(true);
+          setMessages((prev) => [...prev, { role: "assistant", content }]);
+        } else {
+          setMessages((prev) => [...prev.slice(0, -1), { role: "assistant", content }]);
+        }
+      };
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        const events = buffer.split("\n\n");
+        buffer = events.pop();
+        for (const event of events) {
+          const dataLine = event.split("\n").find((line) => line.startsWith("data: "));
+          if (!dataLine) continue;
+          const data = JSON.parse(dataLine.slice(6));
+          if (data.type === "token") {
+            reply += data.content;
+            showReply(reply);
+          } else if (data.type === "done") {
+            reply = data.response;
+            setSessionId(data.session_id);
+            showReply(reply);
+          } else if (data.type === "error") {
+            showReply(reply ? `${reply}\n\n${data.detail}` : data.detail);
+          }
+        }
+      }
+
+      if (!started) {
+        throw new Error("Empty response");
+      }
     } catch (error) {
       console.error("Error sending message:", error);
       setMessages((prev) => [
@@ -74,6 +113,7 @@ export default function ChatBot() {
       ]);
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
 
@@ -85,6 +125,11 @@ export default function ChatBot() {
   };
 
   const clearChat = () => {
+    if (sessionId) {
+      const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8001";
+      fetch(`${API_BASE_URL}/chatbot/sessions/${sessionId}`, { method: "DELETE" }).catch(() => {});
+      setSessionId(null);
+    }
     setMessages([
       {
         role: "assistant",
@@ -275,7 +320,7 @@ export default function ChatBot() {
                 </div>
               </div>
             ))}
-            {isLoading && (
+            {isLoading && !isStreaming && (
               <div
                 style={{
                   display: "flex",
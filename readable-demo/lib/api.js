@@ -82,6 +82,33 @@ export async function getErrorMessage(response) {
   }
 }
 
+/**
+ * Wait for a background job to finish, following its status as Server-Sent Events
+ * @param {object} job - Response of a /jobs/* submission; its events_url carries the job's access token
+ * @returns {Promise<object>} The job's result (the body the synchronous endpoint returns)
+ */
+export function waitForJob(job) {
+  return new Promise((resolve, reject) => {
+    const events = new EventSource(`${API_BASE_URL}${job.events_url}`);
+    events.addEventListener("status", (event) => {
+      const job = JSON.parse(event.data);
+      if (job.status === "succeeded") {
+        events.close();
+        resolve(job.result);
+      } else if (job.status === "failed" || job.status === "cancelled") {
+        events.close();
+        reject(new Error(job.error || `Job ${job.status}`));
+      }
+    });
+    events.onerror = () => {
+      // The stream also closes after the final event; only a failure before it matters
+      if (events.readyState === EventSource.CLOSED) {
+        reject(new Error("Lost connection while waiting for the job"));
+      }
+    };
+  });
+}
+
 /**
  * Store authentication token
  * @param {string} token - Access token
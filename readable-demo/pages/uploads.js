@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from "react";
 import { useRouter } from "next/router";
-import { API_BASE_URL } from "../lib/api";
+import { API_BASE_URL, waitForJob } from "../lib/api";
 
 export default function Uploads() {
   const router = useRouter();
@@ -433,6 +433,8 @@ export default function Uploads() {
       const data = await response.json();
       console.log("Upload successful:", data);
       setDocumentId(data.document_id);
+      // Lets the chat assistant answer questions about this document
+      sessionStorage.setItem("chatDocumentId", data.document_id);
       if (data.text_preview) {
         setFilePreview((prev) => ({
           ...prev,
@@ -482,7 +484,7 @@ export default function Uploads() {
         accessibility_settings: accessibilitySettings,
       });
 
-      const response = await fetch(`${API_BASE_URL}/documents/process`, {
+      const response = await fetch(`${API_BASE_URL}/jobs/process`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -508,7 +510,8 @@ export default function Uploads() {
         throw new Error(errorMessage);
       }
 
-      const result = await response.json();
+      // Processing runs as a background job; wait for its result
+      const result = await waitForJob(await response.json());
       console.log("Processing result:", result);
       setProcessingResult(result);
       
@@ -598,7 +601,7 @@ export default function Uploads() {
       setQuizSubmitted(false);
 
     try {
-      const response = await fetch(`${API_BASE_URL}/quiz/generate`, {
+      const response = await fetch(`${API_BASE_URL}/jobs/quiz`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -623,7 +626,7 @@ export default function Uploads() {
         throw new Error(errorMessage);
       }
 
-      const data = await response.json();
+      const data = await waitForJob(await response.json());
       setQuizResult(data);
       // Reset user answers and show answers state
       setUserAnswers({});